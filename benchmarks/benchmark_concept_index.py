@@ -0,0 +1,116 @@
+# benchmark_concept_index.py
+"""
+Benchmark of reading the term properties and broader chains of a large vocabulary: the per-concept
+graph queries that skos_handler and HierarchyStrategy used before (one query per concept and term
+property, one per broader term and label, every chain walked from scratch) compared to building a
+ConceptIndex once and reading from it (with memoized chains, see ConceptIndex.ancestors()).
+
+The vocabulary is generated: a tree of concepts with prefLabels in two languages, a definition and a
+broader term (each concept has up to --children narrower terms).
+
+Run from the repository root, e.g.:
+    python -m benchmarks.benchmark_concept_index --concepts 200000
+"""
+import argparse
+import time
+
+import rdflib
+
+from modules.skos_handler import SKOS, SKOS_TERM_PROPERTIES, ConceptIndex
+
+BASE_URI = "https://example.org/concept/"
+
+
+def synthetic_graph(concepts, children=10):
+    """
+    Returns a graph with the given number of concepts, concept 0 is the top concept.
+    """
+    graph = rdflib.Graph()
+    for number in range(concepts):
+        concept = rdflib.URIRef(f"{BASE_URI}{number}")
+        graph.add((concept, rdflib.RDF.type, SKOS.Concept))
+        graph.add((concept, SKOS.prefLabel, rdflib.Literal(f"Concept {number}", lang="en")))
+        graph.add((concept, SKOS.prefLabel, rdflib.Literal(f"Begriff {number}", lang="de")))
+        graph.add((concept, SKOS.definition, rdflib.Literal(f"Definition of concept {number}", lang="en")))
+        if number:
+            graph.add((concept, SKOS.broader, rdflib.URIRef(f"{BASE_URI}{(number - 1) // children}")))
+    return graph
+
+
+def per_concept_queries(graph):
+    """
+    Reads the term properties and the broader chains of all concepts with graph queries, like before
+    the ConceptIndex. Returns the number of labels in all chains.
+    """
+    term_properties = {}
+    for concept in graph.subjects(rdflib.RDF.type, SKOS.Concept):
+        term_properties[concept] = {}
+        for prop_name, prop_uri in SKOS_TERM_PROPERTIES.items():
+            for obj in graph.objects(concept, prop_uri):
+                if isinstance(obj, rdflib.Literal):
+                    term_properties[concept].setdefault(prop_name, {}).setdefault(obj.language or "none", []).append(obj)
+
+    def pref_label(concept, desired_lang):
+        lang_labels = {}
+        for label in graph.objects(concept, SKOS.prefLabel):
+            lang_labels.setdefault(label.language or "none", []).append(str(label))
+        for lang in (desired_lang, "en"):
+            if lang in lang_labels:
+                return lang_labels[lang][0]
+        return next(iter(lang_labels.values()))[0] if lang_labels else None
+
+    chain_labels = 0
+    for concept in term_properties:
+        current = concept
+        while True:
+            broader_list = list(graph.objects(current, SKOS.broader))
+            if not broader_list:
+                break
+            chain_labels += pref_label(broader_list[0], "de") is not None
+            current = broader_list[0]
+    return chain_labels
+
+
+def concept_index(graph):
+    """
+    Reads the same data from a ConceptIndex. Returns the number of labels in all chains.
+    """
+    index = ConceptIndex(graph)
+    chain_labels = 0
+    for concept in index.properties:
+        for broader in index.ancestors(concept):
+            chain_labels += index.pref_label(broader, "de") is not None
+    return chain_labels
+
+
+def run_benchmark(concepts, children=10):
+    """
+    Returns the seconds of both variants for a generated vocabulary as a dict.
+    """
+    started = time.perf_counter()
+    graph = synthetic_graph(concepts, children)
+    generated = time.perf_counter() - started
+    results = {"concepts": concepts, "triples": len(graph), "generate_seconds": generated}
+    for name, function in (("per_concept_queries", per_concept_queries), ("concept_index", concept_index)):
+        started = time.perf_counter()
+        results[f"{name}_labels"] = function(graph)
+        results[f"{name}_seconds"] = time.perf_counter() - started
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of per-concept graph queries against the ConceptIndex on a generated vocabulary.")
+    parser.add_argument("--concepts", type=int, default=200000)
+    parser.add_argument("--children", type=int, default=10, help="Number of narrower terms per concept.")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.concepts, args.children)
+    print(f"{results['concepts']} concepts, {results['triples']} triples (generated in {results['generate_seconds']:.1f} s)")
+    print(f"{'variant':<24} {'seconds':>10}")
+    print(f"{'per-concept queries':<24} {results['per_concept_queries_seconds']:>10.2f}")
+    print(f"{'ConceptIndex':<24} {results['concept_index_seconds']:>10.2f}")
+    print(f"Speedup: {results['per_concept_queries_seconds'] / results['concept_index_seconds']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# benchmark_import_time.py
+"""
+Benchmark of the startup time of main.py: how long it takes to import main.py and the modules of the
+selected translation services, each measured in a fresh interpreter. The row "all services" imports every
+registered service, which is what main.py did before the services were loaded through
+modules/service_registry.py.
+
+The translators package contacts its servers on import unless the environment variable
+translators_default_region is set, so the result for services that use it depends on the network.
+
+Run from the repository root, e.g.:
+    python -m benchmarks.benchmark_import_time --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from modules.service_registry import PRIMARY_SERVICES, SECONDARY_SERVICES
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (label, primary services, secondary service)
+SCENARIOS = [
+    ("main.py only", [], None),
+    ("lingvanex modernmt + dummy", ["lingvanex", "modernmt"], "dummy"),
+    ("google microsoft + gpt-4o", ["google", "microsoft"], "gpt-4o"),
+    ("all services", list(PRIMARY_SERVICES), None),
+]
+
+
+def import_statement(primary_services, secondary_service):
+    """
+    Returns the code that imports main.py and the modules of the given services.
+    """
+    modules = [PRIMARY_SERVICES[name][0] for name in primary_services]
+    if secondary_service is not None:
+        modules.append(SECONDARY_SERVICES[secondary_service][0])
+    if len(primary_services) == len(PRIMARY_SERVICES):
+        modules += [entry[0] for entry in SECONDARY_SERVICES.values()]
+    code = "import importlib, main\n"
+    for module in dict.fromkeys(modules):
+        code += f"importlib.import_module({module!r})\n"
+    return code
+
+
+def measure(code, repeat):
+    """
+    Runs code repeat times in a new interpreter and returns the wall times in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=REPO_DIR, check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - started)
+    return times
+
+
+def run_benchmark(repeat=3, scenarios=SCENARIOS):
+    """
+    Returns the median time of every scenario, minus the time of starting an empty interpreter.
+    """
+    interpreter = statistics.median(measure("pass", repeat))
+    results = []
+    for label, primary_services, secondary_service in scenarios:
+        median = statistics.median(measure(import_statement(primary_services, secondary_service), repeat))
+        results.append({"scenario": label, "seconds": median - interpreter, "interpreter_seconds": interpreter})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the time it takes to import main.py and the selected translation services.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs per scenario, the median is reported.")
+    parser.add_argument("--json", default=None, help="Also write the results to this JSON file.")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.repeat)
+    print(f"{'scenario':<32} {'import [s]':>10}")
+    for result in results:
+        print(f"{result['scenario']:<32} {result['seconds']:>10.3f}")
+    print(f"(interpreter startup of {results[0]['interpreter_seconds']:.3f} s not included)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# benchmark_ingestion.py
+"""
+Benchmark of the peak memory (RSS) and time of reading a large SKOS file: parsing it into an rdflib graph
+and building the ConceptIndex from the graph, compared to the streaming ingestion (--streaming, see
+modules/skos_stream.py) that only reads the needed triples into the ConceptIndex.
+
+The vocabulary is generated as RDF/XML and N-Triples: a tree of concepts with prefLabels in three languages,
+an altLabel, a definition, broader and narrower terms, and a few triples that the pipeline does not need
+(like real thesauri, e.g. matches to other vocabularies and modification dates).
+Every variant runs in a new process, so its peak RSS is not influenced by the other ones.
+
+Run from the repository root, e.g.:
+    python -m benchmarks.benchmark_ingestion --concepts 100000
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from xml.sax.saxutils import escape
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASE_URI = "https://example.org/concept/"
+SKOS_NS = "http://www.w3.org/2004/02/skos/core#"
+
+
+def _concept_triples(number, concepts, children):
+    """
+    Returns the triples of a generated concept as (predicate, object, is literal, language).
+    """
+    triples = [
+        ("http://www.w3.org/1999/02/22-rdf-syntax-ns#type", f"{SKOS_NS}Concept", False, None),
+        (f"{SKOS_NS}prefLabel", f"Concept {number}", True, "en"),
+        (f"{SKOS_NS}prefLabel", f"Begriff {number}", True, "de"),
+        (f"{SKOS_NS}prefLabel", f"Concept n° {number}", True, "fr"),
+        (f"{SKOS_NS}altLabel", f"Term {number}", True, "en"),
+        (f"{SKOS_NS}definition", f"Definition of concept {number} in the generated vocabulary", True, "en"),
+        (f"{SKOS_NS}inScheme", f"{BASE_URI}scheme", False, None),
+        ("http://www.w3.org/2002/07/owl#sameAs", f"https://other.example.org/{number}", False, None),
+        ("http://purl.org/dc/terms/modified", "2024-01-01", True, None),
+    ]
+    if number:
+        triples.append((f"{SKOS_NS}broader", f"{BASE_URI}{(number - 1) // children}", False, None))
+    for child in range(number * children + 1, min(number * children + children + 1, concepts)):
+        triples.append((f"{SKOS_NS}narrower", f"{BASE_URI}{child}", False, None))
+    return triples
+
+
+def write_files(directory, concepts, children=10):
+    """
+    Writes the generated vocabulary as vocabulary.rdf and vocabulary.nt and returns both paths.
+    """
+    rdf_path = os.path.join(directory, "vocabulary.rdf")
+    nt_path = os.path.join(directory, "vocabulary.nt")
+    with open(rdf_path, "w", encoding="utf-8") as rdf, open(nt_path, "w", encoding="utf-8") as nt:
+        rdf.write('<?xml version="1.0" encoding="utf-8"?>\n<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">\n')
+        for number in range(concepts):
+            subject = f"{BASE_URI}{number}"
+            rdf.write(f'  <rdf:Description rdf:about="{subject}">\n')
+            for predicate, obj, is_literal, lang in _concept_triples(number, concepts, children):
+                namespace, local = predicate.rsplit("#", 1) if "#" in predicate else predicate.rsplit("/", 1)
+                separator = "#" if "#" in predicate else "/"
+                if is_literal:
+                    lang_attribute = f' xml:lang="{lang}"' if lang else ""
+                    rdf.write(f'    <p:{local} xmlns:p="{namespace}{separator}"{lang_attribute}>{escape(obj)}</p:{local}>\n')
+                    nt.write(f'<{subject}> <{predicate}> "{obj}"{"@" + lang if lang else ""} .\n')
+                else:
+                    rdf.write(f'    <p:{local} xmlns:p="{namespace}{separator}" rdf:resource="{obj}"/>\n')
+                    nt.write(f"<{subject}> <{predicate}> <{obj}> .\n")
+            rdf.write("  </rdf:Description>\n")
+        rdf.write("</rdf:RDF>\n")
+    return rdf_path, nt_path
+
+
+def measure(variant, path):
+    """
+    Reads path with the variant ("graph" or "streaming") in this process and returns the concepts,
+    seconds and peak RSS in MiB.
+    """
+    from modules.skos_handler import load_graph, ConceptIndex
+    from modules.skos_stream import stream_concept_index
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    if variant == "graph":
+        graph, _ = load_graph(path)
+        concept_index = ConceptIndex(graph)
+    else:
+        concept_index, _, _ = stream_concept_index(path)
+    seconds = time.perf_counter() - started
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {"concepts": len(concept_index), "seconds": seconds, "peak_rss_mib": peak / scale, "baseline_rss_mib": baseline / scale}
+
+
+def run_benchmark(concepts, children=10, variants=("graph", "streaming")):
+    """
+    Generates the vocabulary and measures every variant for both files in a new process.
+    Returns a list of dicts with the file, variant and the measurements.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for path in write_files(directory, concepts, children):
+            for variant in variants:
+                output = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.benchmark_ingestion", "--measure", variant, path],
+                    cwd=REPO_DIR, check=True, capture_output=True, text=True,
+                ).stdout
+                result = json.loads(output.strip().splitlines()[-1])
+                result.update(file=os.path.basename(path), variant=variant, size_mib=os.path.getsize(path) / (1024 * 1024))
+                results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the peak memory of reading a generated SKOS file into a graph or with the streaming ingestion.")
+    parser.add_argument("--concepts", type=int, default=100000)
+    parser.add_argument("--children", type=int, default=10, help="Number of narrower terms per concept.")
+    parser.add_argument("--variants", nargs="+", default=["graph", "streaming"], choices=["graph", "streaming"])
+    parser.add_argument("--measure", nargs=2, metavar=("VARIANT", "FILE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.measure:
+        # Child process of run_benchmark()
+        print(json.dumps(measure(*args.measure)))
+        return
+
+    results = run_benchmark(args.concepts, args.children, args.variants)
+    print(f"{'file':<16} {'size [MiB]':>10} {'variant':<10} {'concepts':>9} {'seconds':>8} {'peak RSS [MiB]':>15}")
+    for result in results:
+        print(f"{result['file']:<16} {result['size_mib']:>10.1f} {result['variant']:<10} {result['concepts']:>9} {result['seconds']:>8.2f} {result['peak_rss_mib']:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# benchmark_output_writer.py
+"""
+Benchmark of writing the output file at the end of a run: serializing the whole graph with rdflib
+compared to merging the input file with the delta of the added triples (see modules/delta_writer.py).
+
+The vocabulary is generated like in benchmark_ingestion (RDF/XML and N-Triples), and a translation is
+added for every concept. The time of writing the delta file is reported separately, during a run it is
+spread over the concepts.
+
+Run from the repository root, e.g.:
+    python -m benchmarks.benchmark_output_writer --concepts 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import rdflib
+
+from benchmarks.benchmark_ingestion import BASE_URI, write_files
+from modules.delta_writer import DeltaWriter, merge_delta
+from modules.skos_handler import SKOS, load_graph
+
+
+def run_benchmark(concepts, children=10):
+    """
+    Returns a list of dicts with the file and the seconds of writing the delta, merging it and
+    serializing the graph.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for path in write_files(directory, concepts, children):
+            graph, fileformat = load_graph(path)
+            started = time.perf_counter()
+            delta = DeltaWriter(os.path.join(directory, "output.delta.nt"))
+            delta.open()
+            for number in range(concepts):
+                triple = (rdflib.URIRef(f"{BASE_URI}{number}"), SKOS.prefLabel, rdflib.Literal(f"Concepto {number}", lang="es"))
+                graph.add(triple)
+                delta.add(triple)
+                delta.flush(min_interval=1)
+            delta.close()
+            delta_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            merge_delta(path, fileformat, delta.path, os.path.join(directory, f"merged.{fileformat}"))
+            merge_seconds = time.perf_counter() - started
+            started = time.perf_counter()
+            graph.serialize(destination=os.path.join(directory, f"serialized.{fileformat}"), format=fileformat, encoding="utf-8")
+            serialize_seconds = time.perf_counter() - started
+            results.append({"file": os.path.basename(path), "triples": len(graph), "delta_seconds": delta_seconds,
+                            "merge_seconds": merge_seconds, "serialize_seconds": serialize_seconds})
+            delta.remove()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of serializing the graph against merging the delta file into the input file.")
+    parser.add_argument("--concepts", type=int, default=100000)
+    parser.add_argument("--children", type=int, default=10, help="Number of narrower terms per concept.")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.concepts, args.children)
+    print(f"{'file':<16} {'triples':>9} {'delta [s]':>10} {'merge [s]':>10} {'serialize [s]':>14}")
+    for result in results:
+        print(f"{result['file']:<16} {result['triples']:>9} {result['delta_seconds']:>10.2f} {result['merge_seconds']:>10.2f} {result['serialize_seconds']:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
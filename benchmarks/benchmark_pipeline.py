@@ -0,0 +1,189 @@
+# benchmark_pipeline.py
+"""
+Benchmark of the pipeline orchestration against mock services with simulated network latency, errors and
+rate limits (see modules/mock_network.py). Nothing is sent over the network and the results are
+reproducible with the same seed, so changes to the concurrency, batching or caching can be compared.
+
+Run from the repository root, e.g.:
+    python -m benchmarks.benchmark_pipeline --latency_scale 0.1 --primary_concurrency thread
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+
+from modules.translation_pipeline import TranslationPipeline
+from modules.frequency_confidence_calculator import FrequencyConfidenceCalculator
+from modules.llm_confidence_calculator import LLMConfidenceCalculator
+from modules.metrics import MetricsRegistry
+from modules.usage_tracker import UsageTracker
+from modules.rate_limiter import RateLimiter, RateLimitedPrimaryTranslationService, RateLimitedSecondaryTranslationService
+from modules.circuit_breaker import CircuitBreaker, CircuitBreakerPrimaryTranslationService
+from modules.translation_cache import SQLiteCacheStore, CachedPrimaryTranslationService, CachedSecondaryTranslationService
+from modules.primary_translators.mock_translator import MockPrimaryTranslationService
+from modules.secondary_translators.mock_secondary_translator import MockSecondaryTranslationService
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_FILES = [
+    os.path.join(REPO_DIR, "sample-files", "tadirah_de-missing.rdf"),
+    os.path.join(REPO_DIR, "sample-files", "dyas_en-missing.rdf"),
+]
+
+# (service name, median latency in seconds, error rate, rate limit in requests per second)
+# Roughly modelled on free web translators (slow, occasional errors) and paid APIs (fast)
+PRIMARY_PROFILES = [
+    ("mock_fast", 0.08, 0.0, None),
+    ("mock_medium", 0.2, 0.02, None),
+    ("mock_slow", 0.6, 0.05, None),
+    ("mock_limited", 0.15, 0.0, 10),
+]
+LLM_MEDIAN_LATENCY = 1.2
+
+
+def strategy_for(name):
+    from modules import secondary_translation_strategies as strategies
+    return {
+        "individual": strategies.IndividualLabelStrategy,
+        "batch": strategies.BatchLabelStrategy,
+        "hierarchy": strategies.HierarchyStrategy,
+        "multiconcept": strategies.MultiConceptStrategy,
+    }[name]()
+
+
+def target_language_of(input_file):
+    # The sample files are named <vocabulary>_<missing language>-missing.rdf
+    match = re.search(r"_([a-z]{2})-missing\.", os.path.basename(input_file))
+    return match.group(1) if match else "en"
+
+
+def build_services(latency_scale, seed, primary_batch_size, cache_dir=None):
+    """
+    Returns the primary services and the secondary service wrapped like in main.py, the mock LLM,
+    the simulated endpoints of all mock services (the LLM last) and the cache stores (None without cache_dir).
+    """
+    endpoints = []
+    primary_services = []
+    primary_store = secondary_store = None
+    if cache_dir is not None:
+        primary_store = SQLiteCacheStore(os.path.join(cache_dir, "cache.sqlite"), "primary_translations")
+        secondary_store = SQLiteCacheStore(os.path.join(cache_dir, "cache.sqlite"), "llm_responses")
+    for number, (name, median, error_rate, rate_limit) in enumerate(PRIMARY_PROFILES):
+        mock = MockPrimaryTranslationService(name, median_latency=median * latency_scale, error_rate=error_rate, rate_limit_rps=rate_limit,
+                                             max_batch_size=25 if primary_batch_size else 1, seed=seed + number)
+        endpoints.append(mock.endpoint)
+        service = RateLimitedPrimaryTranslationService(mock, RateLimiter(rate_limit), backoff_base=0.1 * latency_scale, backoff_cap=1.0)
+        if primary_store is not None:
+            service = CachedPrimaryTranslationService(service, primary_store)
+        primary_services.append(CircuitBreakerPrimaryTranslationService(service, CircuitBreaker(name, slow_call_seconds=None)))
+    llm = MockSecondaryTranslationService(median_latency=LLM_MEDIAN_LATENCY * latency_scale, error_rate=0.01, seed=seed)
+    endpoints.append(llm.endpoint)
+    secondary_service = RateLimitedSecondaryTranslationService(llm, RateLimiter(), backoff_base=0.1 * latency_scale, backoff_cap=1.0)
+    if secondary_store is not None:
+        secondary_service = CachedSecondaryTranslationService(secondary_service, secondary_store)
+    return primary_services, secondary_service, llm, endpoints, (primary_store, secondary_store)
+
+
+def run_benchmark(input_file, strategy, primary_concurrency="sequential", max_workers=8, primary_batch_size=0,
+                  latency_scale=1.0, seed=0, threshold=0.6, cache_dir=None, verbose=False):
+    """
+    Translates input_file once with mock services and returns the measurements as a dict.
+    """
+    primary_services, secondary_service, llm, endpoints, stores = build_services(latency_scale, seed, primary_batch_size, cache_dir)
+    llm.usage_tracker = UsageTracker({llm.model_name: (0.0, 0.0)})
+    metrics = MetricsRegistry()
+    pipeline = TranslationPipeline(
+        primary_services, secondary_service, strategy_for(strategy),
+        primary_confidence_calculator=FrequencyConfidenceCalculator(),
+        secondary_confidence_calculator=LLMConfidenceCalculator(secondary_service, max_retries=1),
+        low_confidence_threshold=threshold,
+        min_primary_translations=3,
+        primary_concurrency=primary_concurrency,
+        max_workers=max_workers,
+        primary_batch_size=primary_batch_size,
+        metrics=metrics,
+    )
+    with tempfile.TemporaryDirectory() as output_dir:
+        output_file = os.path.join(output_dir, os.path.basename(input_file))
+        output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+        started = time.perf_counter()
+        try:
+            with output:
+                pipeline.process_file(input_file, target_language_of(input_file), "Digital Humanities", output_file)
+        finally:
+            for store in stores:
+                if store is not None:
+                    store.close()
+        wall_time = time.perf_counter() - started
+
+    decisions = {}
+    for (_, decision), value in metrics.decisions.samples().items():
+        decisions[decision] = decisions.get(decision, 0) + int(value)
+    concepts = sum(decisions.values())
+    primary_calls = sum(endpoint.calls for endpoint in endpoints[:-1])
+    return {
+        "file": os.path.basename(input_file),
+        "strategy": strategy,
+        "primary_concurrency": primary_concurrency,
+        "primary_batch_size": primary_batch_size,
+        "concepts": concepts,
+        "wall_time": wall_time,
+        "concepts_per_second": concepts / wall_time if wall_time else 0.0,
+        "primary_calls": primary_calls,
+        "llm_calls": llm.endpoint.calls,
+        "errors": sum(endpoint.errors for endpoint in endpoints),
+        "rate_limited": sum(endpoint.rate_limited for endpoint in endpoints),
+        "llm_input_tokens": sum(usage[1] for usage in llm.usage_tracker.usage.values()),
+        "decisions": decisions,
+    }
+
+
+def format_row(result):
+    return (f"{result['file']:<26} {result['strategy']:<12} {result['primary_concurrency']:<10} {result['primary_batch_size']:>5} "
+            f"{result['concepts']:>8} {result['wall_time']:>9.2f} {result['concepts_per_second']:>10.2f} "
+            f"{result['primary_calls']:>8} {result['llm_calls']:>6} {result['errors']:>6} {result['rate_limited']:>6}")
+
+
+HEADER = (f"{'file':<26} {'strategy':<12} {'mode':<10} {'batch':>5} {'concepts':>8} {'wall [s]':>9} {'concepts/s':>10} "
+          f"{'primary':>8} {'llm':>6} {'errors':>6} {'429':>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the translation pipeline with mock services that simulate network latency, errors and rate limits.")
+    parser.add_argument("--input", nargs="+", default=SAMPLE_FILES, help="SKOS files to translate (default: the sample files).")
+    parser.add_argument("--strategies", nargs="+", default=["individual", "batch", "hierarchy"], choices=["individual", "batch", "hierarchy", "multiconcept"])
+    parser.add_argument("--primary_concurrency", default="sequential", choices=["sequential", "thread", "async"])
+    parser.add_argument("--max_workers", type=int, default=8)
+    parser.add_argument("--primary_batch_size", type=int, default=0)
+    parser.add_argument("--latency_scale", type=float, default=1.0, help="Factor for all simulated latencies, e.g. 0.1 for quick runs.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--threshold", type=float, default=0.6)
+    parser.add_argument("--cache", action="store_true", help="Use a fresh persistent cache and translate every file twice (cold and warm cache).")
+    parser.add_argument("--json", default=None, help="Also write the results to this JSON file.")
+    parser.add_argument("--verbose", action="store_true", help="Show the progress output of the pipeline.")
+    args = parser.parse_args()
+    if not args.verbose:
+        # The simulated errors are logged by the mock services
+        logging.disable(logging.CRITICAL)
+
+    results = []
+    print(HEADER)
+    for strategy in args.strategies:
+        for input_file in args.input:
+            with tempfile.TemporaryDirectory() as cache_dir:
+                for _ in range(2 if args.cache else 1):
+                    result = run_benchmark(input_file, strategy, args.primary_concurrency, args.max_workers, args.primary_batch_size,
+                                           args.latency_scale, args.seed, args.threshold, cache_dir if args.cache else None, args.verbose)
+                    results.append(result)
+                    print(format_row(result), flush=True)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import os
+import re
 from dotenv import load_dotenv
 
 # Load environment variables once
@@ -20,5 +21,60 @@ OPENWEBUI_BASE_URL = os.getenv("OPENWEBUI_BASE_URL")
 PONS_API_KEY = os.getenv("PONS_API_KEY")
 ARGOS_BASE_URL = os.getenv("ARGOS_BASE_URL")
 
+# Persistent cache for translation results (see --cache)
+CACHE_FILE = os.getenv("CACHE_FILE", "wokie_cache.sqlite")
+CACHE_TTL_DAYS = float(os.getenv("CACHE_TTL_DAYS", "30"))
+# Failed calls (no translation) are cached for a shorter time so they are retried sooner
+CACHE_NEGATIVE_TTL_HOURS = float(os.getenv("CACHE_NEGATIVE_TTL_HOURS", "24"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1000000"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "100000"))
+
+# Rate limiting and retries after HTTP 429 (Too Many Requests) for all services
+RATE_LIMIT_MAX_RETRIES = int(os.getenv("RATE_LIMIT_MAX_RETRIES", "6"))
+RATE_LIMIT_BACKOFF_BASE_SECONDS = float(os.getenv("RATE_LIMIT_BACKOFF_BASE_SECONDS", "1"))
+RATE_LIMIT_BACKOFF_MAX_SECONDS = float(os.getenv("RATE_LIMIT_BACKOFF_MAX_SECONDS", "60"))
+
+def rate_limits(service_name):
+    """
+    Returns (requests per second, tokens per minute) of a service from RATE_LIMIT_<SERVICE>_RPS and
+    RATE_LIMIT_<SERVICE>_TPM, e.g. RATE_LIMIT_OPENAI_RPS. Missing values are None (no limit).
+    """
+    prefix = f"RATE_LIMIT_{service_name.upper()}"
+    requests_per_second = os.getenv(f"{prefix}_RPS")
+    tokens_per_minute = os.getenv(f"{prefix}_TPM")
+    return (float(requests_per_second) if requests_per_second else None,
+            float(tokens_per_minute) if tokens_per_minute else None)
+
+# Circuit breaker per primary translation service (modules/circuit_breaker.py)
+CIRCUIT_BREAKER_ENABLED = os.getenv("CIRCUIT_BREAKER_ENABLED", "True").lower() in ("true", "1", "yes")
+CIRCUIT_BREAKER_FAILURE_RATE = float(os.getenv("CIRCUIT_BREAKER_FAILURE_RATE", "0.5"))
+CIRCUIT_BREAKER_WINDOW = int(os.getenv("CIRCUIT_BREAKER_WINDOW", "20"))
+CIRCUIT_BREAKER_MIN_CALLS = int(os.getenv("CIRCUIT_BREAKER_MIN_CALLS", "10"))
+CIRCUIT_BREAKER_SLOW_CALL_SECONDS = float(os.getenv("CIRCUIT_BREAKER_SLOW_CALL_SECONDS", "10"))
+CIRCUIT_BREAKER_COOLDOWN_SECONDS = float(os.getenv("CIRCUIT_BREAKER_COOLDOWN_SECONDS", "60"))
+CIRCUIT_BREAKER_HALF_OPEN_PROBES = int(os.getenv("CIRCUIT_BREAKER_HALF_OPEN_PROBES", "3"))
+
+# Shared HTTP connections of the REST based services (modules/http_transport.py)
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))
+HTTP2 = os.getenv("HTTP2", "False").lower() in ("true", "1", "yes")
+
+# Provider batch jobs for the LLM stage (see --llm_batch_jobs)
+OPENAI_BATCH_BASE_URL = os.getenv("OPENAI_BATCH_BASE_URL", "https://api.openai.com/v1")
+ANTHROPIC_BATCH_BASE_URL = os.getenv("ANTHROPIC_BATCH_BASE_URL", "https://api.anthropic.com/v1")
+LLM_BATCH_POLL_SECONDS = float(os.getenv("LLM_BATCH_POLL_SECONDS", "60"))
+LLM_BATCH_TIMEOUT_HOURS = float(os.getenv("LLM_BATCH_TIMEOUT_HOURS", "24"))
+
+# Prices of the LLMs for the cost accounting and --max_cost (modules/usage_tracker.py)
+def llm_price(model_name):
+    """
+    Returns (price per million input tokens, price per million output tokens) of a model from
+    LLM_PRICE_<MODEL> = "<input>,<output>", where <MODEL> is the model name in upper case with all
+    other characters than letters and digits replaced by "_", e.g. LLM_PRICE_GPT_4_1_MINI. None if not set.
+    """
+    price = os.getenv("LLM_PRICE_" + re.sub(r"[^A-Z0-9]", "_", model_name.upper()))
+    if not price:
+        return None
+    input_price, output_price = (float(value) for value in price.split(","))
+    return input_price, output_price
 
 DEBUG = os.getenv("DEBUG")
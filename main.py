@@ -4,31 +4,23 @@ import os
 import logging
 from datetime import datetime
 from modules.translation_pipeline import TranslationPipeline
-from modules.primary_translators.argos_translator import ArgosTranslationService
-from modules.primary_translators.googlecloud_translator import GoogleTranslationService
-from modules.primary_translators.lingvanex_translator import LingvanexTranslationService
-from modules.primary_translators.modernmt_translator import ModernMTTranslationService
-from modules.primary_translators.microsoft_translator import MicrosoftTranslationService
-from modules.primary_translators.mymemory_translator import MyMemoryTranslationService
-from modules.primary_translators.pons_translator import PonsTranslationService
-from modules.primary_translators.pons_paid_translator import PonsPaidTranslationService
-from modules.primary_translators.reverso_translator import ReversoTranslationService
-from modules.primary_translators.translatecom_translator import TranslatecomTranslationService
-from modules.primary_translators.yandex_translator import YandexTranslationService
-from modules.primary_translators.dummynone_translator import DummyNonePrimaryTranslationService
-from modules.secondary_translators.ollama_translator import OllamaTranslationService
-from modules.secondary_translators.openai_translator import OpenAITranslationService
-from modules.secondary_translators.anthropic_translator import AnthropicTranslationService
-from modules.secondary_translators.blablador_translator import BlabladorTranslationService
-from modules.secondary_translators.openwebui_translator import OpenWebUITranslationService
-from modules.secondary_translators.mistral_translator import MistralTranslationService
-from modules.secondary_translators.deepseek_translator import DeepseekTranslationService
-from modules.secondary_translators.gemini_translator import GeminiTranslationService
-from modules.secondary_translators.dummy_secondary_translator import DummySecondaryTranslationService
+from modules.skos_stream import supports_streaming
+from modules.service_registry import PRIMARY_SERVICES, SECONDARY_SERVICES, create_primary_service, create_secondary_service
 from modules.frequency_confidence_calculator import FrequencyConfidenceCalculator
 from modules.llm_confidence_calculator import LLMConfidenceCalculator
 from modules.dummy_secondary_confidence_calculator import DummySecondaryConfidenceCalculator
-from config import DEBUG
+from modules.translation_cache import SQLiteCacheStore, CachedPrimaryTranslationService, CachedSecondaryTranslationService
+from modules.http_transport import close_shared_clients
+from modules.service_scheduler import AdaptiveServiceScheduler
+from modules.metrics import MetricsRegistry, MetricsSecondaryTranslationService
+from modules.usage_tracker import UsageTracker, BudgetedSecondaryTranslationService
+from modules.profiling import StageTimer, StageTimedSecondaryTranslationService, profile_call
+from modules.circuit_breaker import CircuitBreaker, CircuitBreakerPrimaryTranslationService
+from modules.rate_limiter import RateLimiter, RateLimitedPrimaryTranslationService, RateLimitedSecondaryTranslationService
+from config import DEBUG, CACHE_FILE, CACHE_TTL_DAYS, CACHE_NEGATIVE_TTL_HOURS, CACHE_MAX_ENTRIES, LLM_CACHE_MAX_ENTRIES
+from config import RATE_LIMIT_MAX_RETRIES, RATE_LIMIT_BACKOFF_BASE_SECONDS, RATE_LIMIT_BACKOFF_MAX_SECONDS, rate_limits
+from config import llm_price
+from config import CIRCUIT_BREAKER_ENABLED, CIRCUIT_BREAKER_FAILURE_RATE, CIRCUIT_BREAKER_WINDOW, CIRCUIT_BREAKER_MIN_CALLS, CIRCUIT_BREAKER_SLOW_CALL_SECONDS, CIRCUIT_BREAKER_COOLDOWN_SECONDS, CIRCUIT_BREAKER_HALF_OPEN_PROBES
 
 
 def main():
@@ -39,7 +31,8 @@ def main():
                         help="Path to the source SKOS file (.rdf) you want to translate.")
     parser.add_argument("--language", 
                         required=True, 
-                        help="Target language (IETF BCP 47), e.g. 'de' for German.")
+                        nargs="+", 
+                        help="Target language(s) (IETF BCP 47), e.g. 'de' for German. Several languages are translated in one run and written to the same output file.")
     parser.add_argument("--context", 
                         default="", 
                         help="Topic, domain or description of source vocabulary to help disambiguate translations.")
@@ -50,23 +43,29 @@ def main():
     parser.add_argument("--primary_translation", 
                         required=True, 
                         nargs='+', 
-                        choices=["argos", "google", "lingvanex", "microsoft", "modernmt", "ponspaid", "reverso", "yandex", "dummynone"], 
+                        choices=list(PRIMARY_SERVICES), 
                         help="List of one or more translation services that is used in the pipeline. At least one must be provided; order defines priority.")
     parser.add_argument("--secondary_translation", 
                         required=True, 
-                        choices=["claude-3-5-haiku", "claude-3-5-sonnet", "claude-3-7-sonnet", "claude-3-haiku", "codestral-latest", "codestral-mamba-latest", "deepseek-chat", "deepseek-reasoner", "gemini-1.5-flash-8b", "gemini-1.5-flash", "gemini-2.0-flash-lite", "gemini-2.0-flash", "gemini-2.5-flash-preview-04-17", "gemma3:12b(openwebui)", "gpt-3.5-turbo", "gpt-4.1-mini", "gpt-4.1-nano", "gpt-4.1(openwebui)", "gpt-4o-mini", "gpt-4o", "llama-4-maverick:free(openwebui)", "ministral-3b-latest", "ministral-8b-latest", "mistral-large-latest", "mistral-medium-latest", "mistral-small-latest", "mistral-tiny-latest", "open-mistral-nemo", "open-mixtral-8x22b", "dummy"],
+                        choices=list(SECONDARY_SERVICES),
                         help="Single LLM-based translation service used  to refine any low-confidence translations.")
     parser.add_argument("--secondary_strategy", 
                         required=False, 
                         default="individual", 
-                        choices=["individual", "batch", "hierarchy"],
+                        choices=["individual", "batch", "hierarchy", "multiconcept"],
                         help=(
                             "What goes into the prompt:\n"
-                            "  individual – translate each language of a term separately;\n"
-                            "  batch      – translate all languages of a term in one prompt;\n"
-                            "  hierarchy  – batch + additionally information about broader terms."
+                            "  individual   – translate each language of a term separately;\n"
+                            "  batch        – translate all languages of a term in one prompt;\n"
+                            "  hierarchy    – batch + additionally information about broader terms;\n"
+                            "  multiconcept – batch for several terms in one prompt with a JSON answer (see --llm_batch_token_budget)."
                         )
     )
+    parser.add_argument("--llm_batch_token_budget", 
+                        type=int, 
+                        required=False, 
+                        default=3000, 
+                        help="Estimated maximum number of tokens of a prompt with --secondary_strategy multiconcept, defines how many terms are sent together.")
     parser.add_argument("--min_primary_translations", 
                         type=int, 
                         required=False, 
@@ -84,10 +83,103 @@ def main():
                         required=False, 
                         default=0,
                         help="Controls randomness in generation (0.0 = deterministic, higher = more random). Must be between 0.0 and 2.0. Effect of temperature settings varies across models and providers.")
+    parser.add_argument("--primary_concurrency", 
+                        required=False, 
+                        default="sequential", 
+                        choices=["sequential", "thread", "async"],
+                        help=(
+                            "How the primary translation services are called for each term:\n"
+                            "  sequential – one service after another;\n"
+                            "  thread     – all required services at once using a thread pool;\n"
+                            "  async      – all required services at once on a single event loop (services without async support use threads)."
+                        )
+    )
+    parser.add_argument("--max_workers", 
+                        type=int, 
+                        required=False, 
+                        default=8, 
+                        help="Maximum number of parallel requests to primary translation services if --primary_concurrency is not sequential.")
+    parser.add_argument("--llm_batch_jobs", 
+                        action="store_true", 
+                        help="Send the prompts of the LLM stage as provider batch jobs (OpenAI and Anthropic models only, lower price but results can take up to 24 hours).")
+    parser.add_argument("--primary_batch_size", 
+                        type=int, 
+                        required=False, 
+                        default=0, 
+                        help="Send the labels of this many concepts to each primary service in batch requests (Google, Microsoft, PONS paid and Argos support several labels per request). 0 sends one request per label.")
+    parser.add_argument("--primary_order", 
+                        required=False, 
+                        default="fixed", 
+                        choices=["fixed", "adaptive"],
+                        help=(
+                            "Order in which the primary translation services are asked:\n"
+                            "  fixed    – as given in --primary_translation;\n"
+                            "  adaptive – reordered for every concept, fastest services with the most agreement with the chosen translations first."
+                        )
+    )
+    parser.add_argument("--hedge", 
+                        type=int, 
+                        required=False, 
+                        default=0, 
+                        help="Hedged requests: ask this many primary services more than needed at once and use the first answers (requires --primary_concurrency thread or async). 0 disables hedging.")
+    parser.add_argument("--early_stopping", 
+                        action="store_true", 
+                        help="Stop asking further primary services for a concept once their answers cannot change whether the confidence ends above or below --threshold. Concepts that cannot reach the threshold go straight to the secondary service.")
+    parser.add_argument("--no_circuit_breaker", 
+                        action="store_true", 
+                        help="Always ask every primary service, also while it keeps failing or is too slow. The circuit breaker can also be turned off with CIRCUIT_BREAKER_ENABLED=False in .env.")
+    parser.add_argument("--metrics_file", 
+                        required=False, 
+                        default=None, 
+                        help="Write run metrics (requests, latencies and decisions) in the Prometheus text format to this file, updated every few seconds during the run.")
+    parser.add_argument("--metrics_port", 
+                        type=int, 
+                        required=False, 
+                        default=None, 
+                        help="Serve run metrics in the Prometheus text format on http://127.0.0.1:<port>/metrics during the run.")
+    parser.add_argument("--max_cost", 
+                        type=float, 
+                        required=False, 
+                        default=None, 
+                        help="Budget for the LLM calls in the currency of the prices in LLM_PRICE_<MODEL> (see .env.template). Once it is used up, the remaining concepts are decided by the primary services only.")
+    parser.add_argument("--max_llm_calls", 
+                        type=int, 
+                        required=False, 
+                        default=None, 
+                        help="Maximum number of LLM calls. Once they are used up, the remaining concepts are decided by the primary services only.")
+    parser.add_argument("--profile", 
+                        action="store_true", 
+                        help="Profile the run and write the statistics (.prof, readable with pstats or snakeviz) and a summary with the time per stage (.profile.txt) next to the output file, with the same name.")
+    parser.add_argument("--cache", 
+                        required=False, 
+                        default="bypass", 
+                        choices=["bypass", "use", "refresh"],
+                        help=(
+                            "Persistent cache for results of the primary services and responses of the secondary service (LLM):\n"
+                            "  bypass  – do not read or write the cache;\n"
+                            "  use     – answer from the cache if possible and store new results;\n"
+                            "  refresh – call all services again and overwrite the cached results."
+                        )
+    )
+    parser.add_argument("--cache_file", 
+                        required=False, 
+                        default=CACHE_FILE, 
+                        help="Path to the SQLite cache file used with --cache use/refresh.")
+    parser.add_argument("--streaming", 
+                        action="store_true", 
+                        help="Read only the needed SKOS triples instead of the whole file into memory, for very large vocabularies. Supports RDF/XML and N-Triples files, the output is a copy of the input file with the translations added.")
+    parser.add_argument("--resume", 
+                        action="store_true", 
+                        help="Continue an aborted run from its journal (<output file>.journal.jsonl) instead of starting over.")
     parser.add_argument("--enable-logging", 
                         action="store_true", 
                         help="Enable detailed DEBUG-level logfile in the location of the input file.")
     args = parser.parse_args()
+    if args.streaming and not supports_streaming(args.input):
+        parser.error("--streaming supports RDF/XML (.rdf, .xml, .owl) and N-Triples (.nt) files")
+    use_circuit_breaker = CIRCUIT_BREAKER_ENABLED and not args.no_circuit_breaker
+    # Used in filenames
+    languages_str = "-".join(args.language)
 
     # Needed for logs and filenames
     start_time = datetime.now()
@@ -101,7 +193,7 @@ def main():
         dirname, basename = os.path.split(args.input)
         basename = basename.split(".")[0]
         # Store log file in folder of input file
-        log_file = os.path.join(dirname, f"log_{basename}__{args.language}_{args.threshold}_{args.primary_translation}_{args.secondary_translation}_{args.secondary_strategy}_{args.temperature}_{start_time_str}.log")
+        log_file = os.path.join(dirname, f"log_{basename}__{languages_str}_{args.threshold}_{args.primary_translation}_{args.secondary_translation}_{args.secondary_strategy}_{args.temperature}_{start_time_str}.log")
 
 
         logging.basicConfig(
@@ -127,37 +219,62 @@ def main():
     if logger:
         logger.info(f"Script started at {start_time_str}")
         logger.info(f"Input file: {args.input}")
-        logger.info(f"Target language: {args.language}")
+        logger.info(f"Target languages: {', '.join(args.language)}")
         logger.info(f"Primary translation service: {args.primary_translation}")
         logger.info(f"Secondary translation services: {args.secondary_translation}")
         logger.info(f"Secondary translation strategy: {args.secondary_strategy}")
+        if args.secondary_strategy == "multiconcept":
+            logger.info(f"Token budget for multi concept prompts: {args.llm_batch_token_budget}")
         logger.info(f"User provided context: {args.context}")
         logger.info(f"Max. retries for secondary confidence calculator: {args.max_retries}")
         logger.info(f"Temperature for secondary confidence calculator: {args.temperature}")
         logger.info(f"Minimal number of primary translations before calling primary confidence calculator: {args.min_primary_translations}")
         logger.info(f"Threshold: {args.threshold}")
+        logger.info(f"Primary concurrency: {args.primary_concurrency} (max. workers: {args.max_workers})")
+        logger.info(f"Primary batch size: {args.primary_batch_size}")
+        logger.info(f"Primary service order: {args.primary_order}")
+        logger.info(f"Early stopping: {args.early_stopping}")
+        logger.info(f"Hedge: {args.hedge}")
+        logger.info(f"Circuit breaker: {use_circuit_breaker}")
+        logger.info(f"Metrics: file {args.metrics_file}, port {args.metrics_port}")
+        logger.info(f"LLM batch jobs: {args.llm_batch_jobs}")
+        logger.info(f"LLM budget: max. cost {args.max_cost}, max. calls {args.max_llm_calls}")
+        logger.info(f"Profile: {args.profile}")
+        logger.info(f"Cache: {args.cache} ({args.cache_file})")
+        logger.info(f"Streaming ingestion: {args.streaming}")
+        logger.info(f"Resume from journal: {args.resume}")
 
-    # Dictionary for mapping secondary service names to their respective classes
-    primary_translation_services_mapping = {
-        "argos": ArgosTranslationService, 
-        "google": GoogleTranslationService,
-        "lingvanex": LingvanexTranslationService, 
-        "microsoft": MicrosoftTranslationService,  
-        "modernmt": ModernMTTranslationService,  
-        "ponspaid": PonsPaidTranslationService,  
-        "reverso": ReversoTranslationService,  
-        "yandex": YandexTranslationService,
-        "dummynone": DummyNonePrimaryTranslationService
-    }
+    primary_cache_store = None
+    if args.cache != "bypass":
+        primary_cache_store = SQLiteCacheStore(
+            args.cache_file, "primary_translations",
+            ttl=CACHE_TTL_DAYS * 24 * 3600,
+            negative_ttl=CACHE_NEGATIVE_TTL_HOURS * 3600,
+            max_entries=CACHE_MAX_ENTRIES,
+            logger=logger,
+        )
 
     primary_translation_services = []
     for service_name in args.primary_translation:
-        try:
-            service_class = primary_translation_services_mapping[service_name]
-        except KeyError:
-            raise ValueError(f"Primary translation service {service_name} is currently not implemented")
-        
-        service_instance = service_class(logger=logger)
+        # Only the modules of the selected services are imported (see modules/service_registry.py)
+        service_instance = create_primary_service(service_name, logger=logger)
+        # Retries after HTTP 429 and optional budgets from .env, cache hits do not count against the budget
+        # With the circuit breaker, give-ups are raised so that the breaker counts them as failures
+        service_instance = RateLimitedPrimaryTranslationService(
+            service_instance, RateLimiter(*rate_limits(service_instance.service_name)),
+            max_retries=RATE_LIMIT_MAX_RETRIES, backoff_base=RATE_LIMIT_BACKOFF_BASE_SECONDS, backoff_cap=RATE_LIMIT_BACKOFF_MAX_SECONDS, logger=logger,
+            raise_on_give_up=use_circuit_breaker,
+        )
+        if primary_cache_store is not None:
+            service_instance = CachedPrimaryTranslationService(service_instance, primary_cache_store, mode=args.cache, logger=logger)
+        if use_circuit_breaker:
+            # Skips the service while it keeps failing, so the next service is asked right away
+            breaker = CircuitBreaker(
+                service_name, failure_rate_threshold=CIRCUIT_BREAKER_FAILURE_RATE, window_size=CIRCUIT_BREAKER_WINDOW,
+                min_calls=CIRCUIT_BREAKER_MIN_CALLS, slow_call_seconds=CIRCUIT_BREAKER_SLOW_CALL_SECONDS,
+                cooldown=CIRCUIT_BREAKER_COOLDOWN_SECONDS, half_open_probes=CIRCUIT_BREAKER_HALF_OPEN_PROBES, logger=logger,
+            )
+            service_instance = CircuitBreakerPrimaryTranslationService(service_instance, breaker, logger=logger)
         primary_translation_services.append(service_instance)
         if logger:
             logger.info(f"Primary translation service {service_name} instantiated successfully")
@@ -167,44 +284,50 @@ def main():
         logger.info(f"Order of primary translation services (first in list used first in translations): {chosen_services}")
 
 
-    # Dictionary for mapping secondary service names to their respective classes
-    # Use lambda to delay execution because certain Translation services requires args.model which is not present at dict initialization. Also avoid unneccesary object creation
-    secondary_translation_services_mapping = {
-        "dummy": lambda: DummySecondaryTranslationService(),
-        "claude-3-5-haiku": lambda: AnthropicTranslationService(model_name="claude-3-5-haiku-20241022", temperature=args.temperature),
-        "claude-3-5-sonnet": lambda: AnthropicTranslationService(model_name="claude-3-5-sonnet-20241022", temperature=args.temperature),
-        "claude-3-7-sonnet": lambda: AnthropicTranslationService(model_name="claude-3-7-sonnet-20250219", temperature=args.temperature),
-        "claude-3-haiku": lambda: AnthropicTranslationService(model_name="claude-3-haiku-20240307", temperature=args.temperature),
-        # "claude-3-opus": lambda: AnthropicTranslationService(model_name="claude-3-opus-20240229", temperature=args.temperature),
-        "codestral-latest": lambda: MistralTranslationService(model_name = "codestral-latest", temperature=args.temperature),
-        "codestral-mamba-latest": lambda: MistralTranslationService(model_name = "codestral-mamba-latest", temperature=args.temperature),
-        "deepseek-chat": lambda: DeepseekTranslationService(model_name="deepseek-chat"), 
-        "deepseek-reasoner": lambda: DeepseekTranslationService(model_name="deepseek-reasoner"), 
-        "gemini-1.5-flash-8b": lambda: GeminiTranslationService(model_name = "gemini-1.5-flash-8b", temperature=args.temperature),
-        "gemini-1.5-flash": lambda: GeminiTranslationService(model_name = "gemini-1.5-flash", temperature=args.temperature),
-        "gemini-2.0-flash-lite": lambda: GeminiTranslationService(model_name = "gemini-2.0-flash-lite", temperature=args.temperature),
-        "gemini-2.0-flash": lambda: GeminiTranslationService(model_name = "gemini-2.0-flash", temperature=args.temperature),
-        "gemini-2.5-flash-preview-04-17": lambda: GeminiTranslationService(model_name = "gemini-2.5-flash-preview-04-17", temperature=args.temperature),
-        "gemma3:12b(openwebui)": lambda: OpenWebUITranslationService(model_name = "gemma3:12b", temperature=args.temperature),
-        "gpt-3.5-turbo": lambda: OpenAITranslationService(model_name="gpt-3.5-turbo", temperature=args.temperature),
-        "gpt-4.1-mini": lambda: OpenAITranslationService(model_name = "gpt-4.1-mini", temperature=args.temperature),
-        "gpt-4.1-nano": lambda: OpenAITranslationService(model_name = "gpt-4.1-nano", temperature=args.temperature),
-        "gpt-4.1(openwebui)": lambda: OpenWebUITranslationService(model_name = "gpt-4.1", temperature=args.temperature),
-        "gpt-4o-mini": lambda: OpenAITranslationService(model_name="gpt-4o-mini", temperature=args.temperature),
-        "gpt-4o": lambda: OpenAITranslationService(model_name="gpt-4o", temperature=args.temperature),
-        "llama-4-maverick:free(openwebui)": lambda: OpenWebUITranslationService(model_name = "meta-llama/llama-4-maverick:free", temperature=args.temperature),
-        "ministral-3b-latest": lambda: MistralTranslationService(model_name = "ministral-3b-latest", temperature=args.temperature),
-        "ministral-8b-latest": lambda: MistralTranslationService(model_name = "ministral-8b-latest", temperature=args.temperature),
-        "mistral-large-latest": lambda: MistralTranslationService(model_name = "mistral-large-latest", temperature=args.temperature),
-        "mistral-medium-latest": lambda: MistralTranslationService(model_name = "mistral-medium-latest", temperature=args.temperature),
-        "mistral-small-latest": lambda: MistralTranslationService(model_name = "mistral-small-latest", temperature=args.temperature),
-        "mistral-tiny-latest": lambda: MistralTranslationService(model_name = "mistral-tiny-latest", temperature=args.temperature),
-        "open-mistral-nemo": lambda: MistralTranslationService(model_name = "open-mistral-nemo", temperature=args.temperature),
-        "open-mixtral-8x22b": lambda: MistralTranslationService(model_name = "open-mixtral-8x22b", temperature=args.temperature),
-    }
+    metrics = None
+    if args.metrics_file or args.metrics_port is not None:
+        metrics = MetricsRegistry(logger=logger)
+        if args.metrics_port is not None:
+            metrics.serve(args.metrics_port)
 
+    secondary_translation_service = create_secondary_service(args.secondary_translation, temperature=args.temperature)
+    model_name = getattr(secondary_translation_service, "model_name", "")
+    price = llm_price(model_name)
+    if args.max_cost is not None and price is None and args.secondary_translation != "dummy":
+        parser.error(f"--max_cost needs the price of {model_name} in LLM_PRICE_<MODEL> (see .env.template)")
+    usage_tracker = UsageTracker({model_name: price} if price else None, max_cost=args.max_cost, max_calls=args.max_llm_calls, metrics=metrics, logger=logger)
+    secondary_translation_service.usage_tracker = usage_tracker
+    if args.llm_batch_jobs:
+        from modules.llm_batch_jobs import BatchJobSecondaryTranslationService, batch_client_for
+        secondary_translation_service = BatchJobSecondaryTranslationService(
+            secondary_translation_service, batch_client_for(secondary_translation_service, usage_tracker=usage_tracker),
+            usage_tracker=usage_tracker, logger=logger,
+        )
+    else:
+        secondary_translation_service = RateLimitedSecondaryTranslationService(
+            secondary_translation_service, RateLimiter(*rate_limits(secondary_translation_service.service_name)),
+            max_retries=RATE_LIMIT_MAX_RETRIES, backoff_base=RATE_LIMIT_BACKOFF_BASE_SECONDS, backoff_cap=RATE_LIMIT_BACKOFF_MAX_SECONDS, logger=logger,
+        )
+        if metrics is not None:
+            # Inside the cache wrapper, so only real LLM calls are measured
+            secondary_translation_service = MetricsSecondaryTranslationService(secondary_translation_service, metrics, logger=logger)
+        # Inside the cache wrapper as well, cache hits are free
+        secondary_translation_service = BudgetedSecondaryTranslationService(secondary_translation_service, usage_tracker, logger=logger)
+    secondary_cache_store = None
+    if args.cache != "bypass":
+        secondary_cache_store = SQLiteCacheStore(
+            args.cache_file, "llm_responses",
+            ttl=CACHE_TTL_DAYS * 24 * 3600,
+            max_entries=LLM_CACHE_MAX_ENTRIES,
+            logger=logger,
+        )
+        secondary_translation_service = CachedSecondaryTranslationService(secondary_translation_service, secondary_cache_store, mode=args.cache, logger=logger)
 
-    secondary_translation_service = secondary_translation_services_mapping[args.secondary_translation]()
+    stage_timer = None
+    if args.profile:
+        stage_timer = StageTimer()
+        # Outermost, so the time of cache lookups counts as LLM calls as well
+        secondary_translation_service = StageTimedSecondaryTranslationService(secondary_translation_service, stage_timer, logger=logger)
 
     # Choose the secondary translation strategy.
     if args.secondary_strategy == "individual":
@@ -213,9 +336,14 @@ def main():
         from modules.secondary_translation_strategies import BatchLabelStrategy as SecondaryStrategy
     elif args.secondary_strategy == "hierarchy":
         from modules.secondary_translation_strategies import HierarchyStrategy as SecondaryStrategy
+    elif args.secondary_strategy == "multiconcept":
+        from modules.secondary_translation_strategies import MultiConceptStrategy as SecondaryStrategy
     else:
-        raise ValueError(f"Invalid secondary strategy: {args.secondary_strategy}. Expected one of ['individual', 'batch', 'hierarchy'].")
-    secondary_strategy = SecondaryStrategy()
+        raise ValueError(f"Invalid secondary strategy: {args.secondary_strategy}. Expected one of ['individual', 'batch', 'hierarchy', 'multiconcept'].")
+    if args.secondary_strategy == "multiconcept":
+        secondary_strategy = SecondaryStrategy(token_budget=args.llm_batch_token_budget)
+    else:
+        secondary_strategy = SecondaryStrategy()
     # Create an instance of the confidence calculator.
     primary_confidence_calculator = FrequencyConfidenceCalculator(logger=logger)
     if args.secondary_translation == "dummy":
@@ -234,21 +362,48 @@ def main():
         secondary_confidence_calculator=secondary_confidence_calculator, 
         low_confidence_threshold=args.threshold, 
         min_primary_translations=args.min_primary_translations,
-        logger=logger
+        logger=logger,
+        primary_concurrency=args.primary_concurrency,
+        max_workers=args.max_workers,
+        primary_batch_size=args.primary_batch_size,
+        service_scheduler=AdaptiveServiceScheduler() if args.primary_order == "adaptive" else None,
+        early_stopping=args.early_stopping,
+        hedge=args.hedge,
+        metrics=metrics,
+        metrics_file=args.metrics_file,
+        usage_tracker=usage_tracker,
+        stage_timer=stage_timer,
+        streaming=args.streaming,
     )
 
     if DEBUG == "True":
         # put all var values into the filename for debugging
         input_file = args.input
         stem, suffix = input_file.rsplit(".", 1)
-        output_file = f"{stem}__{args.language}_{args.threshold}_{args.primary_translation}_{args.secondary_translation}_{args.secondary_strategy}_{args.temperature}_{start_time_str}.{suffix}"
+        output_file = f"{stem}__{languages_str}_{args.threshold}_{args.primary_translation}_{args.secondary_translation}_{args.secondary_strategy}_{args.temperature}_{start_time_str}.{suffix}"
     else:
         # output filename will be input filename with _updated as suffix
         output_file = "default"
 
 
 
-    pipeline.process_file(input_file=args.input, target_lang=args.language, user_context=args.context, output_file=output_file)
+    def run():
+        pipeline.process_file(input_file=args.input, target_lang=args.language, user_context=args.context, output_file=output_file, resume=args.resume)
+
+    try:
+        if args.profile:
+            # Same naming as the output file of the pipeline
+            profile_stem = output_file.rsplit(".", 1)[0] if output_file != "default" else f"{args.input.rsplit('.', 1)[0]}_updated"
+            profile_call(run, f"{profile_stem}.prof", f"{profile_stem}.profile.txt", stage_timer, logger=logger)
+        else:
+            run()
+    finally:
+        for cache_store in (primary_cache_store, secondary_cache_store):
+            if cache_store is not None:
+                cache_store.close()
+        close_shared_clients()
+        if metrics is not None:
+            metrics.close()
 
     end_time = datetime.now()
     total_runtime = end_time - start_time
@@ -0,0 +1,184 @@
+# circuit_breaker.py
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Optional
+from modules.primary_translators.abstract_primary_translator import PrimaryTranslationService
+from modules.rate_limiter import RateLimitExceeded
+from modules.utils import ServiceWrapper, mark_not_sent
+
+
+class CircuitBreaker:
+    """
+    Health tracking of one service over its last window_size calls.
+
+    closed:    all calls are let through. If at least min_calls were made and the share of failed calls
+               (errors, rate limit give-ups, or slower than slow_call_seconds) reaches failure_rate_threshold,
+               the circuit opens.
+    open:      all calls are skipped for cooldown seconds.
+    half_open: afterwards up to half_open_probes calls are let through. If they all succeed the circuit
+               closes again, a single failure opens it for another cooldown.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_rate_threshold: float = 0.5, window_size: int = 20, min_calls: int = 10,
+                 slow_call_seconds: float | None = 10.0, cooldown: float = 60.0, half_open_probes: int = 3, logger=None):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_calls = min(min_calls, window_size)
+        self.slow_call_seconds = slow_call_seconds
+        self.cooldown = cooldown
+        self.half_open_probes = half_open_probes
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+        self.state = self.CLOSED
+        # True for every failed call of the window
+        self._window: deque[bool] = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        self._probes_started = 0
+        self._probes_succeeded = 0
+        self._lock = threading.Lock()
+        # Statistics of the run
+        self.calls = 0
+        self.failures = 0
+        self.slow_calls = 0
+        self.skipped = 0
+        self.times_opened = 0
+
+    def allow(self) -> bool:
+        """
+        Returns True if a call may be sent now, every allowed call must be followed by record().
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.cooldown:
+                    self.skipped += 1
+                    return False
+                self.state = self.HALF_OPEN
+                self._probes_started = 0
+                self._probes_succeeded = 0
+                self.logger.info(f"Circuit breaker {self.name}: half-open after {self.cooldown:.0f} s, sending up to {self.half_open_probes} probe requests")
+            if self.state == self.HALF_OPEN:
+                if self._probes_started >= self.half_open_probes:
+                    self.skipped += 1
+                    return False
+                self._probes_started += 1
+            return True
+
+    def record(self, success: bool, duration: float) -> None:
+        slow = self.slow_call_seconds is not None and duration > self.slow_call_seconds
+        failed = not success or slow
+        with self._lock:
+            self.calls += 1
+            self.failures += not success
+            self.slow_calls += slow
+            if self.state == self.HALF_OPEN:
+                if failed:
+                    self._open(f"probe request {'was too slow' if success else 'failed'}")
+                else:
+                    self._probes_succeeded += 1
+                    if self._probes_succeeded >= self.half_open_probes:
+                        self.state = self.CLOSED
+                        self._window.clear()
+                        self.logger.info(f"Circuit breaker {self.name}: closed, service is healthy again")
+                return
+            if self.state == self.OPEN:
+                # Call that was started before the circuit opened
+                return
+            self._window.append(failed)
+            if len(self._window) >= self.min_calls:
+                failure_rate = sum(self._window) / len(self._window)
+                if failure_rate >= self.failure_rate_threshold:
+                    self._open(f"{failure_rate:.0%} of the last {len(self._window)} requests failed or were slower than {self.slow_call_seconds} s")
+
+    def _open(self, reason: str) -> None:
+        # Must be called with the lock held
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        self.times_opened += 1
+        self.logger.warning(f"Circuit breaker {self.name}: open, {reason}. Skipping the service for {self.cooldown:.0f} s")
+
+
+class CircuitBreakerPrimaryTranslationService(ServiceWrapper, PrimaryTranslationService):
+    """
+    Wraps a primary translation service with a CircuitBreaker. While the circuit is open, translate()
+    returns None at once, so the pipeline moves on to the next service instead of waiting for errors
+    and timeouts. A call counts as failed if it raises; RateLimitExceeded (a rate limited service that
+    gave up retrying, see RateLimitedPrimaryTranslationService's raise_on_give_up) is turned into None.
+    No translation (None) is a valid answer, e.g. of a dictionary without an entry for the term.
+    """
+    def __init__(self, service, breaker: CircuitBreaker, logger=None):
+        super().__init__(service, logger)
+        self.breaker = breaker
+        self.max_batch_size = getattr(service, "max_batch_size", 1)
+
+    def translate(self, term: str, source_lang: str, target_lang: str) -> Optional[str]:
+        if not self.breaker.allow():
+            mark_not_sent()
+            return None
+        started = time.monotonic()
+        try:
+            translation = self.service.translate(term, source_lang, target_lang)
+        except RateLimitExceeded:
+            self.breaker.record(False, time.monotonic() - started)
+            return None
+        except Exception:
+            self.breaker.record(False, time.monotonic() - started)
+            raise
+        self.breaker.record(True, time.monotonic() - started)
+        return translation
+
+    async def atranslate(self, term: str, source_lang: str, target_lang: str) -> Optional[str]:
+        atranslate = getattr(self.service, "atranslate", None)
+        if atranslate is None:
+            return await asyncio.to_thread(self.translate, term, source_lang, target_lang)
+        if not self.breaker.allow():
+            mark_not_sent()
+            return None
+        started = time.monotonic()
+        try:
+            translation = await atranslate(term, source_lang, target_lang)
+        except RateLimitExceeded:
+            self.breaker.record(False, time.monotonic() - started)
+            return None
+        except Exception:
+            self.breaker.record(False, time.monotonic() - started)
+            raise
+        self.breaker.record(True, time.monotonic() - started)
+        return translation
+
+    def translate_batch(self, terms: list[str], source_lang: str, target_lang: str) -> list[Optional[str]]:
+        """
+        A batch counts as one call.
+        """
+        if not self.breaker.allow():
+            mark_not_sent()
+            return [None] * len(terms)
+        translate_batch = getattr(self.service, "translate_batch", None)
+        started = time.monotonic()
+        try:
+            if translate_batch is None:
+                translations = [self.service.translate(term, source_lang, target_lang) for term in terms]
+            else:
+                translations = translate_batch(terms, source_lang, target_lang)
+        except RateLimitExceeded:
+            self.breaker.record(False, time.monotonic() - started)
+            return [None] * len(terms)
+        except Exception:
+            self.breaker.record(False, time.monotonic() - started)
+            raise
+        # The latency threshold applies per term
+        duration = (time.monotonic() - started) / max(1, len(terms))
+        self.breaker.record(True, duration)
+        return translations
+
+    def report(self) -> list[str]:
+        """
+        Returns the circuit breaker statistics of this run as log lines.
+        """
+        breaker = self.breaker
+        return [f"Circuit breaker {self.service_name}: {breaker.state}, {breaker.calls} calls, {breaker.failures} failed, "
+                f"{breaker.slow_calls} slow, opened {breaker.times_opened} times, {breaker.skipped} calls skipped"]
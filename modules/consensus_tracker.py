@@ -0,0 +1,50 @@
+# consensus_tracker.py
+from collections import Counter
+
+
+class ConsensusTracker:
+    """
+    Counts the primary candidates of a property while they are collected (case-insensitive, like
+    FrequencyConfidenceCalculator) and tells when the remaining services can no longer change the outcome.
+
+    The pipeline stops collecting when a service has returned at least min_candidates in total, so at most
+    min_candidates - 1 + max_yield candidates are collected, where max_yield is the number of labels
+    (each service returns at most one candidate per label). decide() compares the current counts with
+    the best and the worst case of the remaining candidates.
+    """
+    ACCEPT = "accept"
+    REJECT = "reject"
+
+    def __init__(self, min_candidates: int, threshold: float):
+        self.min_candidates = min_candidates
+        self.threshold = threshold
+        self.counts = Counter()
+        self.total = 0
+
+    def add(self, translations) -> None:
+        for translation in translations:
+            if translation:
+                self.counts[translation.lower()] += 1
+                self.total += 1
+
+    def decide(self, remaining_services: int, max_yield: int) -> str | None:
+        """
+        Returns ACCEPT if the leading candidate stays in the lead and its confidence stays at or above the
+        threshold whatever the remaining services return, REJECT if the threshold (or min_candidates) cannot
+        be reached anymore, otherwise None.
+        ACCEPT assumes that the remaining requests would succeed, else the property could end with fewer
+        than min_candidates candidates.
+        """
+        remaining = min(remaining_services * max_yield, max(0, self.min_candidates - 1 + max_yield - self.total))
+        if self.total + remaining < self.min_candidates:
+            return self.REJECT
+        leading = self.counts.most_common(2)
+        first = leading[0][1] if leading else 0
+        second = leading[1][1] if len(leading) > 1 else 0
+        # Best case: all remaining candidates agree with the leader
+        if self.total + remaining == 0 or (first + remaining) / (self.total + remaining) < self.threshold:
+            return self.REJECT
+        # Worst case: all remaining candidates go to the runner-up
+        if first > second + remaining and first / (self.total + remaining) >= self.threshold:
+            return self.ACCEPT
+        return None
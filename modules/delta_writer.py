@@ -0,0 +1,168 @@
+# delta_writer.py
+"""
+Delta output of a run: the triples that are added to a SKOS file are written to a sidecar N-Triples file
+while the concepts are translated, and merge_delta() produces the output file from the input file and the
+delta at the end of the run, without serializing the whole graph again.
+"""
+import logging
+import mmap
+import os
+import re
+import shutil
+import time
+from itertools import groupby
+from xml.sax.saxutils import escape, quoteattr
+
+import rdflib
+
+from modules.skos_stream import RDF_NS, iter_ntriples
+
+# Formats that merge_delta() can write, N-Triples lines are valid Turtle and N3 as well
+MERGE_FORMATS = ("xml", "nt", "turtle", "n3")
+
+
+def _nt_term(term):
+    if isinstance(term, rdflib.BNode):
+        return f"_:{term}"
+    if not isinstance(term, rdflib.Literal):
+        return f"<{term}>"
+    value = str(term).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").replace("\r", "\\r")
+    if term.language:
+        return f'"{value}"@{term.language}'
+    if term.datatype:
+        return f'"{value}"^^<{term.datatype}>'
+    return f'"{value}"'
+
+
+class DeltaWriter:
+    """
+    Sidecar file (N-Triples) with the triples that were added to the graph during a run.
+
+    Added triples are buffered and written as complete lines with flush(), so the file can be read
+    (e.g. with rdflib or merge_delta()) at any time during the run and holds the translations up to
+    the last flush.
+    """
+    def __init__(self, path: str, logger=None):
+        self.path = path
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+        # True if a triple has a blank node, merge_delta() cannot link them to the nodes of the input file
+        self.has_blank_nodes = False
+        self._file = None
+        self._lines = []
+        self._last_flush = 0.0
+
+    def open(self) -> None:
+        """
+        Opens the delta file, an existing one is started over.
+        """
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._last_flush = time.monotonic()
+
+    def add(self, triple) -> None:
+        self.has_blank_nodes = self.has_blank_nodes or any(isinstance(term, rdflib.BNode) for term in triple)
+        self._lines.append(" ".join(_nt_term(term) for term in triple) + " .\n")
+
+    def flush(self, min_interval: float = 0) -> None:
+        """
+        Writes the buffered triples to disk, at most every min_interval seconds.
+        """
+        if self._file is None or not self._lines or time.monotonic() - self._last_flush < min_interval:
+            return
+        self._file.write("".join(self._lines))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._lines = []
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    def remove(self) -> None:
+        """
+        Closes and deletes the delta file, used after the output file was written successfully.
+        """
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _write_rdfxml_fragment(triples, target):
+    # One rdf:Description per subject, with all namespaces declared locally, so it can be placed into any RDF/XML document
+    for subject, subject_triples in groupby(triples, key=lambda triple: triple[0]):
+        if isinstance(subject, rdflib.BNode):
+            node = f"rdf:nodeID={quoteattr(str(subject))}"
+        else:
+            node = f"rdf:about={quoteattr(str(subject))}"
+        lines = [f'  <rdf:Description xmlns:rdf="{RDF_NS}" {node}>']
+        for _, predicate, obj in subject_triples:
+            namespace, local = re.match(r"(.*[#/])([^#/]+)$", str(predicate)).groups()
+            if isinstance(obj, rdflib.Literal):
+                lang = f" xml:lang={quoteattr(obj.language)}" if obj.language else ""
+                datatype = f" rdf:datatype={quoteattr(str(obj.datatype))}" if obj.datatype else ""
+                lines.append(f"    <p:{local} xmlns:p={quoteattr(namespace)}{lang}{datatype}>{escape(str(obj))}</p:{local}>")
+            else:
+                lines.append(f"    <p:{local} xmlns:p={quoteattr(namespace)} rdf:resource={quoteattr(str(obj))}/>")
+        lines.append("  </rdf:Description>\n")
+        target.write("\n".join(lines).encode("utf-8"))
+
+
+def _copy_range(mapped, start, end, target, chunk_size=1 << 20):
+    for offset in range(start, end, chunk_size):
+        target.write(mapped[offset:min(offset + chunk_size, end)])
+
+
+def _closing_tag_position(mapped):
+    # The closing tag is at the end of the file, only followed by whitespace and comments
+    tail_start = max(0, len(mapped) - 65536)
+    closing = None
+    for closing in re.finditer(rb"</(?:[A-Za-z_][\w.-]*:)?RDF\s*>", mapped[tail_start:]):
+        pass
+    return None if closing is None else tail_start + closing.start()
+
+
+def can_merge(input_file, fileformat):
+    """
+    Returns True if merge_delta() can add triples to input_file. RDF/XML files need an rdf:RDF root element,
+    a single typed node as root element (also valid RDF/XML) is not supported.
+    """
+    if fileformat not in MERGE_FORMATS:
+        return False
+    if fileformat != "xml":
+        return True
+    if os.path.getsize(input_file) == 0:
+        return False
+    with open(input_file, "rb") as source, mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return _closing_tag_position(mapped) is not None
+
+
+def merge_delta(input_file, fileformat, delta_file, output_file):
+    """
+    Writes a copy of input_file with the triples of delta_file added, without parsing input_file.
+    For N-Triples, Turtle and N3 the delta is appended, for RDF/XML its triples are inserted before the
+    closing tag of rdf:RDF (see can_merge()). The output is written to a temporary file first, so output_file
+    may be input_file.
+    """
+    if fileformat not in MERGE_FORMATS:
+        raise ValueError(f"Cannot merge a delta into {fileformat} files: {input_file}")
+    temporary_file = f"{output_file}.tmp"
+    if fileformat != "xml":
+        shutil.copyfile(input_file, temporary_file)
+        with open(temporary_file, "rb+") as target, open(delta_file, "rb") as delta:
+            target.seek(0, os.SEEK_END)
+            if target.tell() and (target.seek(-1, os.SEEK_END), target.read(1))[1] != b"\n":
+                target.write(b"\n")
+            shutil.copyfileobj(delta, target)
+        os.replace(temporary_file, output_file)
+        return
+    with open(input_file, "rb") as source, mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        position = _closing_tag_position(mapped)
+        if position is None:
+            raise ValueError(f"No closing rdf:RDF tag found in {input_file}")
+        with open(temporary_file, "wb") as target:
+            _copy_range(mapped, 0, position, target)
+            _write_rdfxml_fragment(iter_ntriples(delta_file, predicates=None), target)
+            _copy_range(mapped, position, len(mapped), target)
+    os.replace(temporary_file, output_file)
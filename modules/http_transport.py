@@ -0,0 +1,81 @@
+# http_transport.py
+import importlib.util
+import logging
+import threading
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from modules.utils import LoopLocal
+from config import HTTP_POOL_SIZE, HTTP2
+
+logger = logging.getLogger(__name__)
+
+# Process-wide clients, created on first use and shared by all services and threads
+_lock = threading.Lock()
+_session: requests.Session | None = None
+_client: httpx.Client | None = None
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(max_connections=HTTP_POOL_SIZE, max_keepalive_connections=HTTP_POOL_SIZE)
+
+
+def _http2() -> bool:
+    """
+    HTTP/2 is optional, httpx needs the h2 package for it.
+    """
+    if HTTP2 and importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP2 is enabled but the h2 package is not installed (pip install httpx[http2]), using HTTP/1.1")
+        return False
+    return HTTP2
+
+
+def shared_session() -> requests.Session:
+    """
+    Returns the requests session of the process. Its connections are kept alive and reused,
+    so only the first request to a host pays for the TCP and TLS handshake.
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+def shared_client() -> httpx.Client:
+    """
+    Returns the httpx client of the process (HTTP/2 if enabled), e.g. for the http_client of the LLM SDKs.
+    """
+    global _client
+    with _lock:
+        if _client is None:
+            _client = httpx.Client(limits=_limits(), http2=_http2(), timeout=httpx.Timeout(60.0))
+        return _client
+
+
+# Async clients are bound to the event loop they were created in, see LoopLocal
+_async_clients = LoopLocal(lambda: httpx.AsyncClient(limits=_limits(), http2=_http2(), timeout=httpx.Timeout(60.0)))
+
+
+def shared_async_client() -> httpx.AsyncClient:
+    """
+    Returns the httpx async client of the running event loop (HTTP/2 if enabled).
+    """
+    return _async_clients.get()
+
+
+def close_shared_clients() -> None:
+    """
+    Closes the pooled connections of the sync clients, e.g. at the end of a run.
+    """
+    global _session, _client
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+        if _client is not None:
+            _client.close()
+            _client = None
@@ -0,0 +1,53 @@
+# latency_stats.py
+import math
+import threading
+
+
+def percentile(values: list[float], p: float) -> float:
+    """
+    Returns the p-th percentile (0-100) of values with the nearest-rank method.
+    """
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class LatencyStats:
+    """
+    Collects latencies in seconds per key (e.g. per service) and summarizes them as percentiles.
+    """
+    def __init__(self):
+        self._samples: dict = {}
+        self._lock = threading.Lock()
+
+    def add(self, key, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(key, []).append(seconds)
+
+    def keys(self) -> list:
+        with self._lock:
+            return list(self._samples)
+
+    def count(self, key) -> int:
+        with self._lock:
+            return len(self._samples.get(key, []))
+
+    def percentiles(self, key, ps=(50, 95, 99)) -> dict[float, float]:
+        with self._lock:
+            values = list(self._samples.get(key, []))
+        if not values:
+            return {}
+        return {p: percentile(values, p) for p in ps}
+
+    def summary(self, key) -> str:
+        """
+        Returns e.g. "p50 120 ms, p95 800 ms, p99 2400 ms (250 requests)".
+        """
+        values = self.percentiles(key)
+        if not values:
+            return "no requests"
+        return ", ".join(f"p{p} {seconds * 1000:.0f} ms" for p, seconds in values.items()) + f" ({self.count(key)} requests)"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
@@ -0,0 +1,256 @@
+# llm_batch_jobs.py
+import hashlib
+import json
+import threading
+import time
+from typing import Optional, Any
+from modules.secondary_translators.abstract_secondary_translator import SecondaryTranslationService
+from modules.http_transport import shared_session
+from modules.utils import ServiceWrapper
+from config import OPENAI_API_KEY, ANTHROPIC_API_KEY, OPENAI_BATCH_BASE_URL, ANTHROPIC_BATCH_BASE_URL, LLM_BATCH_POLL_SECONDS, LLM_BATCH_TIMEOUT_HOURS
+
+
+class OpenAIBatchClient:
+    """
+    Runs chat completion requests with the OpenAI Batch API:
+    upload a JSONL file, create the batch, poll its status and download the output file.
+    The token usage of the results is recorded in usage_tracker if given.
+    """
+    def __init__(self, api_key: str, model_name: str, temperature: float = 1, base_url: str = OPENAI_BATCH_BASE_URL, timeout: float = 60, usage_tracker=None):
+        self.model_name = model_name
+        self.usage_tracker = usage_tracker
+        self.temperature = temperature
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.headers = {"Authorization": f"Bearer {api_key}"}
+
+    def build_request(self, custom_id: str, instructions: str, input_text: str) -> dict:
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": self.model_name,
+                "messages": [
+                    {"role": "system", "content": instructions},
+                    {"role": "user", "content": input_text},
+                ],
+                "temperature": self.temperature,
+            },
+        }
+
+    def submit(self, batch_requests: list[dict]) -> str:
+        content = "\n".join(json.dumps(request, ensure_ascii=False) for request in batch_requests).encode("utf-8")
+        response = shared_session().post(f"{self.base_url}/files", headers=self.headers, data={"purpose": "batch"},
+                                 files={"file": ("wokie_batch.jsonl", content, "application/jsonl")}, timeout=self.timeout)
+        response.raise_for_status()
+        file_id = response.json()["id"]
+        response = shared_session().post(f"{self.base_url}/batches", headers=self.headers, timeout=self.timeout,
+                                 json={"input_file_id": file_id, "endpoint": "/v1/chat/completions", "completion_window": "24h"})
+        response.raise_for_status()
+        return response.json()["id"]
+
+    def poll(self, batch_id: str) -> tuple[bool, dict]:
+        """
+        Returns a tuple (finished, batch object).
+        """
+        response = shared_session().get(f"{self.base_url}/batches/{batch_id}", headers=self.headers, timeout=self.timeout)
+        response.raise_for_status()
+        batch = response.json()
+        return batch["status"] in ("completed", "failed", "expired", "cancelled"), batch
+
+    def results(self, batch: dict) -> dict[str, Optional[str]]:
+        results = {}
+        if not batch.get("output_file_id"):
+            return results
+        response = shared_session().get(f"{self.base_url}/files/{batch['output_file_id']}/content", headers=self.headers, timeout=self.timeout)
+        response.raise_for_status()
+        for line in response.text.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            body = (item.get("response") or {}).get("body") or {}
+            if self.usage_tracker is not None:
+                self.usage_tracker.record_response("openai", self.model_name, body)
+            choices = body.get("choices") or []
+            results[item["custom_id"]] = choices[0]["message"]["content"] if choices and not item.get("error") else None
+        return results
+
+    def cancel(self, batch_id: str) -> None:
+        shared_session().post(f"{self.base_url}/batches/{batch_id}/cancel", headers=self.headers, timeout=self.timeout)
+
+
+class AnthropicBatchClient:
+    """
+    Runs requests with the Anthropic Message Batches API:
+    create the batch, poll its processing status and download the results.
+    The token usage of the results is recorded in usage_tracker if given.
+    """
+    def __init__(self, api_key: str, model_name: str, temperature: float = 1, max_tokens: int = 1024, base_url: str = ANTHROPIC_BATCH_BASE_URL, timeout: float = 60, usage_tracker=None):
+        self.model_name = model_name
+        self.usage_tracker = usage_tracker
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.headers = {"x-api-key": api_key, "anthropic-version": "2023-06-01"}
+
+    def build_request(self, custom_id: str, instructions: str, input_text: str) -> dict:
+        return {
+            "custom_id": custom_id,
+            "params": {
+                "model": self.model_name,
+                "max_tokens": self.max_tokens,
+                "temperature": self.temperature,
+                "system": instructions,
+                "messages": [{"role": "user", "content": input_text}],
+            },
+        }
+
+    def submit(self, batch_requests: list[dict]) -> str:
+        response = shared_session().post(f"{self.base_url}/messages/batches", headers=self.headers, json={"requests": batch_requests}, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()["id"]
+
+    def poll(self, batch_id: str) -> tuple[bool, dict]:
+        """
+        Returns a tuple (finished, batch object).
+        """
+        response = shared_session().get(f"{self.base_url}/messages/batches/{batch_id}", headers=self.headers, timeout=self.timeout)
+        response.raise_for_status()
+        batch = response.json()
+        return batch["processing_status"] == "ended", batch
+
+    def results(self, batch: dict) -> dict[str, Optional[str]]:
+        results = {}
+        if not batch.get("results_url"):
+            return results
+        response = shared_session().get(batch["results_url"], headers=self.headers, timeout=self.timeout)
+        response.raise_for_status()
+        for line in response.text.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            result = item.get("result") or {}
+            if result.get("type") == "succeeded":
+                if self.usage_tracker is not None:
+                    self.usage_tracker.record_response("anthropic", self.model_name, result["message"])
+                # join all text blocks (usually only one text block)
+                results[item["custom_id"]] = "".join(block.get("text", "") for block in result["message"]["content"] if block.get("type") == "text")
+            else:
+                results[item["custom_id"]] = None
+        return results
+
+    def cancel(self, batch_id: str) -> None:
+        shared_session().post(f"{self.base_url}/messages/batches/{batch_id}/cancel", headers=self.headers, timeout=self.timeout)
+
+
+def batch_client_for(service, base_url: str | None = None, usage_tracker=None):
+    """
+    Returns the batch client for a secondary translation service, only OpenAI and Anthropic offer batch jobs.
+    """
+    if service.service_name == "openai":
+        return OpenAIBatchClient(OPENAI_API_KEY, service.model_name, service.temperature, base_url=base_url or OPENAI_BATCH_BASE_URL, usage_tracker=usage_tracker)
+    if service.service_name == "anthropic":
+        return AnthropicBatchClient(ANTHROPIC_API_KEY, service.model_name, service.temperature, max_tokens=getattr(service, "max_tokens", 1024), base_url=base_url or ANTHROPIC_BATCH_BASE_URL, usage_tracker=usage_tracker)
+    raise ValueError(f"Batch jobs are only supported for openai and anthropic models, not for {service.service_name}.")
+
+
+class BatchJobSecondaryTranslationService(ServiceWrapper, SecondaryTranslationService):
+    """
+    Wraps a secondary translation service so that its prompts are answered by provider batch jobs.
+
+    translate_with_context() and rate_translation() answer prompts that were already processed by a batch job.
+    Unknown prompts are recorded and answered with None. The pipeline runs the secondary stage for all
+    low-confidence concepts, calls run_batch() to submit the recorded prompts as one batch job, waits for
+    the results and repeats the secondary stage until no new prompts are recorded.
+    Retries with the same prompt get the same answer, so invalid answers are not retried in this mode.
+    With a usage_tracker, a prompt is only recorded if it fits into the budget (see UsageTracker.acquire()).
+    The cost of a batch job is only known when it has finished, so max_cost is checked between batch jobs.
+    """
+    def __init__(self, service, client, poll_interval: float = LLM_BATCH_POLL_SECONDS, timeout: float = LLM_BATCH_TIMEOUT_HOURS * 3600, usage_tracker=None, logger=None):
+        super().__init__(service, logger)
+        self.client = client
+        self.usage_tracker = usage_tracker
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self._responses: dict[str, Optional[str]] = {}
+        self._pending: dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+        self.failed = 0
+
+    def _key(self, prompt: Any) -> str:
+        return hashlib.sha256(json.dumps(prompt, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+    def translate_with_context(self, prompt: Any) -> Optional[str]:
+        key = self._key(prompt)
+        with self._lock:
+            if key in self._responses:
+                return self._responses[key]
+            if key in self._pending:
+                return None
+            if self.usage_tracker is not None and not self.usage_tracker.acquire():
+                return None
+            self._pending[key] = prompt
+        return None
+
+    rate_translation = translate_with_context
+
+    def discard(self, prompt: Any, kind: str = "rate") -> None:
+        # A batch answer cannot be requested again, see class docstring
+        pass
+
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def run_batch(self) -> None:
+        """
+        Submits all recorded prompts as one batch job and waits for its results.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        keys = list(pending)
+        batch_requests = []
+        for number, key in enumerate(keys):
+            prompt = pending[key]
+            if not isinstance(prompt, dict):
+                raise ValueError("Prompt must be a dictionary containing 'instructions' and 'input' keys.")
+            instructions, input_text = prompt.get("instructions", ""), prompt.get("input", "")
+            batch_requests.append(self.client.build_request(f"wokie-{self.batches}-{number}", instructions, input_text))
+
+        batch_id = self.client.submit(batch_requests)
+        self.batches += 1
+        self.requests += len(batch_requests)
+        self.logger.info(f"Submitted batch job {batch_id} with {len(batch_requests)} requests to {self.service_name}")
+        print(f"\nSubmitted batch job {batch_id} with {len(batch_requests)} requests to {self.service_name}, waiting for results")
+
+        started = time.monotonic()
+        finished, batch = self.client.poll(batch_id)
+        while not finished:
+            if time.monotonic() - started > self.timeout:
+                self.logger.error(f"Batch job {batch_id} did not finish within {self.timeout} seconds, cancelling it")
+                self.client.cancel(batch_id)
+                break
+            time.sleep(self.poll_interval)
+            finished, batch = self.client.poll(batch_id)
+
+        results = self.client.results(batch) if finished else {}
+        succeeded = 0
+        for number, key in enumerate(keys):
+            response = results.get(batch_requests[number]["custom_id"])
+            if response is None:
+                self.failed += 1
+            else:
+                succeeded += 1
+            self._responses[key] = response
+            if self.usage_tracker is not None:
+                self.usage_tracker.release()
+        self.logger.info(f"Batch job {batch_id} finished, {succeeded} of {len(keys)} requests succeeded")
+
+    def report(self) -> list[str]:
+        """
+        Returns the batch job statistics of this run as log lines.
+        """
+        return [f"LLM batch jobs {self.service_name}: {self.batches} batches with {self.requests} requests, {self.failed} failed"]
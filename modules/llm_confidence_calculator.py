@@ -2,7 +2,6 @@
 import logging
 from langcodes import Language
 import re
-import ollama 
 from rdflib import Literal
 
 class LLMConfidenceCalculator():
@@ -183,6 +182,14 @@ class LLMConfidenceCalculator():
 
 
 
+    def _discard_cached_response(self, prompt):
+        """
+        Removes an invalid response from the LLM cache if the secondary service is wrapped in one.
+        """
+        discard = getattr(self.secondary_translation_service, "discard", None)
+        if discard is not None:
+            discard(prompt, "rate")
+
     def _call_llm(self, labels: list[str], translation_candidates, term_descriptions, vocab_context, user_context, target_lang_full, logger=None):
         """
         Calls the LLM using the secondary translation service that was set in the pipeline.
@@ -219,10 +226,14 @@ class LLMConfidenceCalculator():
                 if translation_candidates and best_translation.lower() not in [translation_candidate.lower() for translation_candidate in translation_candidates]:
                     if logger:
                         logger.info(f"Best translation '{best_translation}' not found in primary_translations; retrying...")
+                    self._discard_cached_response(prompt)
                     continue  
 
                 if 0.0 <= confidence <= 1.0:
                     return best_translation, confidence
+
+            # Invalid response, make sure that a retry really calls the LLM again
+            self._discard_cached_response(prompt)
     
 
 
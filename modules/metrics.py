@@ -0,0 +1,221 @@
+# metrics.py
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Any
+from modules.secondary_translators.abstract_secondary_translator import SecondaryTranslationService
+from modules.utils import ServiceWrapper
+
+# Upper bounds in seconds, from cache hits to slow LLM calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """
+    Monotonically increasing value per combination of label values.
+    """
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = tuple(labels[name] for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(labels[name] for name in self.labels), 0.0)
+
+    def samples(self) -> dict[tuple, float]:
+        """
+        Returns the values by label values (in the order of labels).
+        """
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(self.labels, key)} {value:g}" for key, value in sorted(self._values.items())]
+
+
+class Histogram:
+    """
+    Distribution of observed values (e.g. durations in seconds) in cumulative buckets per combination of label values.
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> (counts per bucket, sum, count)
+        self._values: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(labels[name] for name in self.labels)
+        with self._lock:
+            counts, total, count = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            self._values[key] = [counts, total + value, count + 1]
+
+    def count(self, **labels) -> int:
+        values = self._values.get(tuple(labels[name] for name in self.labels))
+        return values[2] if values else 0
+
+    def render(self) -> list[str]:
+        lines = []
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    le = 'le="%g"' % bound
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {bucket_count}")
+                le = 'le="+Inf"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {total:g}")
+                lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Holds the metrics of a run and renders them in the Prometheus text exposition format,
+    either written to a file (write()) or served over HTTP on a local port (serve()).
+    """
+    def __init__(self, logger=None):
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+        self._metrics: dict[str, Counter | Histogram] = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._last_write = 0.0
+
+        self.primary_requests = self.counter("wokie_primary_requests_total", "Requests to the primary translation services by outcome (translated, empty, error).", ("service", "outcome"))
+        self.primary_latency = self.histogram("wokie_primary_request_duration_seconds", "Duration of the requests to the primary translation services.", ("service",))
+        self.llm_requests = self.counter("wokie_llm_requests_total", "Calls of the secondary translation service (LLM) by call type (translate, rate) and outcome (answered, empty, error).", ("service", "model", "call_type", "outcome"))
+        self.llm_latency = self.histogram("wokie_llm_request_duration_seconds", "Duration of the calls of the secondary translation service (LLM).", ("service", "model", "call_type"))
+        self.llm_tokens = self.counter("wokie_llm_tokens_total", "Tokens used by the secondary translation service (LLM) as reported in its responses, by direction (input, output).", ("service", "model", "direction"))
+        self.llm_cost = self.counter("wokie_llm_cost_total", "Cost of the secondary translation service (LLM) calculated with the configured prices (LLM_PRICE_<MODEL>).", ("service", "model"))
+        self.decisions = self.counter("wokie_decisions_total", "Translations added to the graph by how they were chosen (primary_accepted, budget_exhausted, secondary_matched_primary, llm_rated, fallback).", ("target_lang", "decision"))
+        self.stage_latency = self.histogram("wokie_stage_duration_seconds", "Duration of the parse and serialize stages.", ("stage",), buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0))
+
+    def counter(self, name: str, documentation: str, labels: tuple = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str, min_interval: float = 0.0) -> None:
+        """
+        Writes the metrics to path (atomically, for the textfile collector of the node exporter).
+        With min_interval, the file is only written if the last write is at least that many seconds ago.
+        """
+        now = time.monotonic()
+        if min_interval and now - self._last_write < min_interval:
+            return
+        self._last_write = now
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(temporary, path)
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> int:
+        """
+        Serves the metrics on http://host:port/metrics in a background thread and returns the port.
+        """
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self._server.serve_forever, name="metrics", daemon=True).start()
+        port = self._server.server_address[1]
+        self.logger.info(f"Serving metrics on http://{host}:{port}/metrics")
+        return port
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class MetricsSecondaryTranslationService(ServiceWrapper, SecondaryTranslationService):
+    """
+    Wraps a secondary translation service and records the number, outcome and duration of its
+    translate_with_context() ("translate") and rate_translation() ("rate") calls in a MetricsRegistry.
+    """
+    def __init__(self, service, metrics: MetricsRegistry, logger=None):
+        super().__init__(service, logger)
+        self.metrics = metrics
+
+    def _record(self, call_type: str, outcome: str, started: float) -> None:
+        model = getattr(self.service, "model_name", "")
+        self.metrics.llm_requests.inc(service=self.service_name, model=model, call_type=call_type, outcome=outcome)
+        self.metrics.llm_latency.observe(time.monotonic() - started, service=self.service_name, model=model, call_type=call_type)
+
+    def _call(self, call_type: str, method, prompt: Any) -> Optional[str]:
+        started = time.monotonic()
+        try:
+            response = method(prompt)
+        except Exception:
+            self._record(call_type, "error", started)
+            raise
+        self._record(call_type, "answered" if response else "empty", started)
+        return response
+
+    def translate_with_context(self, prompt: Any) -> Optional[str]:
+        return self._call("translate", self.service.translate_with_context, prompt)
+
+    def rate_translation(self, prompt: Any) -> Optional[str]:
+        return self._call("rate", self.service.rate_translation, prompt)
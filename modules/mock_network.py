@@ -0,0 +1,74 @@
+# mock_network.py
+import math
+import random
+import threading
+import time
+from collections import deque
+from typing import Optional
+from modules.rate_limiter import RateLimitExceeded
+
+
+def mock_translation(term: str) -> str:
+    """
+    The translation that the mock services agree on, so their candidates can be compared with each other.
+    """
+    return f"{term} (translated)"
+
+
+class SimulatedEndpoint:
+    """
+    Simulated remote API for the mock translation services (benchmarks and tests).
+
+    Every call gets a latency from a log-normal distribution with the given median and sigma (0 for a
+    constant latency) and fails with probability error_rate. Both are drawn from a random generator
+    seeded with seed, the request key and the number of calls with that key, so a run sees the same
+    latencies and errors whatever the order of the calls (e.g. with concurrency).
+    With rate_limit_rps, more calls than that within one second raise RateLimitExceeded like HTTP 429.
+    """
+    def __init__(self, name: str, median_latency: float = 0.1, sigma: float = 0.5, error_rate: float = 0.0,
+                 rate_limit_rps: Optional[float] = None, seed: int = 0):
+        if not 0 <= error_rate <= 1:
+            raise ValueError("error_rate must be between 0 and 1 (inclusive)")
+        self.name = name
+        self.median_latency = median_latency
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.rate_limit_rps = rate_limit_rps
+        self.seed = seed
+        self._attempts: dict[str, int] = {}
+        self._recent: deque[float] = deque()
+        self._lock = threading.Lock()
+        # Statistics of the run
+        self.calls = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.simulated_seconds = 0.0
+
+    def draw(self, key: str) -> tuple[float, bool, random.Random]:
+        """
+        Returns (latency in seconds, whether the call fails, random generator for the answer) of the next call with key.
+        Raises RateLimitExceeded if the call exceeds the rate limit.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self.rate_limit_rps:
+                while self._recent and now - self._recent[0] >= 1.0:
+                    self._recent.popleft()
+                if len(self._recent) >= self.rate_limit_rps:
+                    self.rate_limited += 1
+                    raise RateLimitExceeded(self.name, retry_after=1.0 - (now - self._recent[0]))
+                self._recent.append(now)
+            attempt = self._attempts.get(key, 0)
+            self._attempts[key] = attempt + 1
+        rng = random.Random(f"{self.seed}:{self.name}:{key}:{attempt}")
+        latency = self.median_latency * math.exp(rng.gauss(0, self.sigma)) if self.sigma else self.median_latency
+        failed = rng.random() < self.error_rate
+        with self._lock:
+            self.calls += 1
+            self.errors += failed
+            self.simulated_seconds += latency
+        return latency, failed, rng
+
+    def report(self) -> list[str]:
+        return [f"Mock endpoint {self.name}: {self.calls} calls, {self.errors} errors, {self.rate_limited} rate limited, "
+                f"{self.simulated_seconds:.1f} s simulated latency"]
@@ -1,11 +1,40 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Optional
+from modules.utils import chunked
 
 class PrimaryTranslationService(ABC):
     """
     Abstract base class for primary translation services.
     Must implement a simple translate() method.
+    atranslate() can be overridden by services that offer a native async client,
+    otherwise translate() is run in a thread executor.
+    translate_batch() can be overridden by services whose API accepts several terms per request,
+    otherwise translate() is called for every term.
     """
+    # Maximum number of terms per request of a native translate_batch()
+    max_batch_size = 1
+
     @abstractmethod
     def translate(self, term: str, source_lang: str, target_lang: str) -> Optional[str]:
-        raise NotImplementedError("translate() must be implemented by subclasses.")
\ No newline at end of file
+        raise NotImplementedError("translate() must be implemented by subclasses.")
+
+    async def atranslate(self, term: str, source_lang: str, target_lang: str) -> Optional[str]:
+        return await asyncio.to_thread(self.translate, term, source_lang, target_lang)
+
+    def translate_batch(self, terms: list[str], source_lang: str, target_lang: str) -> list[Optional[str]]:
+        """
+        Translates several terms with the same language pair.
+        Returns a list of the same length and order as terms, None for failed terms.
+        """
+        return [self.translate(term, source_lang, target_lang) for term in terms]
+
+    def _translate_chunks(self, translate_chunk, terms: list[str], source_lang: str, target_lang: str) -> list[Optional[str]]:
+        """
+        Helper for native translate_batch() implementations: splits terms into requests of at most
+        max_batch_size terms and concatenates the results of translate_chunk(chunk, source_lang, target_lang).
+        """
+        results: list[Optional[str]] = []
+        for chunk in chunked(terms, self.max_batch_size):
+            results.extend(translate_chunk(chunk, source_lang, target_lang))
+        return results
@@ -7,9 +7,14 @@ from httpx import HTTPStatusError
 from typing import Optional
 from abc import ABC, abstractmethod
 from modules.primary_translators.abstract_primary_translator import PrimaryTranslationService
+from modules.rate_limiter import raise_if_rate_limited
+from modules.http_transport import shared_session, shared_async_client
 from config import ARGOS_BASE_URL
 
 class ArgosTranslationService(PrimaryTranslationService):
+    # LibreTranslate accepts a list of texts for q, the limit is configured on the server (--batch-limit)
+    max_batch_size = 100
+
     def __init__(self, *, logger = None, timeout: float = 5.0):
         # If no logger passed, use a module‐level logger.
         self.logger = logger or logging.getLogger(__name__)
@@ -18,34 +23,59 @@ class ArgosTranslationService(PrimaryTranslationService):
         self.timeout = timeout
         self.service_name = "argos"
 
-
-    def translate(self, term: str, source_lang: str, target_lang: str) -> Optional[str]:
-        payload = {
-            "q": term,
+    def _payload(self, term: str | list[str], source_lang: str, target_lang: str) -> dict:
+        return {
+            "q": [str(t) for t in term] if isinstance(term, list) else str(term),
             "source": source_lang,
             "target": target_lang,
             "format": "text",
             "alternatives": 0,
         }
+
+    def _log_http_error(self, e: Exception, status, text: str, term: str, source_lang: str, target_lang: str) -> None:
+        if status == 400:
+            if "is not supported" in text or "Bad Request" in text:
+                self.logger.warning(
+                    f"{self.service_name} unsupported language pair for '{term}' on translation {source_lang} -> {target_lang}\n Exception: {e!r}"
+            )
+        else:
+
+            self.logger.error(
+                f"{self.service_name} HTTP {status} for '{term}' "
+                f"[{source_lang}→{target_lang}]: {text!r}"
+            )
+
+    def translate(self, term: str, source_lang: str, target_lang: str) -> Optional[str]:
+        payload = self._payload(term, source_lang, target_lang)
         try:
-            resp = requests.post(self.translate_url, json=payload, timeout=self.timeout)
+            resp = shared_session().post(self.translate_url, json=payload, timeout=self.timeout)
             resp.raise_for_status()
             translated = resp.json()
             return translated.get("translatedText")
         except requests.HTTPError as e:
+            raise_if_rate_limited(e, self.service_name)
             status = e.response.status_code if e.response is not None else "?"
             text = e.response.text if e.response is not None else ""
-            if status == 400:
-                if "is not supported" in text or "Bad Request" in text:
-                    self.logger.warning(
-                        f"{self.service_name} unsupported language pair for '{term}' on translation {source_lang} -> {target_lang}\n Exception: {e!r}"
-                )
-            else:
+            self._log_http_error(e, status, text, term, source_lang, target_lang)
+            # Always return None if any error happens.
+            return None
+        except Exception as e:
+            self.logger.critical(
+                f"{self.service_name} unexpected error for '{term}' on translation {source_lang} -> {target_lang}\n Exception: {e!r}",
+                exc_info=True
+            )
+        return None
 
-                self.logger.error(
-                    f"{self.service_name} HTTP {status} for '{term}' "
-                    f"[{source_lang}→{target_lang}]: {text!r}"
-                )
+    async def atranslate(self, term: str, source_lang: str, target_lang: str) -> Optional[str]:
+        payload = self._payload(term, source_lang, target_lang)
+        try:
+            resp = await shared_async_client().post(self.translate_url, json=payload, timeout=self.timeout)
+            resp.raise_for_status()
+            translated = resp.json()
+            return translated.get("translatedText")
+        except HTTPStatusError as e:
+            raise_if_rate_limited(e, self.service_name)
+            self._log_http_error(e, e.response.status_code, e.response.text, term, source_lang, target_lang)
             # Always return None if any error happens.
             return None
         except Exception as e:
@@ -56,6 +86,30 @@ class ArgosTranslationService(PrimaryTranslationService):
         return None
 
 
+    def translate_batch(self, terms: list[str], source_lang: str, target_lang: str) -> list[Optional[str]]:
+        def translate_chunk(chunk, source_lang, target_lang):
+            payload = self._payload(chunk, source_lang, target_lang)
+            try:
+                resp = shared_session().post(self.translate_url, json=payload, timeout=self.timeout * len(chunk))
+                resp.raise_for_status()
+                # With a list for q, translatedText is a list in the same order
+                translated = resp.json().get("translatedText") or []
+                return list(translated) + [None] * (len(chunk) - len(translated))
+            except requests.HTTPError as e:
+                raise_if_rate_limited(e, self.service_name)
+                status = e.response.status_code if e.response is not None else "?"
+                text = e.response.text if e.response is not None else ""
+                self._log_http_error(e, status, text, f"{len(chunk)} terms", source_lang, target_lang)
+            except Exception as e:
+                self.logger.critical(
+                    f"{self.service_name} unexpected error for {len(chunk)} terms on translation {source_lang} -> {target_lang}\n Exception: {e!r}",
+                    exc_info=True
+                )
+            # Always return None if any error happens.
+            return [None] * len(chunk)
+        return self._translate_chunks(translate_chunk, terms, source_lang, target_lang)
+
+
 if __name__ == "__main__":
     translator = ArgosTranslationService()
     term = "hello world"
@@ -1,10 +1,10 @@
 import os
 import logging
-import sys
 from httpx import HTTPStatusError
 from google.cloud import translate_v3
 from google.api_core.exceptions import GoogleAPICallError
 from modules.primary_translators.abstract_primary_translator import PrimaryTranslationService
+from modules.rate_limiter import RateLimitExceeded, retry_after_seconds, raise_if_rate_limited
 import argparse
 from config import GOOGLE_PROJECT_ID
 
@@ -12,6 +12,9 @@ class GoogleTranslationService(PrimaryTranslationService):
     """
     Translation service that uses the Google Cloud Translation API.
     """
+    # Google Cloud Translation accepts up to 1024 contents per request
+    max_batch_size = 1024
+
     def __init__(self, *, logger = None):
         # Use the provided project_id or fall back to an environment variable.
         self.logger: logging.Logger = logger or logging.getLogger(__name__)
@@ -21,22 +24,10 @@ class GoogleTranslationService(PrimaryTranslationService):
         self.service_name = "google"
 
     
-    def translate(self, term: str, source_lang: str, target_lang: str) -> str | None:
-        # Default to "en-US" if source language is not provided. #TODO think about default language. SKOS allows also having no language tag
-        src_lang = source_lang if source_lang else "en-US"
-        try:
-            response = self.client.translate_text(
-                contents=[term],
-                target_language_code=target_lang,
-                parent=self.parent,
-                mime_type="text/plain",  
-                source_language_code=src_lang,
-            )
-            if response.translations:
-                # Return the first translation result. #TODO can i get synonyms here too?
-                #TODO I wonder if only the first word is extracted here. I thought this uses the first phrase / expression but I might be wrong, have to check this
-                return response.translations[0].translated_text
-        except (GoogleAPICallError) as e:
+    def _handle_exception(self, e: Exception, term: str, source_lang: str, target_lang: str) -> None:
+        if isinstance(e, GoogleAPICallError):
+            # ResourceExhausted (429)
+            raise_if_rate_limited(e, self.service_name)
             msg = str(e)
             if "Source language is invalid" in msg or "Target language is invalid" in msg:
                 # Log unsupported language tags as warning
@@ -49,30 +40,58 @@ class GoogleTranslationService(PrimaryTranslationService):
                     f"{self.service_name} translation failed for '{term}' on translation {source_lang} -> {target_lang}\n Exception: {e!r}",
                     exc_info=True
                 )
-            # Always return None if any error happens
-            return None
-        
-        except HTTPStatusError as e:
+            return
+        if isinstance(e, HTTPStatusError):
             code = e.response.status_code
             if code == 429:
-                self.logger.critical(
-                    f"{self.service_name} returned Too Many Requests – rate limit reached, exiting."
-                )
-                sys.exit(1)
+                # Retried by the rate limiter (modules/rate_limiter.py)
+                raise RateLimitExceeded(self.service_name, retry_after_seconds(e.response))
             else:
                 self.logger.critical(
                     f"{self.service_name} returned HTTP {code}: {e.response.text!r}"
                 )
                 # re-raise
-                raise
+                raise e
+        # 429 errors of client libraries that do not raise HTTPStatusError
+        raise_if_rate_limited(e, self.service_name)
+        # anything else logged as critical
+        self.logger.critical(
+            f"{self.service_name} unexpected error for '{term}' on translation {source_lang} -> {target_lang}\n Exception: {e!r}",
+            exc_info=True
+        )
+
+    def _translate_contents(self, terms: list[str], source_lang: str, target_lang: str) -> list[str | None]:
+        # Default to "en-US" if source language is not provided. #TODO think about default language. SKOS allows also having no language tag
+        src_lang = source_lang if source_lang else "en-US"
+        response = self.client.translate_text(
+            contents=[str(term) for term in terms],
+            target_language_code=target_lang,
+            parent=self.parent,
+            mime_type="text/plain",  
+            source_language_code=src_lang,
+        )
+        # The translations are in the same order as the contents
+        translations: list[str | None] = [translation.translated_text for translation in response.translations]
+        return translations + [None] * (len(terms) - len(translations))
 
+    def translate(self, term: str, source_lang: str, target_lang: str) -> str | None:
+        try:
+            # Return the first translation result. #TODO can i get synonyms here too?
+            #TODO I wonder if only the first word is extracted here. I thought this uses the first phrase / expression but I might be wrong, have to check this
+            return self._translate_contents([term], source_lang, target_lang)[0]
         except Exception as e:
-            # anything else logged as critical
-            self.logger.critical(
-                f"{self.service_name} unexpected error for '{term}' on translation {source_lang} -> {target_lang}\n Exception: {e!r}",
-                exc_info=True
-            )
+            # Always return None if any error happens
+            self._handle_exception(e, term, source_lang, target_lang)
             return None
+
+    def translate_batch(self, terms: list[str], source_lang: str, target_lang: str) -> list[str | None]:
+        def translate_chunk(chunk, source_lang, target_lang):
+            try:
+                return self._translate_contents(chunk, source_lang, target_lang)
+            except Exception as e:
+                self._handle_exception(e, f"{len(chunk)} terms", source_lang, target_lang)
+                return [None] * len(chunk)
+        return self._translate_chunks(translate_chunk, terms, source_lang, target_lang)
         
 if __name__ == "__main__":
 
@@ -1,62 +1,30 @@
 import logging
-import sys
-from httpx import HTTPStatusError
-from deep_translator import MicrosoftTranslator
-from deep_translator.exceptions import LanguageNotSupportedException
 from modules.primary_translators.abstract_primary_translator import PrimaryTranslationService
+from modules.http_transport import shared_session
+from modules.rate_limiter import RateLimitExceeded, retry_after_seconds, raise_if_rate_limited
 from config import MICROSOFT_API_KEY, MICROSOFT_REGION
 
 
 
 class MicrosoftTranslationService(PrimaryTranslationService):
+    # The Translator REST API accepts up to 1000 texts per request
+    max_batch_size = 1000
+    base_url = "https://api.cognitive.microsofttranslator.com/translate"
+
     def __init__(self, *, logger = None):
         # If no logger passed, use a module‐level logger
         self.logger: logging.Logger = logger or logging.getLogger(__name__)
         self.service_name = "microsoft"
 
     def translate(self, term: str, source_lang: str, target_lang: str) -> str | None:
+        # Same REST request as for batches, over the shared connection pool instead of a new
+        # deep_translator MicrosoftTranslator (and connection) per call
         try:
-            microsoft_translator = MicrosoftTranslator(
-                source=source_lang,
-                target=target_lang,
-                api_key=MICROSOFT_API_KEY,
-                region=MICROSOFT_REGION
-            )
-            translated = microsoft_translator.translate(term)
-            return translated
-        
-
-        except LanguageNotSupportedException as e:
-            msg = str(e)
-            if "Unsupported from_language" in msg or "Unsupported to_language" in msg:
-                # Log unsupported language tags as warning
-                self.logger.warning(
-                    f"{self.service_name} unsupported language pair for '{term}' on translation {source_lang} -> {target_lang}\n Exception: {e!r}"
-                )
-            else:
-                # Log any other exception as error
-                self.logger.error(
-                    f"{self.service_name} translation failed for '{term}' on translation {source_lang} -> {target_lang}\n Exception: {e!r}",
-                    exc_info=True
-                )
-            # Always return None if any error happens
-            return None
-        
-        except HTTPStatusError as e:
-            code = e.response.status_code
-            if code == 429:
-                self.logger.critical(
-                    f"{self.service_name} returned Too Many Requests – rate limit reached, exiting."
-                )
-                sys.exit(1)
-            else:
-                self.logger.critical(
-                    f"{self.service_name} returned HTTP {code}: {e.response.text!r}"
-                )
-                # re-raise
-                raise
+            return self._translate_texts([term], source_lang, target_lang)[0]
 
         except Exception as e:
+            # RateLimitExceeded from _translate_texts() is passed on to the rate limiter
+            raise_if_rate_limited(e, self.service_name)
             # anything else logged as critical
             self.logger.critical(
                 f"{self.service_name} unexpected error for '{term}' on translation {source_lang} -> {target_lang}\n Exception: {e!r}",
@@ -65,6 +33,47 @@ class MicrosoftTranslationService(PrimaryTranslationService):
             return None
 
 
+    def _translate_texts(self, terms: list[str], source_lang: str, target_lang: str) -> list[str | None]:
+        """
+        Sends several texts in one request to the Translator REST API.
+        """
+        headers = {
+            "Ocp-Apim-Subscription-Key": MICROSOFT_API_KEY,
+            "Content-type": "application/json",
+        }
+        if MICROSOFT_REGION:
+            headers["Ocp-Apim-Subscription-Region"] = MICROSOFT_REGION
+        params = {"api-version": "3.0", "from": source_lang, "to": target_lang}
+        response = shared_session().post(self.base_url, params=params, headers=headers, json=[{"text": str(term)} for term in terms], timeout=10)
+        if response.status_code == 429:
+            # Retried by the rate limiter (modules/rate_limiter.py)
+            raise RateLimitExceeded(self.service_name, retry_after_seconds(response))
+        if response.status_code == 400:
+            # e.g. unsupported language (error codes 400035, 400036)
+            self.logger.warning(
+                f"{self.service_name} unsupported language pair or invalid request for {len(terms)} terms on translation {source_lang} -> {target_lang}\n Response: {response.text!r}"
+            )
+            return [None] * len(terms)
+        response.raise_for_status()
+        # One result per text, in the same order: [{"translations": [{"text": ..., "to": ...}]}, ...]
+        return [item["translations"][0]["text"] if item.get("translations") else None for item in response.json()]
+
+    def translate_batch(self, terms: list[str], source_lang: str, target_lang: str) -> list[str | None]:
+        def translate_chunk(chunk, source_lang, target_lang):
+            try:
+                return self._translate_texts(chunk, source_lang, target_lang)
+            except Exception as e:
+                # 429 errors of client libraries that do not raise HTTPStatusError
+                raise_if_rate_limited(e, self.service_name)
+                # anything else logged as critical
+                self.logger.critical(
+                    f"{self.service_name} unexpected error for {len(chunk)} terms on translation {source_lang} -> {target_lang}\n Exception: {e!r}",
+                    exc_info=True
+                )
+                return [None] * len(chunk)
+        return self._translate_chunks(translate_chunk, terms, source_lang, target_lang)
+
+
 
     
 if __name__ == "__main__":
@@ -0,0 +1,50 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+from modules.primary_translators.abstract_primary_translator import PrimaryTranslationService
+from modules.mock_network import SimulatedEndpoint, mock_translation
+
+
+class MockPrimaryTranslationService(PrimaryTranslationService):
+    """
+    Primary translation service without network access for benchmarks and tests, with the latency,
+    errors and rate limit of a SimulatedEndpoint.
+    With probability agreement, a term is translated with mock_translation() (the same candidate as the
+    other mock services), otherwise with a candidate of its own. Failed calls return None.
+    With max_batch_size > 1, translate_batch() sends up to that many terms in one simulated request.
+    """
+    def __init__(self, service_name: str = "mock", median_latency: float = 0.1, sigma: float = 0.5, error_rate: float = 0.0,
+                 rate_limit_rps: Optional[float] = None, agreement: float = 0.8, max_batch_size: int = 1, seed: int = 0, *, logger=None):
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+        self.service_name = service_name
+        self.agreement = agreement
+        self.max_batch_size = max_batch_size
+        self.endpoint = SimulatedEndpoint(service_name, median_latency, sigma, error_rate, rate_limit_rps, seed)
+
+    def _answer(self, terms: list[str], source_lang: str, target_lang: str) -> tuple[float, list[Optional[str]]]:
+        latency, failed, rng = self.endpoint.draw(f"{source_lang}:{target_lang}:{'|'.join(terms)}")
+        if failed:
+            self.logger.error(f"{self.service_name} simulated error for {terms}")
+            return latency, [None] * len(terms)
+        return latency, [mock_translation(term) if rng.random() < self.agreement else f"{term} ({self.service_name})" for term in terms]
+
+    def translate(self, term: str, source_lang: str, target_lang: str) -> Optional[str]:
+        latency, translations = self._answer([term], source_lang, target_lang)
+        time.sleep(latency)
+        return translations[0]
+
+    async def atranslate(self, term: str, source_lang: str, target_lang: str) -> Optional[str]:
+        latency, translations = self._answer([term], source_lang, target_lang)
+        await asyncio.sleep(latency)
+        return translations[0]
+
+    def translate_batch(self, terms: list[str], source_lang: str, target_lang: str) -> list[Optional[str]]:
+        def translate_chunk(chunk, source_lang, target_lang):
+            latency, translations = self._answer(chunk, source_lang, target_lang)
+            time.sleep(latency)
+            return translations
+        return self._translate_chunks(translate_chunk, terms, source_lang, target_lang)
+
+    def report(self) -> list[str]:
+        return self.endpoint.report()
@@ -1,9 +1,9 @@
 import logging
 import translators
-import sys
 from httpx import HTTPStatusError
 from translators.server import TranslatorError
 from modules.primary_translators.abstract_primary_translator import PrimaryTranslationService
+from modules.rate_limiter import RateLimitExceeded, retry_after_seconds, raise_if_rate_limited
 
 
 
@@ -56,10 +56,8 @@ class ModernMTTranslationService(PrimaryTranslationService):
         except HTTPStatusError as e:
             code = e.response.status_code
             if code == 429:
-                self.logger.critical(
-                    f"{self.service_name} returned Too Many Requests – rate limit reached, exiting."
-                )
-                sys.exit(1)
+                # Retried by the rate limiter (modules/rate_limiter.py)
+                raise RateLimitExceeded(self.service_name, retry_after_seconds(e.response))
             else:
                 self.logger.critical(
                     f"{self.service_name} returned HTTP {code}: {e.response.text!r}"
@@ -68,6 +66,8 @@ class ModernMTTranslationService(PrimaryTranslationService):
                 raise
 
         except Exception as e:
+            # 429 errors of client libraries that do not raise HTTPStatusError
+            raise_if_rate_limited(e, self.service_name)
             # anything else logged as critical
             self.logger.critical(
                 f"{self.service_name} unexpected error for '{term}' on translation {source_lang} -> {target_lang}\n Exception: {e!r}",
@@ -1,35 +1,35 @@
 import logging
-import requests
-import sys
+import httpx
 from httpx import HTTPStatusError
 from requests.exceptions import Timeout, RequestException
 from modules.primary_translators.abstract_primary_translator import PrimaryTranslationService
+from modules.rate_limiter import RateLimitExceeded, retry_after_seconds, raise_if_rate_limited
+from modules.http_transport import shared_session, shared_async_client
 from config import PONS_API_KEY
 
 class PonsPaidTranslationService(PrimaryTranslationService):
+    # Number of segments sent in one request
+    max_batch_size = 50
+
     def __init__(self, *, logger=None):
         self.base_url = "https://translate-api.pons.com/v1/translate"
         # If no logger passed, use a module‐level logger
         self.logger: logging.Logger = logger or logging.getLogger(__name__)
         self.service_name = "ponspaid"
 
-    def translate(self, term: str, source_lang: str, target_lang: str) -> str | None:
-
+    def _is_supported(self, term: str, source_lang: str, target_lang: str) -> bool:
         langs_allowed = ["ar", "no", "bg", "ca", "zh", "hr", "cs", "da", "nl", "en", "et", "fi", "fr", "de", "el", "hi", "hu", "ga", "it", "ja", "ko", "lv", "lt", "nn", "pl", "pt", "ro", "ru", "sk", "sl", "es", "sv", "tr", "uk"]
         if source_lang not in langs_allowed or target_lang not in langs_allowed:
             self.logger.warning(
                     f"{self.service_name} unsupported language pair for '{term}' on translation {source_lang} -> {target_lang}\n"
                 )
-            return None
-
-        # # Pons in general only allows latin in combination with german
-        # # Seems like latin is not implemented in the API
-        # if "la" in (source_lang, target_lang) and {source_lang, target_lang} != {"la", "de"}:
-        #     self.logger.warning(
-        #         f"{self.service_name} only allows latin in combination with german: failed on '{term}' on translation {source_lang} -> {target_lang}\n "
-        #     )
-        #     return None
+            return False
+        return True
 
+    def _request(self, term: str | list[str], source_lang: str, target_lang: str) -> tuple[dict, dict]:
+        """
+        Returns the headers and the payload of a translation request, term can be a list for several segments.
+        """
         headers = {
             "Accept": "application/json",
             "X-PONS-APIKEY": PONS_API_KEY,
@@ -39,11 +39,46 @@ class PonsPaidTranslationService(PrimaryTranslationService):
             "sourceLanguage": source_lang,
             "targetLanguage": target_lang,
             "segments": [
-                {"text": term}
+                {"text": str(t)} for t in (term if isinstance(term, list) else [term])
             ]
         }
+        return headers, payload
+
+    def _handle_exception(self, e: Exception, term: str, source_lang: str, target_lang: str) -> None:
+        if isinstance(e, HTTPStatusError):
+            code = e.response.status_code
+            if code == 429:
+                # Retried by the rate limiter (modules/rate_limiter.py)
+                raise RateLimitExceeded(self.service_name, retry_after_seconds(e.response))
+            else:
+                self.logger.critical(
+                    f"{self.service_name} returned HTTP {code}: {e.response.text!r}"
+                )
+                # re-raise
+                raise e
+        # 429 errors of client libraries that do not raise HTTPStatusError
+        raise_if_rate_limited(e, self.service_name)
+        # anything else logged as critical
+        self.logger.critical(
+            f"{self.service_name} unexpected error for '{term}' on translation {source_lang} -> {target_lang}\n Exception: {e!r}",
+            exc_info=True
+        )
+
+    def translate(self, term: str, source_lang: str, target_lang: str) -> str | None:
+        if not self._is_supported(term, source_lang, target_lang):
+            return None
+
+        # # Pons in general only allows latin in combination with german
+        # # Seems like latin is not implemented in the API
+        # if "la" in (source_lang, target_lang) and {source_lang, target_lang} != {"la", "de"}:
+        #     self.logger.warning(
+        #         f"{self.service_name} only allows latin in combination with german: failed on '{term}' on translation {source_lang} -> {target_lang}\n "
+        #     )
+        #     return None
+
+        headers, payload = self._request(term, source_lang, target_lang)
         try:
-            response = requests.post(self.base_url, headers=headers, json=payload, timeout = 2)
+            response = shared_session().post(self.base_url, headers=headers, json=payload, timeout = 2)
             response.raise_for_status()
             data = response.json()
 
@@ -55,28 +90,50 @@ class PonsPaidTranslationService(PrimaryTranslationService):
             self.logger.warning(f"{self.service_name} request timed out for '{term}' from {source_lang} to {target_lang}")
             return None
     
-        except HTTPStatusError as e:
-            code = e.response.status_code
-            if code == 429:
-                self.logger.critical(
-                    f"{self.service_name} returned Too Many Requests – rate limit reached, exiting."
-                )
-                sys.exit(1)
-            else:
-                self.logger.critical(
-                    f"{self.service_name} returned HTTP {code}: {e.response.text!r}"
-                )
-                # re-raise
-                raise
+        except Exception as e:
+            self._handle_exception(e, term, source_lang, target_lang)
+            return None
+
+    async def atranslate(self, term: str, source_lang: str, target_lang: str) -> str | None:
+        if not self._is_supported(term, source_lang, target_lang):
+            return None
+
+        headers, payload = self._request(term, source_lang, target_lang)
+        try:
+            response = await shared_async_client().post(self.base_url, headers=headers, json=payload, timeout = 2)
+            response.raise_for_status()
+            data = response.json()
+
+            # the translated text should be in segments[0].text
+            return data["segments"][0]["text"]
+
+        except httpx.TimeoutException:
+            self.logger.warning(f"{self.service_name} request timed out for '{term}' from {source_lang} to {target_lang}")
+            return None
 
         except Exception as e:
-            # anything else logged as critical
-            self.logger.critical(
-                f"{self.service_name} unexpected error for '{term}' on translation {source_lang} -> {target_lang}\n Exception: {e!r}",
-                exc_info=True
-            )
+            self._handle_exception(e, term, source_lang, target_lang)
             return None
 
+    def translate_batch(self, terms: list[str], source_lang: str, target_lang: str) -> list[str | None]:
+        if not self._is_supported(f"{len(terms)} terms", source_lang, target_lang):
+            return [None] * len(terms)
+
+        def translate_chunk(chunk, source_lang, target_lang):
+            headers, payload = self._request(chunk, source_lang, target_lang)
+            try:
+                response = shared_session().post(self.base_url, headers=headers, json=payload, timeout = 2 + 0.1 * len(chunk))
+                response.raise_for_status()
+                # the translated segments are in the same order as the sent segments
+                segments = response.json()["segments"]
+                return [segment.get("text") for segment in segments] + [None] * (len(chunk) - len(segments))
+            except Timeout:
+                self.logger.warning(f"{self.service_name} request timed out for {len(chunk)} terms from {source_lang} to {target_lang}")
+            except Exception as e:
+                self._handle_exception(e, f"{len(chunk)} terms", source_lang, target_lang)
+            return [None] * len(chunk)
+        return self._translate_chunks(translate_chunk, terms, source_lang, target_lang)
+
     
 if __name__ == "__main__":
 
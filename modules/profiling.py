@@ -0,0 +1,108 @@
+# profiling.py
+import cProfile
+import io
+import logging
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, Any
+from modules.secondary_translators.abstract_secondary_translator import SecondaryTranslationService
+from modules.utils import ServiceWrapper
+
+
+class StageTimer:
+    """
+    Adds up the wall time spent in the stages of a run (see stage()).
+
+    Stages can be nested within a thread, e.g. LLM calls within the confidence calculation. The time of a
+    nested stage is only counted for the nested stage, so the times of all stages add up to at most the
+    duration of the run. Stages that are entered in several threads at once (not done by the pipeline)
+    would be counted once per thread.
+    """
+    def __init__(self):
+        # stage -> [exclusive seconds, number of times entered]
+        self.stages: dict[str, list] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str):
+        stack = self._local.__dict__.setdefault("stack", [])
+        # [name, start, seconds spent in nested stages]
+        frame = [name, time.perf_counter(), 0.0]
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            stack.pop()
+            duration = time.perf_counter() - frame[1]
+            if stack:
+                stack[-1][2] += duration
+            with self._lock:
+                entry = self.stages.setdefault(name, [0.0, 0])
+                entry[0] += duration - frame[2]
+                entry[1] += 1
+
+    def summary(self, total_seconds: float) -> list[str]:
+        """
+        Returns a table of the stages with their time and share of total_seconds.
+        """
+        lines = [f"{'stage':<32} {'seconds':>10} {'share':>7} {'count':>8}"]
+        accounted = 0.0
+        for name, (seconds, count) in self.stages.items():
+            accounted += seconds
+            lines.append(f"{name:<32} {seconds:>10.3f} {seconds / total_seconds if total_seconds else 0:>7.1%} {count:>8}")
+        other = max(0.0, total_seconds - accounted)
+        lines.append(f"{'other':<32} {other:>10.3f} {other / total_seconds if total_seconds else 0:>7.1%}")
+        lines.append(f"{'total':<32} {total_seconds:>10.3f}")
+        return lines
+
+
+class StageTimedSecondaryTranslationService(ServiceWrapper, SecondaryTranslationService):
+    """
+    Wraps a secondary translation service and counts its calls as the stage "LLM calls" of a StageTimer.
+    """
+    STAGE = "LLM calls"
+
+    def __init__(self, service, stage_timer: StageTimer, logger=None):
+        super().__init__(service, logger)
+        self.stage_timer = stage_timer
+
+    def translate_with_context(self, prompt: Any) -> Optional[str]:
+        with self.stage_timer.stage(self.STAGE):
+            return self.service.translate_with_context(prompt)
+
+    def rate_translation(self, prompt: Any) -> Optional[str]:
+        with self.stage_timer.stage(self.STAGE):
+            return self.service.rate_translation(prompt)
+
+def profile_call(function, pstats_path: str, summary_path: str, stage_timer: StageTimer | None = None, top: int = 30, logger=None):
+    """
+    Runs function() with cProfile, writes the statistics to pstats_path (for pstats, snakeviz, ...) and a
+    human-readable summary to summary_path: the time per stage of stage_timer and the functions with the
+    highest cumulative time. Only the calling thread is profiled, requests that run in the thread pool of
+    the primary services (--primary_concurrency thread) show up as waiting time.
+    Returns the result of function().
+    """
+    logger = logger or logging.getLogger(__name__)
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        return function()
+    finally:
+        profiler.disable()
+        total_seconds = time.perf_counter() - started
+        profiler.dump_stats(pstats_path)
+        functions = io.StringIO()
+        pstats.Stats(profiler, stream=functions).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+        with open(summary_path, "w", encoding="utf-8") as f:
+            f.write(f"Profile of the translation run ({total_seconds:.3f} s wall time)\n\n")
+            if stage_timer is not None:
+                f.write("Time per stage (nested stages are not counted for the outer stage):\n")
+                f.write("\n".join(stage_timer.summary(total_seconds)) + "\n\n")
+            f.write(f"Top {top} functions by cumulative time (main thread):\n")
+            f.write(functions.getvalue())
+        logger.info(f"Profile written to {pstats_path} and {summary_path}")
+        print(f"\nProfile written to {pstats_path} and {summary_path}")
@@ -51,3 +51,19 @@ class DummyPromptFormatter(PromptFormatter):
             f"Return only the translated term in {target_lang} and nothing else."
         )
         return {"instructions": instructions, "input": composed_text}
+
+
+class MultiTermPromptFormatter(PromptFormatter):
+    """
+    Formatter for prompts that contain several numbered terms (MultiConceptStrategy).
+    The same instructions are used for all services, the answer is a JSON array.
+    """
+    def format(self, composed_text: str, target_lang: str) -> dict:
+        instructions = (
+            f"You are a machine translation system that translates terms from any language to {target_lang}.\n "
+            f"The input contains several numbered items. Each item is a single term, given as one or more labels in different languages. "
+            f"To determine the correct context, use the provided additional details.\n "
+            f"Return only a JSON array with one object per item in this format and nothing else, especially don't give any notes, explanations or reasoning steps:\n "
+            f'[{{"id": 1, "translation": "translated term"}}, {{"id": 2, "translation": "translated term"}}]'
+        )
+        return {"instructions": instructions, "input": composed_text}
@@ -0,0 +1,235 @@
+# rate_limiter.py
+import asyncio
+import email.utils
+import random
+import threading
+import time
+from typing import Optional, Any
+from modules.primary_translators.abstract_primary_translator import PrimaryTranslationService
+from modules.secondary_translators.abstract_secondary_translator import SecondaryTranslationService
+from modules.utils import ServiceWrapper
+
+
+class RateLimitExceeded(Exception):
+    """
+    Raised by the translation services when the provider answers with HTTP 429 (Too Many Requests).
+    retry_after holds the seconds from a Retry-After header, if there was one.
+    """
+    def __init__(self, service_name: str, retry_after: Optional[float] = None):
+        super().__init__(f"{service_name} returned Too Many Requests – rate limit reached")
+        self.service_name = service_name
+        self.retry_after = retry_after
+
+
+def retry_after_seconds(response) -> Optional[float]:
+    """
+    Returns the seconds of the Retry-After header of a response (seconds or HTTP date), None if there is none.
+    """
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+def raise_if_rate_limited(e: Exception, service_name: str) -> None:
+    """
+    Raises RateLimitExceeded if e is a 429 error of one of the client libraries
+    (httpx, requests, openai, anthropic, mistral, google, deep_translator).
+    """
+    if isinstance(e, RateLimitExceeded):
+        raise e
+    response = getattr(e, "response", None)
+    status = getattr(e, "status_code", None) or getattr(response, "status_code", None) or getattr(e, "code", None)
+    if status == 429 or type(e).__name__ == "TooManyRequests":
+        raise RateLimitExceeded(service_name, retry_after_seconds(response)) from e
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that refills rate tokens per second up to capacity.
+    """
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """
+        Takes amount tokens and returns the seconds to wait until they are available.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class RateLimiter:
+    """
+    Limits the requests per second and the (estimated) tokens per minute of one service.
+    Both limits can be None. pause() blocks all requests of the service for some time, e.g. after a 429.
+    """
+    def __init__(self, requests_per_second: Optional[float] = None, tokens_per_minute: Optional[float] = None):
+        self.requests = TokenBucket(requests_per_second) if requests_per_second else None
+        self.tokens = TokenBucket(tokens_per_minute / 60, capacity=tokens_per_minute) if tokens_per_minute else None
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.waited = 0.0
+
+    def reserve(self, tokens: float = 0) -> float:
+        """
+        Returns the seconds to wait before the next request may be sent.
+        """
+        with self._lock:
+            wait = self._paused_until - time.monotonic()
+        if self.requests is not None:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens is not None and tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+        wait = max(0.0, wait)
+        self.waited += wait
+        return wait
+
+    def acquire(self, tokens: float = 0) -> None:
+        wait = self.reserve(tokens)
+        if wait:
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: float = 0) -> None:
+        wait = self.reserve(tokens)
+        if wait:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None, base: float = 1.0, cap: float = 60.0) -> float:
+    """
+    Seconds to wait before retry number attempt (starting at 0). A Retry-After value is honored,
+    otherwise the delay grows exponentially with jitter (between half and the full delay).
+    """
+    if retry_after is not None:
+        return retry_after + random.uniform(0, base)
+    delay = min(cap, base * 2 ** attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class _RateLimitedService(ServiceWrapper):
+    """
+    Shared retry logic of the rate limited service wrappers.
+    """
+    def _init_limits(self, service, limiter: RateLimiter, max_retries: int, backoff_base: float, backoff_cap: float, logger, raise_on_give_up: bool = False) -> None:
+        super().__init__(service, logger)
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.raise_on_give_up = raise_on_give_up
+        self.rate_limited = 0
+        self.given_up = 0
+
+    def _on_rate_limit(self, e: RateLimitExceeded, attempt: int) -> None:
+        delay = backoff_delay(attempt, e.retry_after, self.backoff_base, self.backoff_cap)
+        # Slows down all requests to this service, not only the retried one
+        self.limiter.pause(delay)
+        self.rate_limited += 1
+        self.logger.warning(f"{self.service_name} rate limit reached, retrying in {delay:.1f} s (attempt {attempt + 1}/{self.max_retries})")
+
+    def _give_up(self, e: RateLimitExceeded, default):
+        self.given_up += 1
+        self.logger.error(f"{self.service_name} still rate limited after {self.max_retries} retries, skipping this request")
+        if self.raise_on_give_up:
+            raise e
+        return default
+
+    def _call(self, method, *args, tokens: float = 0, default=None):
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(tokens)
+            try:
+                return method(*args)
+            except RateLimitExceeded as e:
+                if attempt == self.max_retries:
+                    return self._give_up(e, default)
+                self._on_rate_limit(e, attempt)
+
+    async def _acall(self, method, *args, tokens: float = 0, default=None):
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.aacquire(tokens)
+            try:
+                return await method(*args)
+            except RateLimitExceeded as e:
+                if attempt == self.max_retries:
+                    return self._give_up(e, default)
+                self._on_rate_limit(e, attempt)
+
+    def report(self) -> list[str]:
+        """
+        Returns the rate limiter statistics of this run as log lines.
+        """
+        return [f"Rate limiter {self.service_name}: rate limited {self.rate_limited} times, {self.given_up} requests skipped, waited {self.limiter.waited:.1f} s"]
+
+
+class RateLimitedPrimaryTranslationService(_RateLimitedService, PrimaryTranslationService):
+    """
+    Wraps a primary translation service: keeps its request rate within the limiter's budget and
+    retries requests that fail with RateLimitExceeded. After max_retries the term is skipped (None),
+    or with raise_on_give_up the last RateLimitExceeded is raised (e.g. for the circuit breaker).
+    """
+    def __init__(self, service, limiter: RateLimiter, max_retries: int = 6, backoff_base: float = 1.0, backoff_cap: float = 60.0, logger=None,
+                 raise_on_give_up: bool = False):
+        self._init_limits(service, limiter, max_retries, backoff_base, backoff_cap, logger, raise_on_give_up)
+        self.max_batch_size = getattr(service, "max_batch_size", 1)
+
+    def translate(self, term: str, source_lang: str, target_lang: str) -> Optional[str]:
+        return self._call(self.service.translate, term, source_lang, target_lang)
+
+    async def atranslate(self, term: str, source_lang: str, target_lang: str) -> Optional[str]:
+        atranslate = getattr(self.service, "atranslate", None)
+        if atranslate is None:
+            return await asyncio.to_thread(self.translate, term, source_lang, target_lang)
+        return await self._acall(atranslate, term, source_lang, target_lang)
+
+    def translate_batch(self, terms: list[str], source_lang: str, target_lang: str) -> list[Optional[str]]:
+        translate_batch = getattr(self.service, "translate_batch", None)
+        if translate_batch is None:
+            return [self.translate(term, source_lang, target_lang) for term in terms]
+        return self._call(translate_batch, terms, source_lang, target_lang, default=[None] * len(terms))
+
+
+class RateLimitedSecondaryTranslationService(_RateLimitedService, SecondaryTranslationService):
+    """
+    Wraps a secondary translation service, see RateLimitedPrimaryTranslationService.
+    The tokens of a prompt are estimated from its length for the tokens per minute budget.
+    """
+    # Rough number of characters per token
+    CHARS_PER_TOKEN = 4
+
+    def __init__(self, service, limiter: RateLimiter, max_retries: int = 6, backoff_base: float = 1.0, backoff_cap: float = 60.0, logger=None):
+        self._init_limits(service, limiter, max_retries, backoff_base, backoff_cap, logger)
+
+    def _estimate_tokens(self, prompt: Any) -> int:
+        if isinstance(prompt, dict):
+            return (len(prompt.get("instructions", "")) + len(prompt.get("input", ""))) // self.CHARS_PER_TOKEN
+        return len(str(prompt)) // self.CHARS_PER_TOKEN
+
+    def translate_with_context(self, prompt: Any) -> Optional[str]:
+        return self._call(self.service.translate_with_context, prompt, tokens=self._estimate_tokens(prompt))
+
+    def rate_translation(self, prompt: Any) -> Optional[str]:
+        return self._call(self.service.rate_translation, prompt, tokens=self._estimate_tokens(prompt))
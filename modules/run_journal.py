@@ -0,0 +1,64 @@
+# run_journal.py
+import json
+import logging
+import os
+
+
+class RunJournal:
+    """
+    Append-only journal (JSON Lines) of the translations that were completed during a run.
+
+    Every line holds one translated property of a concept: the chosen label, its confidence, the
+    stage that decided it and the raw candidates. Lines are flushed to disk immediately, so the
+    journal survives crashes and aborted runs and can be replayed with --resume.
+    """
+    def __init__(self, path: str, logger=None):
+        self.path = path
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+        self._file = None
+
+    def load(self) -> list[dict]:
+        """
+        Returns all complete records of an existing journal. An incomplete last line
+        (e.g. from a crash while writing) is ignored.
+        """
+        if not os.path.exists(self.path):
+            return []
+        records = []
+        with open(self.path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    self.logger.warning(f"Ignoring incomplete line {line_number} in journal {self.path}")
+        return records
+
+    def open(self, resume: bool = False) -> None:
+        """
+        Opens the journal for appending. Without resume, an existing journal is started over.
+        """
+        if not resume and os.path.exists(self.path):
+            self.logger.warning(f"Overwriting existing journal {self.path}, use --resume to continue the previous run instead")
+        self._file = open(self.path, "a" if resume else "w", encoding="utf-8")
+
+    def append(self, record: dict) -> None:
+        # default=str for rdflib terms and other non-JSON values
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self) -> None:
+        """
+        Closes and deletes the journal, used after the output file was written successfully.
+        """
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
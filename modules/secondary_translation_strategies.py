@@ -1,8 +1,9 @@
-import rdflib
-from typing import List, Dict
+import json
+from typing import List, Dict, Optional
 from langcodes import Language
 from collections import defaultdict, OrderedDict
 from modules.prompt_builders import PromptBuilder
+from modules.prompt_formatters import MultiTermPromptFormatter
 from modules.prompt_components import PromptComponent, TermLabelsComponent, TermDescriptionComponent, BroaderChainComponent, GeneralContextComponent, GenericComponent
 
 # Helper functions
@@ -58,7 +59,7 @@ def group_labels_by_language(labels):
     return grouped
 
 class BaseSecondaryTranslationStrategy:
-    def translate(self, labels, graph, concept, term_props, vocab_context, user_context,
+    def translate(self, labels, concept_index, concept, term_props, vocab_context, user_context,
                   secondary_translation_service, target_lang, logger=None):
         """
         Abstract method to translate a list of labels.
@@ -71,7 +72,7 @@ class IndividualLabelStrategy(BaseSecondaryTranslationStrategy):
     Returns dict with languages as key and translation as value
     Calculates the translations individually for each language tag using individual prompts.
     """
-    def translate(self, labels, graph, concept, term_props, vocab_context, user_context,
+    def translate(self, labels, concept_index, concept, term_props, vocab_context, user_context,
                   secondary_translation_service, target_lang, logger=None):
         term_descriptions = get_term_descriptions(term_props)
         #TODO check which fiels are used for descriptions.
@@ -121,7 +122,7 @@ class BatchLabelStrategy(BaseSecondaryTranslationStrategy):
     Returns a single translation
     Calculates the translations using all available languages for each language tag and compiles it into a single prompt.
     """
-    def translate(self, labels, graph, concept, term_props, vocab_context, user_context,
+    def translate(self, labels, concept_index, concept, term_props, vocab_context, user_context,
                   secondary_translation_service, target_lang, logger=None):
         term_descriptions = get_term_descriptions(term_props)
         grouped = group_labels_by_language(labels)
@@ -172,6 +173,141 @@ class BatchLabelStrategy(BaseSecondaryTranslationStrategy):
         # returns a single translation
         return translation
 
+#  Multi Concept Strategy 
+class MultiConceptStrategy(BaseSecondaryTranslationStrategy):
+    """
+    Returns a single translation per concept
+    Packs the labels of several concepts as numbered items into one prompt and asks for a JSON array
+    with one translation per item, so the instructions are sent once for many concepts.
+    The number of items per prompt is limited by token_budget (estimated prompt tokens) and max_concepts.
+    Items whose answer is missing or invalid are sent again in smaller prompts until they are on their own.
+    The pipeline collects up to max_concepts low-confidence concepts and calls translate_many() for them.
+    """
+    # Rough number of characters per token, used to estimate the prompt size
+    CHARS_PER_TOKEN = 4
+
+    def __init__(self, token_budget: int = 3000, max_concepts: int = 50):
+        self.token_budget = token_budget
+        self.max_concepts = max_concepts
+
+    def translate(self, labels, concept_index, concept, term_props, vocab_context, user_context,
+                  secondary_translation_service, target_lang, logger=None):
+        return self.translate_many([(labels, term_props)], vocab_context, user_context,
+                                   secondary_translation_service, target_lang, logger=logger)[0]
+
+    def translate_many(self, items, vocab_context, user_context, secondary_translation_service, target_lang, logger=None):
+        """
+        items is a list of tuples (labels, term_props), one per concept.
+        Returns a list with the translation (or None) for each item.
+        """
+        target_lang_full = Language.make(language=target_lang).display_name()
+        header = f"General context of all terms: {vocab_context or user_context}\n"
+        sections = [self._build_section(labels, term_props) for labels, term_props in items]
+        results: List[Optional[str]] = [None] * len(items)
+        for group in self._pack(list(range(len(items))), sections, header, target_lang_full):
+            self._translate_group(group, sections, header, secondary_translation_service, target_lang_full, results, logger)
+        if logger:
+            for (labels, _), translation in zip(items, results):
+                logger.info(f"        Translation for {[str(label) for label in labels]} -> '{translation}' ({target_lang})")
+        return results
+
+    def _build_section(self, labels, term_props):
+        # The item number is added when the prompt is built
+        lines = []
+        for lang, label_list in group_labels_by_language(labels).items():
+            lang_full = Language.make(language=lang).display_name() if lang != "none" else "unspecified language"
+            lines.extend(f"- {label} ({lang_full})" for label in label_list)
+        term_descriptions = get_term_descriptions(term_props)
+        if term_descriptions:
+            first_lang = get_label_and_lang(labels[0])[1] if labels else "en"
+            lines.append(f"Description: {choose_term_context(term_descriptions, first_lang)}")
+        return "\n".join(lines)
+
+    def _build_prompt(self, group, sections, header, target_lang_full):
+        items_text = "\n\n".join(f"Item {number}:\n{sections[index]}" for number, index in enumerate(group, start=1))
+        return MultiTermPromptFormatter().format(header + "\n" + items_text, target_lang_full)
+
+    def _estimate_tokens(self, text: str) -> int:
+        return len(text) // self.CHARS_PER_TOKEN + 1
+
+    def _pack(self, indices, sections, header, target_lang_full):
+        """
+        Splits the items into groups whose prompts stay within the token budget.
+        """
+        fixed_prompt = self._build_prompt([], sections, header, target_lang_full)
+        fixed_tokens = self._estimate_tokens(fixed_prompt["instructions"] + fixed_prompt["input"])
+        groups, group, group_tokens = [], [], fixed_tokens
+        for index in indices:
+            # label lines plus the item header and the expected answer of the item
+            item_tokens = self._estimate_tokens(sections[index]) + 15
+            if group and (group_tokens + item_tokens > self.token_budget or len(group) >= self.max_concepts):
+                groups.append(group)
+                group, group_tokens = [], fixed_tokens
+            group.append(index)
+            group_tokens += item_tokens
+        if group:
+            groups.append(group)
+        return groups
+
+    def _parse_response(self, response, count: int) -> Dict[int, str]:
+        """
+        Returns the valid translations of a JSON array response, by item number (1 to count).
+        """
+        if not isinstance(response, str):
+            return {}
+        start, end = response.find("["), response.rfind("]")
+        if start == -1 or end < start:
+            return {}
+        try:
+            data = json.loads(response[start:end + 1])
+        except json.JSONDecodeError:
+            return {}
+        parsed = {}
+        for entry in data if isinstance(data, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            number, translation = entry.get("id"), entry.get("translation")
+            if isinstance(number, str) and number.isdigit():
+                number = int(number)
+            if not isinstance(number, int) or not 1 <= number <= count or not isinstance(translation, str):
+                continue
+            translation = translation.strip(" \t\n\r'\"")
+            if translation:
+                parsed[number] = translation
+        return parsed
+
+    def _translate_group(self, group, sections, header, secondary_translation_service, target_lang_full, results, logger):
+        """
+        Translates a group of items with one prompt and re-splits the items that failed.
+        """
+        prompt = self._build_prompt(group, sections, header, target_lang_full)
+        if logger:
+            logger.debug(f"        Multi concept prompt with {len(group)} items built:\n{prompt}")
+        response = secondary_translation_service.translate_with_context(prompt)
+        parsed = self._parse_response(response, len(group))
+        failed = []
+        for number, index in enumerate(group, start=1):
+            if number in parsed:
+                results[index] = parsed[number]
+            else:
+                failed.append(index)
+        if not failed:
+            return
+        if logger:
+            logger.info(f"        {len(failed)} of {len(group)} items without valid answer in multi concept response")
+            logger.debug(f"        Multi concept response:\n{response}")
+        if len(group) == 1:
+            # Nothing left to split, the pipeline falls back to the primary translations
+            return
+        if len(failed) == len(group):
+            # Split in halves so that a single problematic item does not fail the whole group again
+            middle = len(group) // 2
+            subgroups = [group[:middle], group[middle:]]
+        else:
+            subgroups = [failed]
+        for subgroup in subgroups:
+            self._translate_group(subgroup, sections, header, secondary_translation_service, target_lang_full, results, logger)
+
 #  Hierarchy Strategy 
 class HierarchyStrategy(BaseSecondaryTranslationStrategy):
     """
@@ -190,17 +326,14 @@ class HierarchyStrategy(BaseSecondaryTranslationStrategy):
     using the confidence calculator.
     If no broader terms are found, falls back to the IndividualLabelStrategy.
     """
-    def translate(self, labels, graph, concept, term_props, vocab_context, user_context,
+    def translate(self, labels, concept_index, concept, term_props, vocab_context, user_context,
                   secondary_translation_service, target_lang, logger=None, separate_language_prompts=True):
-        SKOS = rdflib.Namespace("http://www.w3.org/2004/02/skos/core#")
-        broaderUri = SKOS.broader
-
         # Fallback: if no broader term exists, fall back to IndividualLabelStrategy.
-        if not list(graph.objects(concept, broaderUri)):
+        if not concept_index.ancestors(concept):
             if logger:
                 logger.info("No broader terms found; falling back to IndividualLabelStrategy.")
             from modules.secondary_translation_strategies import IndividualLabelStrategy
-            return IndividualLabelStrategy().translate(labels, graph, concept, term_props,
+            return IndividualLabelStrategy().translate(labels, concept_index, concept, term_props,
                                                        vocab_context, user_context, secondary_translation_service,
                                                        target_lang, logger=logger)
         if logger:
@@ -217,8 +350,8 @@ class HierarchyStrategy(BaseSecondaryTranslationStrategy):
             #  Combine all language chains into one prompt 
             language_sections = []
             for lang in available_languages:
-                chain = self._build_broader_chain(graph, concept, lang, target_lang)
-                current_label = self._get_pref_label_for_concept(graph, concept, lang, target_lang)
+                chain = self._build_broader_chain(concept_index, concept, lang, target_lang)
+                current_label = self._get_pref_label_for_concept(concept_index, concept, lang, target_lang)
                 # Append the term that should be translated to the chain as last entry
                 if current_label:
                     chain.append(current_label)
@@ -256,8 +389,8 @@ class HierarchyStrategy(BaseSecondaryTranslationStrategy):
             translations: Dict[str, str] = {}
             # individual_prompts = []
             for src_lang in available_languages:
-                chain = self._build_broader_chain(graph, concept, src_lang, target_lang)
-                current_label = self._get_pref_label_for_concept(graph, concept, src_lang, target_lang)
+                chain = self._build_broader_chain(concept_index, concept, src_lang, target_lang)
+                current_label = self._get_pref_label_for_concept(concept_index, concept, src_lang, target_lang)
                 if current_label:
                     chain.append(current_label)
                 src_lang_full = Language.make(language=src_lang).display_name()
@@ -287,39 +420,17 @@ class HierarchyStrategy(BaseSecondaryTranslationStrategy):
 
             return translations
 
-    def _get_pref_label_for_concept(self, graph, concept, desired_lang, target_lang):
-        # TODO possible duplicate with functions at beginning
-        prefLabelUri = rdflib.URIRef("http://www.w3.org/2004/02/skos/core#prefLabel")
-        labels_list = list(graph.objects(concept, prefLabelUri))
-        lang_labels = {}
-        for label in labels_list:
-            label_lang = label.language if label.language else "none"
-            lang_labels.setdefault(label_lang, []).append(str(label))
-        if desired_lang in lang_labels:
-            return lang_labels[desired_lang][0]
-        elif "en" in lang_labels:
-            return lang_labels["en"][0]
-        elif lang_labels:
-            return next(iter(lang_labels.values()))[0]
-        else:
-            return None
+    def _get_pref_label_for_concept(self, concept_index, concept, desired_lang, target_lang):
+        return concept_index.pref_label(concept, desired_lang)
 
-    def _build_broader_chain(self, graph, concept, desired_lang, target_lang):
-        # TODO possible duplicate with functions at beginning
-        SKOS = rdflib.Namespace("http://www.w3.org/2004/02/skos/core#")
-        broaderUri = SKOS.broader
+    def _build_broader_chain(self, concept_index, concept, desired_lang, target_lang):
+        # The chain of broader terms is computed once per concept and shared by all languages
         chain = []
-        current = concept
-        while True:
-            broader_list = list(graph.objects(current, broaderUri))
-            if not broader_list:
-                break
-            broader = broader_list[0]
-            label = self._get_pref_label_for_concept(graph, broader, desired_lang, target_lang)
+        for broader in concept_index.ancestors(concept):
+            label = self._get_pref_label_for_concept(concept_index, broader, desired_lang, target_lang)
             if not label:
                 label = "[No label]"
-            chain.insert(0, label)  # Insert so that the top term comes first.
-            current = broader
+            chain.append(label)  # The top term comes first.
         return chain
 
     def _get_term_description_for_concept(self, term_props, desired_lang, target_lang):
@@ -5,11 +5,18 @@ from typing import Optional, Any
 class SecondaryTranslationService(ABC):
     """
     Abstract base class for secondary translation services.
+    If usage_tracker is set (a UsageTracker), services record the token usage of their responses with _record_usage().
     """
+    usage_tracker = None
+
     @abstractmethod
     def translate_with_context(self, prompt: Any) -> Optional[str]:
         raise NotImplementedError("translate_with_context() must be implemented by subclasses.")
     
     @abstractmethod
     def rate_translation(self, prompt: Any) -> Optional[str]:
-        raise NotImplementedError("rate_translation() must be implemented by subclasses. rate_translation = translate_with_context might work instead of creating a full new method, just try it out")
\ No newline at end of file
+        raise NotImplementedError("rate_translation() must be implemented by subclasses. rate_translation = translate_with_context might work instead of creating a full new method, just try it out")
+
+    def _record_usage(self, response: Any) -> None:
+        if self.usage_tracker is not None:
+            self.usage_tracker.record_response(self.service_name, getattr(self, "model_name", ""), response)
@@ -3,10 +3,11 @@ import logging
 import os
 import anthropic
 import json
-import sys
 from httpx import HTTPStatusError
 from typing import Optional, Any
 from modules.secondary_translators.abstract_secondary_translator import SecondaryTranslationService
+from modules.http_transport import shared_client
+from modules.rate_limiter import RateLimitExceeded, retry_after_seconds, raise_if_rate_limited
 from config import ANTHROPIC_API_KEY
 
 
@@ -23,7 +24,7 @@ class AnthropicTranslationService(SecondaryTranslationService):
         if not 0 <= temperature <= 1:
             raise ValueError("Temperature must be between 0 and 1 (inclusive)")
         
-        self.client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+        self.client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY, http_client=shared_client())
         self.max_tokens = 1024
         self.model_name = model_name
         self.temperature = temperature
@@ -34,12 +35,43 @@ class AnthropicTranslationService(SecondaryTranslationService):
         models = self.client.models.list()
         return(models)
     
-    def translate_with_context(self, prompt: Any) -> Optional[str]:
+    def _split_prompt(self, prompt: Any) -> tuple[str, str]:
         if isinstance(prompt, dict):
-            instructions = prompt.get("instructions", "")
-            input_text = prompt.get("input", "")
-        else:
-            raise ValueError("Prompt must be a dictionary containing 'instructions' and 'input' keys.")
+            return prompt.get("instructions", ""), prompt.get("input", "")
+        raise ValueError("Prompt must be a dictionary containing 'instructions' and 'input' keys.")
+
+    def _handle_exception(self, e: Exception) -> None:
+        if isinstance(e, HTTPStatusError):
+            code = e.response.status_code
+            if code == 429:
+                # Retried by the rate limiter (modules/rate_limiter.py)
+                raise RateLimitExceeded(self.service_name, retry_after_seconds(e.response))
+            else:
+                self.logger.critical(
+                    f"{self.service_name} returned HTTP {code}: {e.response.text!r}"
+                )
+                # re-raise
+                raise e
+        # 429 errors of client libraries that do not raise HTTPStatusError
+        raise_if_rate_limited(e, self.service_name)
+        self.logger.critical(
+            f"{self.service_name} unexpected error\n Exception: {e!r} "
+        )
+
+    def _extract_text(self, response) -> str:
+        # Response is made up of TextBlocks
+        # first convert it to json, then to python dict
+        response_data = json.loads(response.to_json())
+
+        # iterate over resp_data["content"] and join all the text blocks (usually only one text block)
+        return "".join(
+            block["text"]
+            for block in response_data["content"]
+            if block.get("type") == "text"
+        )
+
+    def translate_with_context(self, prompt: Any) -> Optional[str]:
+        instructions, input_text = self._split_prompt(prompt)
     
         try:
             response = self.client.messages.create(
@@ -52,38 +84,10 @@ class AnthropicTranslationService(SecondaryTranslationService):
                     },
                 ],
             )
-            # Response is made up of TextBlocks
-            # first convert it to json, then to python dict
-            response_data = json.loads(response.to_json())
-
-            # iterate over resp_data["content"] and join all the text blocks (usually only one text block)
-            text_only = "".join(
-                block["text"]
-                for block in response_data["content"]
-                if block.get("type") == "text"
-            )
-
-            return(text_only) #TODO think about error handling, what if translation fails or API not reachable etc
-        
-        except HTTPStatusError as e:
-            code = e.response.status_code
-            if code == 429:
-                self.logger.critical(
-                    f"{self.service_name} returned Too Many Requests – rate limit reached, exiting."
-                )
-                sys.exit(1)
-            else:
-                self.logger.critical(
-                    f"{self.service_name} returned HTTP {code}: {e.response.text!r}"
-                )
-                # re-raise
-                raise
+            self._record_usage(response)
+            return(self._extract_text(response)) #TODO think about error handling, what if translation fails or API not reachable etc
         except Exception as e:
-            self.logger.critical(
-                f"{self.service_name} unexpected error\n Exception: {e!r} "
-            )
-
+            self._handle_exception(e)
 
     # rating a translation is working the same way as translating
     rate_translation = translate_with_context
-    
@@ -2,11 +2,12 @@
 import logging
 import os
 import re
-import sys
 from httpx import HTTPStatusError
 from openai import OpenAI
 from typing import Optional, Any
 from modules.secondary_translators.abstract_secondary_translator import SecondaryTranslationService
+from modules.http_transport import shared_client
+from modules.rate_limiter import RateLimitExceeded, retry_after_seconds, raise_if_rate_limited
 from config import BLABLADOR_BASE_URL, BLABLADOR_API_KEY
 
 class BlabladorTranslationService(SecondaryTranslationService):
@@ -23,7 +24,7 @@ class BlabladorTranslationService(SecondaryTranslationService):
         if not 0 <= temperature <= 2:
             raise ValueError("Temperature must be between 0 and 2 (inclusive)")
         
-        self.client = OpenAI(api_key=BLABLADOR_API_KEY, base_url=BLABLADOR_BASE_URL)
+        self.client = OpenAI(api_key=BLABLADOR_API_KEY, base_url=BLABLADOR_BASE_URL, http_client=shared_client())
 
         self.model_name = model_name
         self.temperature = temperature
@@ -58,14 +59,13 @@ class BlabladorTranslationService(SecondaryTranslationService):
                 ],
             )
 
+            self._record_usage(response)
             return(self.remove_think_content(response.choices[0].message.content)) #TODO think about error handling, what if translation fails or API not reachable etc
         except HTTPStatusError as e:
             code = e.response.status_code
             if code == 429:
-                self.logger.critical(
-                    f"{self.service_name} returned Too Many Requests – rate limit reached, exiting."
-                )
-                sys.exit(1)
+                # Retried by the rate limiter (modules/rate_limiter.py)
+                raise RateLimitExceeded(self.service_name, retry_after_seconds(e.response))
             else:
                 self.logger.critical(
                     f"{self.service_name} returned HTTP {code}: {e.response.text!r}"
@@ -73,6 +73,8 @@ class BlabladorTranslationService(SecondaryTranslationService):
                 # re-raise
                 raise
         except Exception as e:
+            # 429 errors of client libraries that do not raise HTTPStatusError
+            raise_if_rate_limited(e, self.service_name)
             self.logger.critical(
                 f"{self.service_name} unexpected error\n Exception: {e!r} "
             )
@@ -2,11 +2,12 @@
 import os
 import logging
 import requests
-import sys
 from httpx import HTTPStatusError
 from openai import OpenAI
 from typing import Optional, Any
 from modules.secondary_translators.abstract_secondary_translator import SecondaryTranslationService
+from modules.http_transport import shared_client
+from modules.rate_limiter import RateLimitExceeded, retry_after_seconds, raise_if_rate_limited
 from config import DEEPSEEK_API_KEY
 
 class DeepseekTranslationService(SecondaryTranslationService):
@@ -24,7 +25,7 @@ class DeepseekTranslationService(SecondaryTranslationService):
         if not 0 <= temperature <= 2:
             raise ValueError("Temperature must be between 0 and 2 (inclusive)")
         
-        self.client = OpenAI(api_key=DEEPSEEK_API_KEY, base_url="https://api.deepseek.com")
+        self.client = OpenAI(api_key=DEEPSEEK_API_KEY, base_url="https://api.deepseek.com", http_client=shared_client())
         
         self.model_name = model_name
         self.temperature = temperature
@@ -50,14 +51,13 @@ class DeepseekTranslationService(SecondaryTranslationService):
                 ],
                 stream=False
             )
+            self._record_usage(response)
             return(response.choices[0].message.content) #TODO think about error handling, what if translation fails or API not reachable etc
         except HTTPStatusError as e:
             code = e.response.status_code
             if code == 429:
-                self.logger.critical(
-                    f"{self.service_name} returned Too Many Requests – rate limit reached, exiting."
-                )
-                sys.exit(1)
+                # Retried by the rate limiter (modules/rate_limiter.py)
+                raise RateLimitExceeded(self.service_name, retry_after_seconds(e.response))
             else:
                 self.logger.critical(
                     f"{self.service_name} returned HTTP {code}: {e.response.text!r}"
@@ -65,6 +65,8 @@ class DeepseekTranslationService(SecondaryTranslationService):
                 # re-raise
                 raise
         except Exception as e:
+            # 429 errors of client libraries that do not raise HTTPStatusError
+            raise_if_rate_limited(e, self.service_name)
             self.logger.critical(
                 f"{self.service_name} unexpected error\n Exception: {e!r} "
             )
@@ -2,12 +2,12 @@
 import os
 import logging
 import requests
-import sys
 from httpx import HTTPStatusError
 from google import genai
 from google.genai import types
 from typing import Optional, Any
 from modules.secondary_translators.abstract_secondary_translator import SecondaryTranslationService
+from modules.rate_limiter import RateLimitExceeded, retry_after_seconds, raise_if_rate_limited
 from config import GEMINI_API_KEY
 
 class GeminiTranslationService(SecondaryTranslationService):
@@ -31,45 +31,50 @@ class GeminiTranslationService(SecondaryTranslationService):
         self.service_name = "gemini" 
         self.logger: logging.Logger = logger or logging.getLogger(__name__)
     
+    def _split_prompt(self, prompt: Any) -> tuple[str, str]:
+        if isinstance(prompt, dict):
+            return prompt.get("instructions", ""), prompt.get("input", "")
+        raise ValueError("Prompt must be a dictionary containing 'instructions' and 'input' keys.")
+
+    def _handle_exception(self, e: Exception) -> None:
+        if isinstance(e, HTTPStatusError):
+            code = e.response.status_code
+            if code == 429:
+                # Retried by the rate limiter (modules/rate_limiter.py)
+                raise RateLimitExceeded(self.service_name, retry_after_seconds(e.response))
+            else:
+                self.logger.critical(
+                    f"{self.service_name} returned HTTP {code}: {e.response.text!r}"
+                )
+                # re-raise
+                raise e
+        # 429 errors of client libraries that do not raise HTTPStatusError
+        raise_if_rate_limited(e, self.service_name)
+        self.logger.critical(
+            f"{self.service_name} unexpected error\n Exception: {e!r} "
+        )
+
+    def _generate_config(self, instructions: str) -> types.GenerateContentConfig:
+        return types.GenerateContentConfig(
+            system_instruction=instructions,
+            temperature=self.temperature,
+        )
+
     def translate_with_context(self, prompt: Any) -> Optional[str]:
         # Prepare prompt and instructions 
         #TODO think about default language (for now en-US). SKOS allows also having no language tag. due to refactor, must be solved somehwhere else
-                
-        if isinstance(prompt, dict):
-            instructions = prompt.get("instructions", "")
-            input_text = prompt.get("input", "")
-        else:
-            raise ValueError("Prompt must be a dictionary containing 'instructions' and 'input' keys.") 
+        instructions, input_text = self._split_prompt(prompt)
 
         try:        
             response = self.client.models.generate_content(
                 model=self.model_name,
                 contents=input_text,
-                config=types.GenerateContentConfig(
-                    system_instruction=instructions,
-                    temperature=self.temperature,
-                ),
+                config=self._generate_config(instructions),
             )
+            self._record_usage(response)
             return(response.text) #TODO think about error handling, what if translation fails or API not reachable etc
-        except HTTPStatusError as e:
-            code = e.response.status_code
-            if code == 429:
-                self.logger.critical(
-                    f"{self.service_name} returned Too Many Requests – rate limit reached, exiting."
-                )
-                sys.exit(1)
-            else:
-                self.logger.critical(
-                    f"{self.service_name} returned HTTP {code}: {e.response.text!r}"
-                )
-                # re-raise
-                raise
         except Exception as e:
-            self.logger.critical(
-                f"{self.service_name} unexpected error\n Exception: {e!r} "
-            )
-
+            self._handle_exception(e)
 
     # rating a translation is working the same way as translating
     rate_translation = translate_with_context
-
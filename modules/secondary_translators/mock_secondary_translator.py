@@ -0,0 +1,66 @@
+import json
+import logging
+import re
+import time
+from typing import Optional, Any
+from modules.secondary_translators.abstract_secondary_translator import SecondaryTranslationService
+from modules.mock_network import SimulatedEndpoint, mock_translation
+
+
+class MockSecondaryTranslationService(SecondaryTranslationService):
+    """
+    Secondary translation service (LLM) without network access for benchmarks and tests, with the
+    latency, errors and rate limit of a SimulatedEndpoint.
+    Answers the prompts of all secondary strategies and of LLMConfidenceCalculator in the expected format,
+    translations are made with mock_translation(). Failed calls return None. The token usage is estimated
+    with 4 characters per token and reported like the usage data of a real service.
+    """
+    def __init__(self, model_name: str = "mock-llm", median_latency: float = 1.0, sigma: float = 0.5, error_rate: float = 0.0,
+                 rate_limit_rps: Optional[float] = None, seed: int = 0, logger=None):
+        self.model_name = model_name
+        self.service_name = "mock"
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+        self.endpoint = SimulatedEndpoint(f"mock {model_name}", median_latency, sigma, error_rate, rate_limit_rps, seed)
+
+    def _split_prompt(self, prompt: Any) -> tuple[str, str]:
+        if isinstance(prompt, dict):
+            return prompt.get("instructions", ""), prompt.get("input", "")
+        raise ValueError("Prompt must be a dictionary containing 'instructions' and 'input' keys.")
+
+    def _answer_text(self, instructions: str, input_text: str, rng) -> Optional[str]:
+        # MultiConceptStrategy: numbered items with their labels, answered with a JSON array
+        if "JSON array" in instructions:
+            items = re.findall(r"^Item (\d+):\n- (.*) \(", input_text, flags=re.MULTILINE)
+            return json.dumps([{"id": int(number), "translation": mock_translation(label)} for number, label in items])
+        # LLMConfidenceCalculator: choose one of the candidates
+        if "coming from translation systems are:" in input_text:
+            candidates = input_text.split("coming from translation systems are: \n", 1)[1].split("\n\n", 1)[0].splitlines()
+            agreeing = [candidate for candidate in candidates if candidate.endswith(" (translated)")]
+            if not agreeing and not candidates:
+                return None
+            return f"{(agreeing or candidates)[0]}; {rng.uniform(0.6, 1.0):.2f}"
+        # IndividualLabelStrategy, BatchLabelStrategy and HierarchyStrategy
+        match = (re.search(r"^Term to translate: (.*)$", input_text, flags=re.MULTILINE)
+                 or re.search(r"^- (.*)$", input_text, flags=re.MULTILINE)
+                 or re.search(r" term (.*) to the", input_text))
+        return mock_translation(match.group(1).strip()) if match else None
+
+    def _answer(self, prompt: Any) -> tuple[float, Optional[str]]:
+        instructions, input_text = self._split_prompt(prompt)
+        latency, failed, rng = self.endpoint.draw(instructions + input_text)
+        if failed:
+            self.logger.critical(f"{self.service_name} simulated error")
+            return latency, None
+        answer = self._answer_text(instructions, input_text, rng)
+        self._record_usage({"usage": {"input_tokens": len(instructions + input_text) // 4 + 1, "output_tokens": len(answer or "") // 4 + 1}})
+        return latency, answer
+
+    def translate_with_context(self, prompt: Any) -> Optional[str]:
+        latency, answer = self._answer(prompt)
+        time.sleep(latency)
+        return answer
+
+    rate_translation = translate_with_context
+
+    def report(self) -> list[str]:
+        return self.endpoint.report()
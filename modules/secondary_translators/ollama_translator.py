@@ -25,23 +25,24 @@ class OllamaTranslationService(SecondaryTranslationService):
         self.logger: logging.Logger = logger or logging.getLogger(__name__)
 
 
-    def translate_with_context(self, prompt: Any) -> str:
+    def _merge_prompt(self, prompt: Any) -> str:
         if prompt is None:
             raise ValueError("Prompt is required for translation.")
         
         instructions = prompt.get("instructions", "")
         input_text = prompt.get("input", "")
-        prompt_merged = instructions + input_text
+        return instructions + input_text
+
+    def translate_with_context(self, prompt: Any) -> str:
+        prompt_merged = self._merge_prompt(prompt)
         try:
             response = ollama.chat(model=self.model_name, messages=[{"role": "user", "content": prompt_merged}])
+            self._record_usage(response)
             return response["message"]["content"].strip()
         except Exception as e:
             self.logger.critical(
                 f"{self.service_name} unexpected error\n Exception: {e!r} "
             )
 
-    
-
     # rating a translation is working the same way as translating
     rate_translation = translate_with_context
-
@@ -1,11 +1,12 @@
 # openai_translator.py
 import logging
 import os
-import sys
 from httpx import HTTPStatusError
 from openai import OpenAI
 from typing import Optional, Any
 from modules.secondary_translators.abstract_secondary_translator import SecondaryTranslationService
+from modules.http_transport import shared_client
+from modules.rate_limiter import RateLimitExceeded, retry_after_seconds, raise_if_rate_limited
 from config import OPENAI_API_KEY
 
 class OpenAITranslationService(SecondaryTranslationService):
@@ -20,7 +21,7 @@ class OpenAITranslationService(SecondaryTranslationService):
         if not 0 <= temperature <= 2:
             raise ValueError("Temperature must be between 0 and 2 (inclusive)")
         
-        self.client = OpenAI(api_key=OPENAI_API_KEY)
+        self.client = OpenAI(api_key=OPENAI_API_KEY, http_client=shared_client())
 
         self.model_name = model_name
         self.temperature = temperature
@@ -29,14 +30,33 @@ class OpenAITranslationService(SecondaryTranslationService):
 
 
     
+    def _split_prompt(self, prompt: Any) -> tuple[str, str]:
+        if isinstance(prompt, dict):
+            return prompt.get("instructions", ""), prompt.get("input", "")
+        raise ValueError("Prompt must be a dictionary containing 'instructions' and 'input' keys.")
+
+    def _handle_exception(self, e: Exception) -> None:
+        if isinstance(e, HTTPStatusError):
+            code = e.response.status_code
+            if code == 429:
+                # Retried by the rate limiter (modules/rate_limiter.py)
+                raise RateLimitExceeded(self.service_name, retry_after_seconds(e.response))
+            else:
+                self.logger.critical(
+                    f"{self.service_name} returned HTTP {code}: {e.response.text!r}"
+                )
+                # re-raise
+                raise e
+        # 429 errors of client libraries that do not raise HTTPStatusError
+        raise_if_rate_limited(e, self.service_name)
+        self.logger.critical(
+            f"{self.service_name} unexpected error\n Exception: {e!r} "
+        )
+
     def translate_with_context(self, prompt: Any) -> Optional[str]:
         #TODO think about which models can be used
         #TODO think about default language (for now en-US). SKOS allows also having no language tag. due to refactor, must be solved somehwhere else
-        if isinstance(prompt, dict):
-            instructions = prompt.get("instructions", "")
-            input_text = prompt.get("input", "")
-        else:
-            raise ValueError("Prompt must be a dictionary containing 'instructions' and 'input' keys.")
+        instructions, input_text = self._split_prompt(prompt)
 
         try:
             response = self.client.responses.create(
@@ -45,25 +65,10 @@ class OpenAITranslationService(SecondaryTranslationService):
             input=input_text,
             temperature=self.temperature, # between 0 and 2
             )
+            self._record_usage(response)
             return(response.output_text) #TODO think about error handling, what if translation fails or API not reachable etc
-        except HTTPStatusError as e:
-            code = e.response.status_code
-            if code == 429:
-                self.logger.critical(
-                    f"{self.service_name} returned Too Many Requests – rate limit reached, exiting."
-                )
-                sys.exit(1)
-            else:
-                self.logger.critical(
-                    f"{self.service_name} returned HTTP {code}: {e.response.text!r}"
-                )
-                # re-raise
-                raise
         except Exception as e:
-            self.logger.critical(
-                f"{self.service_name} unexpected error\n Exception: {e!r} "
-            )
-
+            self._handle_exception(e)
 
     # rating a translation is working the same way as translating
-    rate_translation = translate_with_context
\ No newline at end of file
+    rate_translation = translate_with_context
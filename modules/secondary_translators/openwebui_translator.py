@@ -1,11 +1,12 @@
 # openwebui_translator.py
 import logging
 import os
-import sys
 from httpx import HTTPStatusError
 from openai import OpenAI
 from typing import Optional, Any
 from modules.secondary_translators.abstract_secondary_translator import SecondaryTranslationService
+from modules.http_transport import shared_client
+from modules.rate_limiter import RateLimitExceeded, retry_after_seconds, raise_if_rate_limited
 from config import OPENWEBUI_BASE_URL, OPENWEBUI_API_KEY
 
 class OpenWebUITranslationService(SecondaryTranslationService):
@@ -22,7 +23,7 @@ class OpenWebUITranslationService(SecondaryTranslationService):
         if not 0 <= temperature <= 2:
             raise ValueError("Temperature must be between 0 and 2 (inclusive)")
         
-        self.client = OpenAI(api_key=OPENWEBUI_API_KEY, base_url=OPENWEBUI_BASE_URL)
+        self.client = OpenAI(api_key=OPENWEBUI_API_KEY, base_url=OPENWEBUI_BASE_URL, http_client=shared_client())
 
         self.model_name = model_name
         self.temperature = temperature
@@ -67,14 +68,13 @@ class OpenWebUITranslationService(SecondaryTranslationService):
                 ],
             )
 
+            self._record_usage(response)
             return(self.extract_last_line(response.choices[0].message.content)) #TODO think about error handling, what if translation fails or API not reachable etc
         except HTTPStatusError as e:
             code = e.response.status_code
             if code == 429:
-                self.logger.critical(
-                    f"{self.service_name} returned Too Many Requests – rate limit reached, exiting."
-                )
-                sys.exit(1)
+                # Retried by the rate limiter (modules/rate_limiter.py)
+                raise RateLimitExceeded(self.service_name, retry_after_seconds(e.response))
             else:
                 self.logger.critical(
                     f"{self.service_name} returned HTTP {code}: {e.response.text!r}"
@@ -82,6 +82,8 @@ class OpenWebUITranslationService(SecondaryTranslationService):
                 # re-raise
                 raise
         except Exception as e:
+            # 429 errors of client libraries that do not raise HTTPStatusError
+            raise_if_rate_limited(e, self.service_name)
             self.logger.critical(
                 f"{self.service_name} unexpected error\n Exception: {e!r} "
             )
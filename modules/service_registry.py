@@ -0,0 +1,97 @@
+# service_registry.py
+"""
+Names of the translation services that can be selected in main.py and where to find them.
+
+The module of a service is only imported when the service is created. The translator modules import
+heavy client libraries (google.cloud with grpc, openai, anthropic, google.genai, translators, which
+contacts its servers on import, ...), so importing all of them made every start of WOKIE slow, even
+for runs that only use a few of the services.
+"""
+import importlib
+
+# name -> (module, class)
+PRIMARY_SERVICES = {
+    "argos": ("modules.primary_translators.argos_translator", "ArgosTranslationService"),
+    "google": ("modules.primary_translators.googlecloud_translator", "GoogleTranslationService"),
+    "lingvanex": ("modules.primary_translators.lingvanex_translator", "LingvanexTranslationService"),
+    "microsoft": ("modules.primary_translators.microsoft_translator", "MicrosoftTranslationService"),
+    "modernmt": ("modules.primary_translators.modernmt_translator", "ModernMTTranslationService"),
+    "ponspaid": ("modules.primary_translators.pons_paid_translator", "PonsPaidTranslationService"),
+    "reverso": ("modules.primary_translators.reverso_translator", "ReversoTranslationService"),
+    "yandex": ("modules.primary_translators.yandex_translator", "YandexTranslationService"),
+    "dummynone": ("modules.primary_translators.dummynone_translator", "DummyNonePrimaryTranslationService"),
+}
+
+_ANTHROPIC = ("modules.secondary_translators.anthropic_translator", "AnthropicTranslationService")
+_DEEPSEEK = ("modules.secondary_translators.deepseek_translator", "DeepseekTranslationService")
+_GEMINI = ("modules.secondary_translators.gemini_translator", "GeminiTranslationService")
+_MISTRAL = ("modules.secondary_translators.mistral_translator", "MistralTranslationService")
+_OPENAI = ("modules.secondary_translators.openai_translator", "OpenAITranslationService")
+_OPENWEBUI = ("modules.secondary_translators.openwebui_translator", "OpenWebUITranslationService")
+
+# name -> (module, class, model name, whether the service takes a temperature)
+SECONDARY_SERVICES = {
+    "claude-3-5-haiku": (*_ANTHROPIC, "claude-3-5-haiku-20241022", True),
+    "claude-3-5-sonnet": (*_ANTHROPIC, "claude-3-5-sonnet-20241022", True),
+    "claude-3-7-sonnet": (*_ANTHROPIC, "claude-3-7-sonnet-20250219", True),
+    "claude-3-haiku": (*_ANTHROPIC, "claude-3-haiku-20240307", True),
+    # "claude-3-opus": (*_ANTHROPIC, "claude-3-opus-20240229", True),
+    "codestral-latest": (*_MISTRAL, "codestral-latest", True),
+    "codestral-mamba-latest": (*_MISTRAL, "codestral-mamba-latest", True),
+    "deepseek-chat": (*_DEEPSEEK, "deepseek-chat", False),
+    "deepseek-reasoner": (*_DEEPSEEK, "deepseek-reasoner", False),
+    "gemini-1.5-flash-8b": (*_GEMINI, "gemini-1.5-flash-8b", True),
+    "gemini-1.5-flash": (*_GEMINI, "gemini-1.5-flash", True),
+    "gemini-2.0-flash-lite": (*_GEMINI, "gemini-2.0-flash-lite", True),
+    "gemini-2.0-flash": (*_GEMINI, "gemini-2.0-flash", True),
+    "gemini-2.5-flash-preview-04-17": (*_GEMINI, "gemini-2.5-flash-preview-04-17", True),
+    "gemma3:12b(openwebui)": (*_OPENWEBUI, "gemma3:12b", True),
+    "gpt-3.5-turbo": (*_OPENAI, "gpt-3.5-turbo", True),
+    "gpt-4.1-mini": (*_OPENAI, "gpt-4.1-mini", True),
+    "gpt-4.1-nano": (*_OPENAI, "gpt-4.1-nano", True),
+    "gpt-4.1(openwebui)": (*_OPENWEBUI, "gpt-4.1", True),
+    "gpt-4o-mini": (*_OPENAI, "gpt-4o-mini", True),
+    "gpt-4o": (*_OPENAI, "gpt-4o", True),
+    "llama-4-maverick:free(openwebui)": (*_OPENWEBUI, "meta-llama/llama-4-maverick:free", True),
+    "ministral-3b-latest": (*_MISTRAL, "ministral-3b-latest", True),
+    "ministral-8b-latest": (*_MISTRAL, "ministral-8b-latest", True),
+    "mistral-large-latest": (*_MISTRAL, "mistral-large-latest", True),
+    "mistral-medium-latest": (*_MISTRAL, "mistral-medium-latest", True),
+    "mistral-small-latest": (*_MISTRAL, "mistral-small-latest", True),
+    "mistral-tiny-latest": (*_MISTRAL, "mistral-tiny-latest", True),
+    "open-mistral-nemo": (*_MISTRAL, "open-mistral-nemo", True),
+    "open-mixtral-8x22b": (*_MISTRAL, "open-mixtral-8x22b", True),
+    "dummy": ("modules.secondary_translators.dummy_secondary_translator", "DummySecondaryTranslationService", None, False),
+}
+
+
+def _load_class(module_name: str, class_name: str):
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def create_primary_service(name: str, logger=None):
+    """
+    Imports the module of the primary translation service name and returns a new instance of the service.
+    """
+    try:
+        module_name, class_name = PRIMARY_SERVICES[name]
+    except KeyError:
+        raise ValueError(f"Primary translation service {name} is currently not implemented")
+    return _load_class(module_name, class_name)(logger=logger)
+
+
+def create_secondary_service(name: str, temperature: float = 0):
+    """
+    Imports the module of the secondary translation service name and returns a new instance of the service
+    for its model.
+    """
+    try:
+        module_name, class_name, model_name, uses_temperature = SECONDARY_SERVICES[name]
+    except KeyError:
+        raise ValueError(f"Secondary translation service {name} is currently not implemented")
+    service_class = _load_class(module_name, class_name)
+    if model_name is None:
+        return service_class()
+    if uses_temperature:
+        return service_class(model_name=model_name, temperature=temperature)
+    return service_class(model_name=model_name)
@@ -0,0 +1,65 @@
+# service_scheduler.py
+import threading
+
+
+class AdaptiveServiceScheduler:
+    """
+    Orders the primary translation services by their measured latency and by how often their
+    candidate agrees with the translation that is finally chosen for a concept.
+
+    The score of a service is its average latency (exponentially weighted with alpha) divided by its
+    agreement rate, i.e. roughly the time it takes to get one useful candidate from it; lower is better.
+    Services with fewer than warmup latency measurements come first in their original order, so every
+    service is measured before the ranking is trusted. Failed calls (no translation or an error) can only
+    raise the average latency, so a service that fails fast is not ranked as fast.
+    """
+    def __init__(self, alpha: float = 0.2, warmup: int = 5):
+        self.alpha = alpha
+        self.warmup = warmup
+        self._latency = {}
+        self._samples = {}
+        self._agreed = {}
+        self._rated = {}
+        self._lock = threading.Lock()
+
+    def record_latency(self, service, seconds: float, failed: bool = False) -> None:
+        with self._lock:
+            if failed and service in self._latency:
+                seconds = max(seconds, self._latency[service])
+            if service in self._latency:
+                self._latency[service] += self.alpha * (seconds - self._latency[service])
+            else:
+                self._latency[service] = seconds
+            self._samples[service] = self._samples.get(service, 0) + 1
+
+    def record_agreement(self, service, agreed: bool) -> None:
+        with self._lock:
+            self._rated[service] = self._rated.get(service, 0) + 1
+            self._agreed[service] = self._agreed.get(service, 0) + agreed
+
+    def agreement_rate(self, service) -> float:
+        # Laplace smoothing, unrated services start at 0.5
+        return (self._agreed.get(service, 0) + 1) / (self._rated.get(service, 0) + 2)
+
+    def score(self, service) -> float:
+        return self._latency.get(service, 0.0) / self.agreement_rate(service)
+
+    def order(self, services: list) -> list:
+        """
+        Returns the services in the order in which they should be asked for the next concept.
+        """
+        with self._lock:
+            warming_up = [service for service in services if self._samples.get(service, 0) < self.warmup]
+            ranked = sorted((service for service in services if self._samples.get(service, 0) >= self.warmup), key=self.score)
+        return warming_up + ranked
+
+    def report(self) -> list[str]:
+        """
+        Returns the measured latency and agreement of every service as log lines.
+        """
+        lines = []
+        for service in sorted(self._latency, key=self.score):
+            name = getattr(service, "service_name", service.__class__.__name__)
+            lines.append(f"Adaptive ordering {name}: avg. latency {self._latency[service] * 1000:.0f} ms, "
+                         f"agreed with {self._agreed.get(service, 0)} of {self._rated.get(service, 0)} chosen translations")
+        return lines
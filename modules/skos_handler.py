@@ -1,4 +1,5 @@
 # skos_handler.py
+import logging
 import rdflib
 
 SKOS = rdflib.Namespace("http://www.w3.org/2004/02/skos/core#")
@@ -54,6 +55,156 @@ def extract_vocabulary_context(graph):
                     break
     return vocab_context
 
+class ConceptIndex:
+    """
+    Index of the SKOS concepts of a graph, built in one pass over the triples of the concepts.
+
+    The index holds the term properties and the broader relations as they were when the index was built,
+    translations that are added to the graph later are not part of it.
+      - properties: { concept: { property_name: { language: [list of literals] }, ... }, ... }
+        for every skos:Concept, in the order of the concepts in the graph
+      - broader: { concept: [list of concepts] } from skos:broader, narrower: the same relations the other way round
+      - cycles: the cycles of broader terms found by ancestors(), as tuples of concepts
+    Like the hierarchy queries before the index, only skos:broader is followed, skos:narrower is ignored.
+    """
+    def __init__(self, graph, logger=None):
+        self.graph = graph
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+        self._property_names = {prop_uri: prop_name for prop_name, prop_uri in SKOS_TERM_PROPERTIES.items()}
+        self.properties = {}
+        self.broader = {}
+        self.narrower = {}
+        self.cycles = []
+        self._ancestors = {}
+        # Labels of broader terms that are not typed as skos:Concept
+        self._other_properties = {}
+        if graph is not None:
+            self._build(self._graph_triples())
+
+    @classmethod
+    def from_triples(cls, triples, logger=None):
+        """
+        Builds the index from (subject, predicate, object) tuples in the order of the file instead of a graph,
+        e.g. from the streaming readers in modules/skos_stream.py. The graph of the index is None.
+        """
+        index = cls(None, logger=logger)
+        index._build(triples)
+        return index
+
+    def _graph_triples(self):
+        # The triples of the concepts, of all subjects with skos:broader and of their broader terms, subject by
+        # subject in the order of the graph, so the index is the same as from_triples() over the file.
+        # A single graph.triples((None, None, None)) pass would be in the set order of rdflib's memory store,
+        # and the order decides the source label of a language and the broader term that ancestors() follows.
+        subjects = list(self.graph.subjects(rdflib.RDF.type, SKOS.Concept, unique=True))
+        subjects.extend(self.graph.subjects(SKOS.broader, None, unique=True))
+        visited = set()
+        position = 0
+        while position < len(subjects):
+            subject = subjects[position]
+            position += 1
+            if subject in visited:
+                continue
+            visited.add(subject)
+            for triple in self.graph.triples((subject, None, None)):
+                yield triple
+                if triple[1] == SKOS.broader:
+                    subjects.append(triple[2])
+
+    def _build(self, triples):
+        subject_properties = {}
+        concepts = {}
+        for subject, predicate, obj in triples:
+            prop_name = self._property_names.get(predicate)
+            if prop_name is not None:
+                # Only consider literal values.
+                if isinstance(obj, rdflib.Literal):
+                    literals = subject_properties.setdefault(subject, {}).setdefault(prop_name, {}).setdefault(obj.language if obj.language else "none", [])
+                    # A graph holds every triple only once
+                    if obj not in literals:
+                        literals.append(obj)
+            elif predicate == rdflib.RDF.type:
+                if obj == SKOS.Concept:
+                    concepts[subject] = None
+            elif predicate == SKOS.broader:
+                self._relate(subject, obj)
+        self.properties = {concept: subject_properties.pop(concept, {}) for concept in concepts}
+        for broader in self.narrower:
+            if broader in subject_properties:
+                self._other_properties[broader] = subject_properties[broader]
+
+    def _relate(self, concept, broader):
+        broader_list = self.broader.setdefault(concept, [])
+        if broader not in broader_list:
+            broader_list.append(broader)
+        narrower_list = self.narrower.setdefault(broader, [])
+        if concept not in narrower_list:
+            narrower_list.append(concept)
+
+    def __len__(self):
+        return len(self.properties)
+
+    def term_properties(self, concept):
+        """
+        Returns the term properties of concept, also for subjects that are not typed as skos:Concept.
+        """
+        if concept in self.properties:
+            return self.properties[concept]
+        return self._other_properties.get(concept, {})
+
+    def ancestors(self, concept):
+        """
+        Returns the broader terms of concept from the top term down to its direct broader term as a tuple.
+
+        With several broader terms (poly-hierarchy), the first one in the graph is followed. A broader term that leads back to a concept on the chain (a cycle) is
+        skipped, the cycle is logged once and added to cycles. The chains of all concepts are computed
+        at the first call, in the order of the concepts, so they do not depend on which concepts are
+        asked for first. The chain of a concept is built on the memoized chain of its broader term.
+        """
+        if not self._ancestors:
+            for other in self.properties:
+                self._ancestor_chain(other)
+        return self._ancestor_chain(concept)
+
+    def _ancestor_chain(self, concept):
+        # Concepts whose chain is not known yet, each one the broader term of the one before
+        path = []
+        on_path = set()
+        current = concept
+        while current is not None and current not in self._ancestors:
+            path.append(current)
+            on_path.add(current)
+            current = self._next_broader(path, on_path)
+        chain = () if current is None else self._ancestors[current] + (current,)
+        for node in reversed(path):
+            self._ancestors[node] = chain
+            chain = chain + (node,)
+        return self._ancestors[concept]
+
+    def _next_broader(self, path, on_path):
+        concept = path[-1]
+        for broader in self.broader.get(concept, ()):
+            if broader not in on_path:
+                return broader
+            cycle = tuple(path[path.index(broader):])
+            self.cycles.append(cycle)
+            self.logger.warning(f"Cycle of broader terms, {concept} -> {broader} is ignored: {' -> '.join(str(node) for node in cycle + (broader,))}")
+        return None
+
+    def pref_label(self, concept, desired_lang):
+        """
+        Returns the prefLabel of concept in desired_lang, otherwise in English or any other language,
+        or None if the concept has no prefLabel.
+        """
+        lang_labels = self.term_properties(concept).get("prefLabel", {})
+        for lang in (desired_lang, "en"):
+            if lang in lang_labels:
+                return str(lang_labels[lang][0])
+        for labels in lang_labels.values():
+            return str(labels[0])
+        return None
+
+
 def extract_term_properties(graph):
     """
     Extracts a dictionary of term properties for each SKOS Concept in the graph.
@@ -61,18 +212,4 @@ def extract_term_properties(graph):
     Returns a dictionary in the following structure:
       { concept: { property_name: { language: [list of literals] }, ... }, ... }
     """
-    term_props = {}
-    for concept in graph.subjects(rdflib.RDF.type, SKOS.Concept):
-        term_props[concept] = {}
-        for prop_name, prop_uri in SKOS_TERM_PROPERTIES.items():
-            for obj in graph.objects(concept, prop_uri):
-                # Only consider literal values.
-                if not isinstance(obj, rdflib.Literal):
-                    continue
-                lang = obj.language if obj.language else "none"
-                if prop_name not in term_props[concept]:
-                    term_props[concept][prop_name] = {}
-                if lang not in term_props[concept][prop_name]:
-                    term_props[concept][prop_name][lang] = []
-                term_props[concept][prop_name][lang].append(obj)
-    return term_props
+    return ConceptIndex(graph).properties
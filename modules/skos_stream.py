@@ -0,0 +1,247 @@
+# skos_stream.py
+"""
+Streaming ingestion of SKOS files that are too large for an rdflib graph (see --streaming).
+
+The readers go through the file once and only yield the triples of the given predicates, the other triples
+are never turned into Python objects. stream_concept_index() builds the ConceptIndex from them. Supported
+are RDF/XML (lxml iterparse, every top-level element is freed when it is done) and N-Triples (read line
+by line from a memory-mapped file).
+"""
+import copy
+import logging
+import mmap
+import os
+import re
+from pathlib import Path
+from urllib.parse import urljoin
+
+import rdflib
+from lxml import etree
+
+from modules.skos_handler import SKOS, SKOS_TERM_PROPERTIES, SKOS_VOCABULARY_PROPERTIES, ConceptIndex
+
+RDF_NS = str(rdflib.RDF)
+XML_NS = "http://www.w3.org/XML/1998/namespace"
+_RDF_TYPE = rdflib.RDF.type
+
+# All predicates that the pipeline reads from a SKOS file
+PIPELINE_PREDICATES = frozenset([
+    _RDF_TYPE, SKOS.broader,
+    *SKOS_TERM_PROPERTIES.values(), *SKOS_VOCABULARY_PROPERTIES.values(),
+])
+
+def _split_tag(tag):
+    namespace, _, local = tag[1:].partition("}")
+    return namespace, local
+
+
+def iter_rdfxml_triples(path, predicates=PIPELINE_PREDICATES):
+    """
+    Yields the (subject, predicate, object) triples of an RDF/XML file whose predicate is in predicates.
+
+    Supports node elements with rdf:about, rdf:ID and rdf:nodeID (typed node elements yield rdf:type),
+    property elements with rdf:resource, rdf:nodeID, literal text (xml:lang, rdf:datatype), nested node
+    elements, rdf:parseType="Resource" and "Literal", property attributes, and xml:base. The content of
+    rdf:parseType="Collection" is skipped.
+    """
+    document_base = Path(path).absolute().as_uri()
+    blank_nodes = {}
+
+    def blank_node(node_id=None):
+        if node_id is None:
+            return rdflib.BNode()
+        return blank_nodes.setdefault(node_id, rdflib.BNode(node_id))
+
+    def attribute_triples(subject, element, lang):
+        for name, value in element.attrib.items():
+            namespace, local = _split_tag(name) if name.startswith("{") else ("", name)
+            if namespace in (RDF_NS, XML_NS) or not namespace:
+                continue
+            predicate = rdflib.URIRef(namespace + local)
+            if predicate in predicates:
+                yield subject, predicate, rdflib.Literal(value, lang=lang)
+
+    # Frames of the open elements: [kind, subject or predicate, lang, base]
+    # kind is "rdf" (root), "node" (children are properties), "property" (children are nodes), "xml_literal" or "skip"
+    stack = []
+    for event, element in etree.iterparse(path, events=("start", "end"), remove_comments=True, remove_pis=True, huge_tree=True):
+        if event == "start":
+            parent = stack[-1] if stack else None
+            if parent is not None and parent[0] in ("skip", "xml_literal"):
+                stack.append(["skip", None, None, None])
+                continue
+            lang = element.get(f"{{{XML_NS}}}lang", parent[2] if parent else None) or None
+            base = parent[3] if parent else document_base
+            if element.get(f"{{{XML_NS}}}base"):
+                base = urljoin(base, element.get(f"{{{XML_NS}}}base"))
+            namespace, local = _split_tag(element.tag)
+
+            if parent is None and namespace == RDF_NS and local == "RDF":
+                stack.append(["rdf", None, lang, base])
+            elif parent is None or parent[0] in ("rdf", "property"):
+                # Node element
+                if element.get(f"{{{RDF_NS}}}about") is not None:
+                    subject = rdflib.URIRef(urljoin(base, element.get(f"{{{RDF_NS}}}about")))
+                elif element.get(f"{{{RDF_NS}}}ID") is not None:
+                    subject = rdflib.URIRef(urljoin(base, "#" + element.get(f"{{{RDF_NS}}}ID")))
+                else:
+                    subject = blank_node(element.get(f"{{{RDF_NS}}}nodeID"))
+                if parent is not None and parent[0] == "property":
+                    # The object of the enclosing property element
+                    property_frame = stack[-1]
+                    property_frame[0] = "property_done"
+                    if property_frame[1] in predicates:
+                        yield stack[-2][1], property_frame[1], subject
+                if not (namespace == RDF_NS and local == "Description") and _RDF_TYPE in predicates:
+                    yield subject, _RDF_TYPE, rdflib.URIRef(namespace + local)
+                yield from attribute_triples(subject, element, lang)
+                stack.append(["node", subject, lang, base])
+            elif parent[0] == "node":
+                # Property element
+                predicate = rdflib.URIRef(namespace + local)
+                subject = parent[1]
+                parse_type = element.get(f"{{{RDF_NS}}}parseType")
+                if element.get(f"{{{RDF_NS}}}resource") is not None or element.get(f"{{{RDF_NS}}}nodeID") is not None:
+                    if element.get(f"{{{RDF_NS}}}resource") is not None:
+                        obj = rdflib.URIRef(urljoin(base, element.get(f"{{{RDF_NS}}}resource")))
+                    else:
+                        obj = blank_node(element.get(f"{{{RDF_NS}}}nodeID"))
+                    if predicate in predicates:
+                        yield subject, predicate, obj
+                    yield from attribute_triples(obj, element, lang)
+                    stack.append(["skip", None, None, None])
+                elif parse_type == "Resource":
+                    obj = blank_node()
+                    if predicate in predicates:
+                        yield subject, predicate, obj
+                    stack.append(["node", obj, lang, base])
+                elif parse_type == "Literal":
+                    stack.append(["xml_literal", predicate, lang, base])
+                elif parse_type is not None:
+                    stack.append(["skip", None, None, None])
+                else:
+                    # Literal text or a nested node element, decided by the first child (see above) or at the end
+                    stack.append(["property", predicate, lang, base])
+            else:
+                # Content of a property element after its nested node element
+                stack.append(["skip", None, None, None])
+            continue
+
+        frame = stack.pop()
+        if frame[0] == "property" and frame[1] in predicates:
+            datatype = element.get(f"{{{RDF_NS}}}datatype")
+            if datatype is not None:
+                obj = rdflib.Literal(element.text or "", datatype=rdflib.URIRef(urljoin(frame[3], datatype)))
+            else:
+                obj = rdflib.Literal(element.text or "", lang=frame[2])
+            yield stack[-1][1], frame[1], obj
+        elif frame[0] == "xml_literal" and frame[1] in predicates:
+            content = element.text or ""
+            for child in element:
+                # Without the namespace declarations of the document that the content does not use
+                child = copy.deepcopy(child)
+                etree.cleanup_namespaces(child)
+                content += etree.tostring(child, encoding="unicode")
+            yield stack[-1][1], frame[1], rdflib.Literal(content, datatype=rdflib.RDF.XMLLiteral)
+        if len(stack) <= 1:
+            # A top-level element is done, free it and the ones before it
+            element.clear(keep_tail=True)
+            parent = element.getparent()
+            if parent is not None:
+                while element.getprevious() is not None:
+                    del parent[0]
+
+
+_NT_LINE = re.compile(rb'^\s*(<[^>]*>|_:\S+)\s*<([^>]*)>\s*(.*?)\s*\.\s*$')
+_NT_LITERAL = re.compile(r'^"((?:[^"\\]|\\.)*)"(?:@([A-Za-z]+(?:-[A-Za-z0-9]+)*)|\^\^<([^>]*)>)?$')
+_NT_ESCAPE = re.compile(r'\\(?:u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))')
+_NT_ESCAPES = {"t": "\t", "b": "\b", "n": "\n", "r": "\r", "f": "\f", '"': '"', "'": "'", "\\": "\\"}
+
+
+def _nt_unescape(text):
+    if "\\" not in text:
+        return text
+    return _NT_ESCAPE.sub(lambda match: chr(int(match.group(1) or match.group(2), 16)) if match.group(3) is None else _NT_ESCAPES.get(match.group(3), match.group(3)), text)
+
+
+def iter_ntriples(path, predicates=PIPELINE_PREDICATES):
+    """
+    Yields the (subject, predicate, object) triples of an N-Triples file whose predicate is in predicates
+    (all triples if predicates is None). The file is memory-mapped and only the lines with one of the
+    predicates are decoded.
+    """
+    wanted = None if predicates is None else {str(predicate).encode("utf-8") for predicate in predicates}
+    blank_nodes = {}
+
+    def term(text):
+        if text.startswith("_:"):
+            return blank_nodes.setdefault(text[2:], rdflib.BNode(text[2:]))
+        return rdflib.URIRef(_nt_unescape(text[1:-1]))
+
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        for line in iter(mapped.readline, b""):
+            match = _NT_LINE.match(line)
+            if match is None or wanted is not None and match.group(2) not in wanted:
+                # Empty lines, comments and the triples of other predicates
+                continue
+            subject = term(match.group(1).decode("utf-8"))
+            predicate = rdflib.URIRef(_nt_unescape(match.group(2).decode("utf-8")))
+            obj_text = match.group(3).decode("utf-8")
+            if obj_text.startswith('"'):
+                literal = _NT_LITERAL.match(obj_text)
+                if literal is None:
+                    raise ValueError(f"Invalid N-Triples literal in {path}: {obj_text}")
+                datatype = rdflib.URIRef(literal.group(3)) if literal.group(3) else None
+                obj = rdflib.Literal(_nt_unescape(literal.group(1)), lang=literal.group(2), datatype=datatype)
+            else:
+                obj = term(obj_text)
+            yield subject, predicate, obj
+
+
+_READERS = {"xml": iter_rdfxml_triples, "nt": iter_ntriples}
+
+
+def supports_streaming(input_file):
+    """
+    Returns True if stream_concept_index() can read input_file (by its file extension).
+    """
+    return rdflib.util.guess_format(input_file) in _READERS
+
+
+def stream_concept_index(input_file, logger=None):
+    """
+    Reads the concepts of a SKOS file into a ConceptIndex without building a graph of the file.
+    Returns the index, the file format and the vocabulary-level context (see extract_vocabulary_context()).
+    """
+    logger = logger or logging.getLogger(__name__)
+    fileformat = rdflib.util.guess_format(input_file)
+    if not supports_streaming(input_file):
+        raise ValueError(f"Streaming ingestion supports RDF/XML and N-Triples files, not {fileformat}: {input_file}")
+    concept_schemes = []
+    # (subject, predicate) -> descriptions, for the vocabulary context
+    descriptions = {}
+
+    def index_triples():
+        for subject, predicate, obj in _READERS[fileformat](input_file):
+            if predicate in (SKOS_VOCABULARY_PROPERTIES["dctdescription"], SKOS_VOCABULARY_PROPERTIES["dcdescription"]):
+                descriptions.setdefault((subject, predicate), []).append(obj)
+                continue
+            if predicate == _RDF_TYPE and obj == SKOS.ConceptScheme:
+                concept_schemes.append(subject)
+            yield subject, predicate, obj
+
+    concept_index = ConceptIndex.from_triples(index_triples(), logger=logger)
+    vocab_context = None
+    if concept_schemes:
+        for predicate in (SKOS_VOCABULARY_PROPERTIES["dctdescription"], SKOS_VOCABULARY_PROPERTIES["dcdescription"]):
+            for desc in descriptions.get((concept_schemes[0], predicate), []):
+                if str(desc).strip():
+                    vocab_context = str(desc).strip()
+                    break
+            if vocab_context:
+                break
+    logger.info(f"Streamed {len(concept_index)} concepts from {input_file}")
+    return concept_index, fileformat, vocab_context
+
@@ -0,0 +1,281 @@
+# translation_cache.py
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Optional, Any
+from modules.primary_translators.abstract_primary_translator import PrimaryTranslationService
+from modules.secondary_translators.abstract_secondary_translator import SecondaryTranslationService
+from modules.utils import ServiceWrapper, mark_not_sent
+
+
+class SQLiteCacheStore:
+    """
+    Persistent key-value store in a SQLite database, shared by the translation caches.
+
+    The database runs in WAL mode, so several WOKIE processes can use the same cache file at once.
+    Entries expire after ttl seconds. Entries with a None value (failed calls) use negative_ttl instead,
+    so they are retried sooner. If the table grows beyond max_entries, the least recently used entries are evicted.
+    ttl, negative_ttl and max_entries can be None to disable expiry or eviction.
+    """
+    # Number of inserts between two size checks
+    EVICTION_INTERVAL = 100
+
+    def __init__(self, path: str, table: str, ttl: float | None = None, negative_ttl: float | None = None, max_entries: int | None = None, logger=None):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._inserts_since_eviction = 0
+
+        # timeout: wait for locks held by other processes instead of failing
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "key TEXT PRIMARY KEY, value TEXT, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._connection.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_accessed ON {self.table} (accessed)")
+
+    def _is_expired(self, value: str | None, created: float, now: float) -> bool:
+        ttl = self.ttl if value is not None else self.negative_ttl
+        return ttl is not None and now - created > ttl
+
+    def get(self, key: str) -> tuple[bool, str | None]:
+        """
+        Returns a tuple (found, value). value can be None for cached failed calls.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(f"SELECT value, created FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return False, None
+            value, created = row
+            if self._is_expired(value, created, now):
+                self._connection.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                return False, None
+            self._connection.execute(f"UPDATE {self.table} SET accessed = ? WHERE key = ?", (now, key))
+            return True, value
+
+    def set(self, key: str, value: str | None) -> None:
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._inserts_since_eviction += 1
+            if self._inserts_since_eviction >= self.EVICTION_INTERVAL:
+                self._evict()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def _evict(self) -> None:
+        # Must be called with the lock held
+        self._inserts_since_eviction = 0
+        if self.max_entries is None:
+            return
+        (count,) = self._connection.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        surplus = count - self.max_entries
+        if surplus > 0:
+            self._connection.execute(
+                f"DELETE FROM {self.table} WHERE key IN (SELECT key FROM {self.table} ORDER BY accessed LIMIT ?)",
+                (surplus,),
+            )
+            self.logger.debug(f"Evicted {surplus} least recently used entries from cache table {self.table}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._evict()
+            self._connection.close()
+
+
+class CachedPrimaryTranslationService(ServiceWrapper, PrimaryTranslationService):
+    """
+    Wraps any primary translation service and stores its results in a SQLiteCacheStore,
+    keyed by (service, term, source language, target language).
+
+    mode:
+      - "use": answer from the cache if possible, otherwise call the service and store the result.
+      - "refresh": always call the service and overwrite the stored result.
+    """
+    def __init__(self, service, store: SQLiteCacheStore, mode: str = "use", logger=None):
+        if mode not in ("use", "refresh"):
+            raise ValueError(f"Invalid cache mode: {mode}. Expected one of ['use', 'refresh'].")
+        super().__init__(service, logger)
+        self.store = store
+        self.mode = mode
+        self.max_batch_size = getattr(service, "max_batch_size", 1)
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def _key(self, term: str, source_lang: str, target_lang: str) -> str:
+        return json.dumps([self.service_name, str(term), source_lang, target_lang], ensure_ascii=False)
+
+    def _lookup(self, key: str) -> tuple[bool, Optional[str]]:
+        if self.mode == "refresh":
+            found, value = False, None
+        else:
+            found, value = self.store.get(key)
+        with self._stats_lock:
+            if not found:
+                self.misses += 1
+            elif value is None:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+        return found, value
+
+    def translate(self, term: str, source_lang: str, target_lang: str) -> Optional[str]:
+        key = self._key(term, source_lang, target_lang)
+        found, translation = self._lookup(key)
+        if found:
+            mark_not_sent()
+            return translation
+        translation = self.service.translate(term, source_lang, target_lang)
+        self.store.set(key, translation)
+        return translation
+
+    async def atranslate(self, term: str, source_lang: str, target_lang: str) -> Optional[str]:
+        key = self._key(term, source_lang, target_lang)
+        found, translation = self._lookup(key)
+        if found:
+            mark_not_sent()
+            return translation
+        atranslate = getattr(self.service, "atranslate", None)
+        if atranslate is None:
+            translation = await asyncio.to_thread(self.service.translate, term, source_lang, target_lang)
+        else:
+            translation = await atranslate(term, source_lang, target_lang)
+        self.store.set(key, translation)
+        return translation
+
+    def translate_batch(self, terms: list[str], source_lang: str, target_lang: str) -> list[Optional[str]]:
+        """
+        Answers the cached terms from the store and sends only the missing ones to the service in one batch.
+        """
+        keys = [self._key(term, source_lang, target_lang) for term in terms]
+        results: list[Optional[str]] = [None] * len(terms)
+        missing = []
+        for index, key in enumerate(keys):
+            found, translation = self._lookup(key)
+            if found:
+                results[index] = translation
+            else:
+                missing.append(index)
+        if not missing:
+            mark_not_sent()
+        else:
+            missing_terms = [terms[index] for index in missing]
+            translate_batch = getattr(self.service, "translate_batch", None)
+            if translate_batch is None:
+                translations = [self.service.translate(term, source_lang, target_lang) for term in missing_terms]
+            else:
+                translations = translate_batch(missing_terms, source_lang, target_lang)
+            for index, translation in zip(missing, translations):
+                results[index] = translation
+                self.store.set(keys[index], translation)
+        return results
+
+    def report(self) -> list[str]:
+        """
+        Returns the cache statistics of this run as log lines.
+        """
+        return [f"Primary cache {self.service_name}: {self.hits} hits, {self.negative_hits} hits on failed calls, {self.misses} misses (mode: {self.mode})"]
+
+
+class CachedSecondaryTranslationService(ServiceWrapper, SecondaryTranslationService):
+    """
+    Wraps any secondary translation service and caches its responses for translate_with_context()
+    and rate_translation(). The key consists of provider, model name, temperature, call type and
+    a hash of the prompt dict ({"instructions", "input"}).
+
+    Responses are stored in a SQLiteCacheStore, so they persist across runs.
+    Failed calls (None) are not cached. See CachedPrimaryTranslationService for the modes.
+    """
+    # Rough number of characters per token, used to estimate the saved tokens
+    CHARS_PER_TOKEN = 4
+
+    def __init__(self, service, store: SQLiteCacheStore, mode: str = "use", logger=None):
+        if mode not in ("use", "refresh"):
+            raise ValueError(f"Invalid cache mode: {mode}. Expected one of ['use', 'refresh'].")
+        super().__init__(service, logger)
+        self.store = store
+        self.mode = mode
+        self.hits = {"translate": 0, "rate": 0}
+        self.misses = {"translate": 0, "rate": 0}
+        self.saved_tokens = 0
+        self._stats_lock = threading.Lock()
+        temperature = getattr(service, "temperature", None)
+        if temperature:
+            self.logger.warning(f"Caching responses of {self.service_name} with temperature {temperature}; cached responses are reused although they are not deterministic.")
+
+    def _key(self, prompt: Any, kind: str) -> str:
+        prompt_hash = hashlib.sha256(json.dumps(prompt, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+        return json.dumps([self.service_name, getattr(self.service, "model_name", None), getattr(self.service, "temperature", None), kind, prompt_hash])
+
+    def _estimate_tokens(self, prompt: Any, response: str) -> int:
+        if isinstance(prompt, dict):
+            prompt_length = len(prompt.get("instructions", "")) + len(prompt.get("input", ""))
+        else:
+            prompt_length = len(str(prompt))
+        return (prompt_length + len(response)) // self.CHARS_PER_TOKEN
+
+    def _lookup(self, prompt: Any, kind: str) -> tuple[str, Optional[str]]:
+        key = self._key(prompt, kind)
+        found, response = (False, None) if self.mode == "refresh" else self.store.get(key)
+        with self._stats_lock:
+            if found and response is not None:
+                self.hits[kind] += 1
+                self.saved_tokens += self._estimate_tokens(prompt, response)
+            else:
+                self.misses[kind] += 1
+        return key, response
+
+    def _store(self, key: str, response: Optional[str]) -> None:
+        if response is not None:
+            self.store.set(key, response)
+
+    def _call(self, prompt: Any, kind: str) -> Optional[str]:
+        key, response = self._lookup(prompt, kind)
+        if response is not None:
+            return response
+        method = self.service.translate_with_context if kind == "translate" else self.service.rate_translation
+        response = method(prompt)
+        self._store(key, response)
+        return response
+
+    def translate_with_context(self, prompt: Any) -> Optional[str]:
+        return self._call(prompt, "translate")
+
+    def rate_translation(self, prompt: Any) -> Optional[str]:
+        return self._call(prompt, "rate")
+
+    def discard(self, prompt: Any, kind: str = "rate") -> None:
+        """
+        Removes a cached response, e.g. because it could not be parsed and the call is retried.
+        """
+        self.store.delete(self._key(prompt, kind))
+
+    def report(self) -> list[str]:
+        """
+        Returns the cache statistics of this run as log lines.
+        """
+        return [
+            f"LLM cache {self.service_name}: translate {self.hits['translate']} hits / {self.misses['translate']} misses, "
+            f"rate {self.hits['rate']} hits / {self.misses['rate']} misses (mode: {self.mode})",
+            f"LLM cache {self.service_name}: approx. {self.saved_tokens} tokens saved by cached responses",
+        ]
@@ -1,10 +1,21 @@
 # translation_pipeline.py
+import asyncio
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager, nullcontext
+from collections import Counter
 from datetime import datetime
 import rdflib
-from rdflib import Literal, Namespace
+from rdflib import Literal, Namespace, URIRef
 from langcodes import Language
-from modules.utils import temporary_setattr
-from modules.skos_handler import load_graph, extract_vocabulary_context, extract_term_properties, SKOS_TERM_PROPERTIES
+from modules.utils import temporary_setattr, chunked, track_request
+from modules.run_journal import RunJournal
+from modules.consensus_tracker import ConsensusTracker
+from modules.latency_stats import LatencyStats
+from modules.skos_handler import load_graph, extract_vocabulary_context, ConceptIndex, SKOS_TERM_PROPERTIES
+from modules.skos_stream import stream_concept_index
+from modules.delta_writer import DeltaWriter, can_merge, merge_delta
 
 # Helper functions (partly copied from secondary_translation_strategies)
 
@@ -96,7 +107,7 @@ class TranslationPipeline:
 
     Parameters:
       - input_file: Path to the input SKOS file (RDF/XML or Turtle)
-      - target_lang: Language code for the target language.
+      - target_lang: Language code for the target language, or a list of codes to translate into several languages in one run.
       - primary_translation_services: A list of TranslationService instances.
       - secondary_translation_service: An instance of a SecondaryTranslationService.
       - secondary_strategy: An instance of a secondary translation strategy.
@@ -105,9 +116,50 @@ class TranslationPipeline:
       - confidence_calculator: An instance of a ConfidenceCalculator.
       - user_context: User-defined context.
       - low_confidence_threshold: Threshold below which secondary translation is triggered.
+      - primary_concurrency: "sequential" calls the primary services one after another,
+        "thread" sends the requests of a concept to the services concurrently using a thread pool,
+        "async" does the same on a single event loop using the services' atranslate().
+      - max_workers: Maximum number of parallel requests when primary_concurrency is "thread", or the
+        number of threads for services without native async support when it is "async".
+      - primary_batch_size: If greater than 0, the labels of this many properties are sent to each primary
+        service together with translate_batch() instead of one request per label. 0 translates concept by concept.
+      - service_scheduler: Optional AdaptiveServiceScheduler that reorders the primary services for every concept
+        (or batch) by their measured latency and agreement. None keeps the given order.
+      - early_stopping: Stop asking further primary services for a property as soon as the remaining ones can
+        no longer change whether its confidence ends above or below low_confidence_threshold (see ConsensusTracker).
+        Properties that cannot reach the threshold go straight to the secondary stage.
+      - hedge: Number of extra primary services that are asked at once in "thread" and "async" mode. The first
+        answers that reach min_primary_translations candidates are used and slower requests are cancelled
+        or ignored (see _collect_hedged_primary_translations). 0 disables hedging.
+      - metrics: Optional MetricsRegistry for the requests to the primary services, the decisions and the
+        parse and serialize durations. If metrics_file is set, the metrics are written to it in the Prometheus
+        text format every METRICS_WRITE_INTERVAL seconds during the run and at its end.
+      - usage_tracker: Optional UsageTracker with the token usage and cost of the secondary service. Its running
+        total is shown in the progress line, and once its budget is exhausted, low-confidence properties are
+        decided by the primary confidence calculator alone (decision "budget_exhausted").
+      - stage_timer: Optional StageTimer that gets the time spent in the stages of the run (graph load,
+        extract_term_properties, primary calls, strategy prompt building, confidence calculation, serialize), see --profile.
+      - streaming: Read only the needed SKOS triples of an RDF/XML or N-Triples file into the concept index
+        (see modules/skos_stream.py) instead of parsing the whole file into a graph, for very large vocabularies.
+        The output is a copy of the input file with the translations added.
+
+    The translations are also written to a delta file next to the output file (<output file>.delta.nt, see
+    DeltaWriter) every DELTA_FLUSH_INTERVAL seconds, so partial results can be used during a run. At the end,
+    the output file is merged from the input file and the delta (see merge_delta()); the graph is only
+    serialized for formats that cannot be merged.
     """
+    # Seconds between two writes of metrics_file during a run
+    METRICS_WRITE_INTERVAL = 10
+    # Seconds between two flushes of the delta file during a run
+    DELTA_FLUSH_INTERVAL = 1
     def __init__(self, primary_translation_services, secondary_translation_service,
-                 secondary_strategy, primary_confidence_calculator, secondary_confidence_calculator, low_confidence_threshold=0.5, min_primary_translations=3, logger=None):
+                 secondary_strategy, primary_confidence_calculator, secondary_confidence_calculator, low_confidence_threshold=0.5, min_primary_translations=3, logger=None,
+                 primary_concurrency="sequential", max_workers=8, primary_batch_size=0, service_scheduler=None, early_stopping=False, hedge=0,
+                 metrics=None, metrics_file=None, usage_tracker=None, stage_timer=None, streaming=False):
+        if primary_concurrency not in ("sequential", "thread", "async"):
+            raise ValueError(f"Invalid primary concurrency: {primary_concurrency}. Expected one of ['sequential', 'thread', 'async'].")
+        if hedge and primary_concurrency == "sequential":
+            raise ValueError("Hedged requests need primary concurrency 'thread' or 'async'.")
         self.primary_translation_services = primary_translation_services
         self.secondary_translation_service = secondary_translation_service
         self.secondary_strategy = secondary_strategy
@@ -116,134 +168,880 @@ class TranslationPipeline:
         self.low_confidence_threshold = low_confidence_threshold
         self.min_primary_translations = min_primary_translations
         self.logger = logger
+        self.primary_concurrency = primary_concurrency
+        self.max_workers = max_workers
+        self.primary_batch_size = primary_batch_size
+        self.service_scheduler = service_scheduler
+        self.early_stopping = early_stopping
+        self.hedge = hedge
+        self.metrics = metrics
+        self.metrics_file = metrics_file
+        self.usage_tracker = usage_tracker
+        self.stage_timer = stage_timer
+        self.streaming = streaming
+        # Duration of every primary request, and with hedging the time waited for each used service, per service
+        self._request_latency = LatencyStats()
+        self._hedged_latency = LatencyStats()
+        # Decisions of the consensus trackers per property (id of its lang_dict) and their number in this run
+        self._consensus_decisions = {}
+        self._early_stops = Counter()
+        # Candidates per service of the properties whose translation is not chosen yet, for the scheduler
+        self._candidate_sources = {}
+        # Only set while process_file is running in "thread" or "async" mode
+        self._executor = None
+        self._loop = None
+        # DeltaWriter of the current run, only set while process_file is running
+        self._delta = None
+        # Deduplication of label requests across concepts, reset for every run
+        self._shared_labels = set()
+        self._label_memo = {}
+        self._deduplicated_calls = 0
+        # Statistics of the batch mode: number of translate_batch() requests and labels sent with them
+        self._batch_requests = 0
+        self._batched_labels = 0
 
         # Define which SKOS properties to translate
         # Currently only prefLabel will be translated
         self.properties_to_translate = ["prefLabel"] 
 
+    def _record_request(self, service, seconds, outcome, sent=True):
+        """
+        Records the duration and outcome ("translated", "empty" or "error") of a primary request
+        for the run report, the service scheduler and the metrics. Requests that were answered without
+        calling the service (sent=False, e.g. open circuit breaker or cache hit) are not given to the scheduler.
+        """
+        self._request_latency.add(service, seconds)
+        if self.service_scheduler is not None and sent:
+            self.service_scheduler.record_latency(service, seconds, failed=outcome != "translated")
+        if self.metrics is not None:
+            name = getattr(service, "service_name", service.__class__.__name__)
+            self.metrics.primary_requests.inc(service=name, outcome=outcome)
+            self.metrics.primary_latency.observe(seconds, service=name)
+
+    def _timed(self, service, method, *args):
+        """
+        Calls method and records its duration and outcome, see _record_request().
+        """
+        started = time.monotonic()
+        outcome = "error"
+        with track_request() as request:
+            try:
+                translation = method(*args)
+                outcome = "empty" if translation is None else "translated"
+                return translation
+            finally:
+                self._record_request(service, time.monotonic() - started, outcome, request["sent"])
+
+    async def _atimed(self, service, method, *args):
+        started = time.monotonic()
+        outcome = "error"
+        with track_request() as request:
+            try:
+                translation = await method(*args)
+                outcome = "empty" if translation is None else "translated"
+                return translation
+            except asyncio.CancelledError:
+                # Hedged request that was not needed anymore, its duration is unknown
+                outcome = None
+                raise
+            finally:
+                if outcome is not None:
+                    self._record_request(service, time.monotonic() - started, outcome, request["sent"])
+
+    def _stage(self, name):
+        """
+        Returns a context manager that adds the time of a block to the stage name of the stage timer.
+        """
+        if self.stage_timer is None:
+            return nullcontext()
+        return self.stage_timer.stage(name)
+
+    def _ordered_services(self):
+        if self.service_scheduler is None:
+            return self.primary_translation_services
+        return self.service_scheduler.order(self.primary_translation_services)
+
+    def _launch_primary_requests(self, service, label_requests, target_lang):
+        """
+        Starts the requests of one service for all labels of a concept.
+        In sequential mode nothing is started here, the requests are sent in _gather_primary_results.
+        """
+        if self._loop is not None:
+            # Services that do not implement PrimaryTranslationService run translate() in a thread
+            atranslate = getattr(service, "atranslate", None)
+            if atranslate is None:
+                return [self._loop.create_task(asyncio.to_thread(self._timed, service, service.translate, prop_value, src_lang, target_lang)) for src_lang, prop_value in label_requests]
+            return [self._loop.create_task(self._atimed(service, atranslate, prop_value, src_lang, target_lang)) for src_lang, prop_value in label_requests]
+        if self._executor is None:
+            return None
+        return [self._executor.submit(self._timed, service, service.translate, prop_value, src_lang, target_lang) for src_lang, prop_value in label_requests]
+
+    def _gather_primary_results(self, service, pending, label_requests, target_lang):
+        """
+        Returns the translations of one service in the same order as label_requests.
+        """
+        if pending is None:
+            return [self._timed(service, service.translate, prop_value, src_lang, target_lang) for src_lang, prop_value in label_requests]
+        if self._loop is not None:
+            # Running the loop also advances the requests of services started later
+            return self._loop.run_until_complete(asyncio.gather(*pending))
+        return [future.result() for future in pending]
+
+    def _plan_label_requests(self, term_properties, target_lang):
+        """
+        Planning pass over all concepts that need a translation: counts how often each
+        (label text, source language) pair occurs. Pairs that occur more than once are
+        translated only once per service, and the result is reused for all other occurrences.
+        """
+        occurrences = Counter()
+        for term_props in term_properties.values():
+            for prop_name in self.properties_to_translate:
+                lang_dict = term_props.get(prop_name)
+                if not lang_dict or target_lang in lang_dict:
+                    continue
+                for src_lang, prop_values in lang_dict.items():
+                    for prop_value in prop_values:
+                        if str(prop_value) != "":
+                            occurrences[(str(prop_value), src_lang)] += 1
+        self._shared_labels = {pair for pair, count in occurrences.items() if count > 1}
+        if self.logger:
+            self.logger.info(f"Label planning for {target_lang}: {sum(occurrences.values())} labels to translate, {len(occurrences)} unique (label, language) pairs, {len(self._shared_labels)} of them used by more than one concept")
+
+    def _requests_to_send(self, service, label_requests, target_lang):
+        """
+        Returns the label requests of a concept that have not been answered by this service yet,
+        each unique (label text, source language) pair only once.
+        """
+        to_send = []
+        seen = set()
+        for src_lang, prop_value in label_requests:
+            pair = (str(prop_value), src_lang)
+            if pair in seen or (service, *pair, target_lang) in self._label_memo:
+                self._deduplicated_calls += 1
+                continue
+            seen.add(pair)
+            to_send.append((src_lang, prop_value))
+        return to_send
+
+    def _fan_out_results(self, service, label_requests, sent_requests, sent_results, target_lang):
+        """
+        Maps the results of the sent (unique) requests and of earlier concepts back to all label requests.
+        """
+        fresh = {}
+        for (src_lang, prop_value), translation in zip(sent_requests, sent_results):
+            pair = (str(prop_value), src_lang)
+            fresh[pair] = translation
+            if pair in self._shared_labels:
+                self._label_memo[(service, *pair, target_lang)] = translation
+        results = []
+        for src_lang, prop_value in label_requests:
+            pair = (str(prop_value), src_lang)
+            results.append(fresh[pair] if pair in fresh else self._label_memo[(service, *pair, target_lang)])
+        return results
+
+    def _collect_primary_translations(self, lang_dict, prop_name, target_lang):
+        """
+        Translates all source-language labels of a property with the primary services.
+
+        Services are evaluated in the given order and the collection stops as soon as
+        min_primary_translations candidates exist. In "thread" and "async" mode, the requests of as many
+        services as are needed to reach that number (assuming every request succeeds) are sent at once.
+        Further services are only started if the results fall short, so no service is called
+        that would not also have been called in sequential mode.
+        Labels that a service already translated for another concept are not sent again (see _plan_label_requests).
+        With a service scheduler, the services are evaluated in the order it proposes for this concept.
+
+        Returns a tuple (primary_translations, total_candidates) where primary_translations maps
+        source languages to lists of translations.
+        """
+        primary_translations = {}
+        total_candidates = 0
+
+        # All (source language, label) pairs that are sent to every service
+        label_requests = [(src_lang, prop_value) for src_lang, prop_values in lang_dict.items() for prop_value in prop_values if str(prop_value) != ""]
+        if not label_requests:
+            return primary_translations, total_candidates
+
+        services = self._ordered_services()
+        tracker = ConsensusTracker(self.min_primary_translations, self.low_confidence_threshold) if self.early_stopping else None
+        if tracker is not None and self._consensus_decided(tracker, lang_dict, len(services), len(label_requests)):
+            return primary_translations, total_candidates
+        sources = {}
+        if self.service_scheduler is not None:
+            self._candidate_sources[id(lang_dict)] = sources
+        # Each service can contribute at most one candidate per label
+        max_yield = len(label_requests)
+        if self.hedge and (self._executor is not None or self._loop is not None):
+            return self._collect_hedged_primary_translations(lang_dict, prop_name, target_lang, label_requests, services, sources, tracker)
+        pending = {}
+
+        def launch_until(count):
+            for index in range(len(pending), min(count, len(services))):
+                to_send = self._requests_to_send(services[index], label_requests, target_lang)
+                pending[index] = (to_send, self._launch_primary_requests(services[index], to_send, target_lang))
+
+        launch_until(math.ceil(self.min_primary_translations / max_yield))
+        for index, service in enumerate(services):
+            launch_until(index + 1)
+            sent_requests, handle = pending[index]
+            sent_results = self._gather_primary_results(service, handle, sent_requests, target_lang)
+            results = self._fan_out_results(service, label_requests, sent_requests, sent_results, target_lang)
+            sources[service] = [translation for translation in results if translation is not None]
+            for (src_lang, prop_value), translation in zip(label_requests, results):
+                if translation is None:
+                    continue
+                primary_translations.setdefault(src_lang, []).append(translation)
+                total_candidates += 1
+                if self.logger:
+                    self.logger.info(f"    Primary translation from {service.__class__.__name__} for {prop_name}: '{prop_value}' ({src_lang}) -> '{translation}' ({target_lang})")
+            # Break if enough translations are there.
+            if total_candidates >= self.min_primary_translations:
+                break
+            if tracker is not None:
+                tracker.add(results)
+                if self._consensus_decided(tracker, lang_dict, len(services) - index - 1, max_yield):
+                    break
+            # Start as many further services as are needed to cover the remaining candidates
+            in_flight = len(pending) - index - 1
+            missing = math.ceil((self.min_primary_translations - total_candidates) / max_yield)
+            launch_until(len(pending) + max(0, missing - in_flight))
+
+        return primary_translations, total_candidates
+
+    def _collect_hedged_primary_translations(self, lang_dict, prop_name, target_lang, label_requests, services, sources, tracker):
+        """
+        Hedged variant of _collect_primary_translations(): the requests of hedge more services than needed
+        are sent at once and the services are evaluated in the order their answers arrive. As soon as
+        min_primary_translations candidates exist, the requests that are still running are cancelled
+        (async mode, and thread mode if they have not started yet) or their results are ignored.
+        """
+        primary_translations = {}
+        total_candidates = 0
+        max_yield = len(label_requests)
+        launched = {}
+        # Pending futures or tasks and the index of the service they belong to
+        owners = {}
+        remaining = {}
+        # Services whose requests are all done, in the order they finished
+        finished = []
+
+        def launch(count):
+            for index in range(len(launched), min(count, len(services))):
+                to_send = self._requests_to_send(services[index], label_requests, target_lang)
+                handles = self._launch_primary_requests(services[index], to_send, target_lang)
+                launched[index] = (to_send, handles, time.monotonic())
+                remaining[index] = len(handles)
+                for handle in handles:
+                    owners[handle] = index
+                if not handles:
+                    # All labels were already answered by this service for other concepts
+                    finished.append(index)
+
+        def wait_first():
+            if self._loop is not None:
+                done, _ = self._loop.run_until_complete(asyncio.wait(owners, return_when=asyncio.FIRST_COMPLETED))
+            else:
+                done, _ = wait(owners, return_when=FIRST_COMPLETED)
+            return done
+
+        launch(math.ceil(self.min_primary_translations / max_yield) + self.hedge)
+        evaluated = 0
+        while evaluated < len(launched):
+            if not finished:
+                for handle in wait_first():
+                    index = owners.pop(handle)
+                    remaining[index] -= 1
+                    if remaining[index] == 0:
+                        finished.append(index)
+                continue
+            index = finished.pop(0)
+            evaluated += 1
+            service = services[index]
+            sent_requests, handles, started = launched[index]
+            self._hedged_latency.add(service, time.monotonic() - started)
+            sent_results = [handle.result() for handle in handles]
+            results = self._fan_out_results(service, label_requests, sent_requests, sent_results, target_lang)
+            sources[service] = [translation for translation in results if translation is not None]
+            for (src_lang, prop_value), translation in zip(label_requests, results):
+                if translation is None:
+                    continue
+                primary_translations.setdefault(src_lang, []).append(translation)
+                total_candidates += 1
+                if self.logger:
+                    self.logger.info(f"    Primary translation from {service.__class__.__name__} for {prop_name}: '{prop_value}' ({src_lang}) -> '{translation}' ({target_lang})")
+            if total_candidates >= self.min_primary_translations:
+                break
+            if tracker is not None:
+                tracker.add(results)
+                if self._consensus_decided(tracker, lang_dict, len(services) - evaluated, max_yield):
+                    break
+            # Keep enough services (plus the hedge) running to cover the remaining candidates
+            running = len(launched) - evaluated
+            missing = math.ceil((self.min_primary_translations - total_candidates) / max_yield) + self.hedge
+            launch(len(launched) + max(0, missing - running))
+
+        # Stragglers are not needed anymore
+        for handle in owners:
+            handle.cancel()
+        return primary_translations, total_candidates
+
+    def _consensus_decided(self, tracker, lang_dict, remaining_services, max_yield):
+        """
+        Returns True if the remaining services cannot change the outcome for the property anymore,
+        the decision is used by _primary_stage().
+        """
+        decision = tracker.decide(remaining_services, max_yield)
+        if decision is None:
+            return False
+        self._consensus_decisions[id(lang_dict)] = decision
+        self._early_stops[decision] += 1
+        return True
+
+    def _collect_primary_translations_batch(self, properties, target_lang):
+        """
+        Batched variant of _collect_primary_translations() for the properties of several concepts.
+
+        The services are called one after another, each with one translate_batch() request per source
+        language that contains the unique labels of all properties that still have fewer than
+        min_primary_translations candidates. So every property gets the same candidates from the same
+        services as in the concept-by-concept mode, but with far fewer requests.
+
+        properties is a list of tuples (lang_dict, prop_name).
+        Returns a list with a tuple (primary_translations, total_candidates) per entry of properties.
+        """
+        label_requests = [[(src_lang, prop_value) for src_lang, prop_values in lang_dict.items() for prop_value in prop_values if str(prop_value) != ""] for lang_dict, _ in properties]
+        primary_translations = [{} for _ in properties]
+        total_candidates = [0 for _ in properties]
+
+        sources = [{} for _ in properties]
+        if self.service_scheduler is not None:
+            for (lang_dict, _), property_sources in zip(properties, sources):
+                self._candidate_sources[id(lang_dict)] = property_sources
+        services = self._ordered_services()
+        trackers = [ConsensusTracker(self.min_primary_translations, self.low_confidence_threshold) if self.early_stopping and requests else None for requests in label_requests]
+        # Properties that are decided by the consensus trackers are not sent to further services
+        decided = [tracker is not None and self._consensus_decided(tracker, lang_dict, len(services), len(requests))
+                   for tracker, (lang_dict, _), requests in zip(trackers, properties, label_requests)]
+        for index, service in enumerate(services):
+            active = [j for j, requests in enumerate(label_requests) if requests and total_candidates[j] < self.min_primary_translations and not decided[j]]
+            if not active:
+                break
+            # Unique labels per source language that this service has not translated yet
+            to_send = {}
+            for j in active:
+                for src_lang, prop_value in label_requests[j]:
+                    term = str(prop_value)
+                    if (service, term, src_lang, target_lang) in self._label_memo or term in to_send.get(src_lang, {}):
+                        self._deduplicated_calls += 1
+                        continue
+                    # dict as ordered set
+                    to_send.setdefault(src_lang, {})[term] = None
+            self._send_primary_batches(service, {src_lang: list(terms) for src_lang, terms in to_send.items()}, target_lang)
+
+            for j in active:
+                sources[j][service] = []
+                for src_lang, prop_value in label_requests[j]:
+                    translation = self._label_memo[(service, str(prop_value), src_lang, target_lang)]
+                    if translation is None:
+                        continue
+                    sources[j][service].append(translation)
+                    primary_translations[j].setdefault(src_lang, []).append(translation)
+                    total_candidates[j] += 1
+                    if self.logger:
+                        self.logger.info(f"    Primary translation from {service.__class__.__name__} for {properties[j][1]}: '{prop_value}' ({src_lang}) -> '{translation}' ({target_lang})")
+                if trackers[j] is not None and total_candidates[j] < self.min_primary_translations:
+                    trackers[j].add(sources[j][service])
+                    decided[j] = self._consensus_decided(trackers[j], properties[j][0], len(services) - index - 1, len(label_requests[j]))
+
+        return list(zip(primary_translations, total_candidates))
+
+    def _send_primary_batches(self, service, terms_by_lang, target_lang):
+        """
+        Sends one translate_batch() request per source language and stores the results in the label memo.
+        In "thread" and "async" mode, the requests for the different source languages run concurrently.
+        """
+        def translate_batch(terms, src_lang):
+            batch = getattr(service, "translate_batch", None)
+            if batch is None:
+                # Services that do not implement PrimaryTranslationService
+                return [self._timed(service, service.translate, term, src_lang, target_lang) for term in terms]
+            started = time.monotonic()
+            with track_request() as request:
+                translations = batch(terms, src_lang, target_lang)
+            # Latency per term, comparable to the concept-by-concept mode
+            duration = (time.monotonic() - started) / len(terms)
+            for translation in translations:
+                self._record_request(service, duration, "empty" if translation is None else "translated", request["sent"])
+            return translations
+
+        groups = [(terms, src_lang) for src_lang, terms in terms_by_lang.items() if terms]
+        if not groups:
+            return
+        if self._loop is not None:
+            # Futures of the run's loop, executed in its default executor
+            results = self._loop.run_until_complete(asyncio.gather(*(self._loop.run_in_executor(None, translate_batch, *group) for group in groups)))
+        elif self._executor is not None:
+            results = [future.result() for future in [self._executor.submit(translate_batch, *group) for group in groups]]
+        else:
+            results = [translate_batch(*group) for group in groups]
+
+        for (terms, src_lang), translations in zip(groups, results):
+            self._batch_requests += 1
+            self._batched_labels += len(terms)
+            for term, translation in zip(terms, translations):
+                self._label_memo[(service, term, src_lang, target_lang)] = translation
+
+    @contextmanager
+    def _primary_executor(self):
+        """
+        Provides the thread pool or the event loop for the primary services for the duration of a run.
+        """
+        if self.primary_concurrency == "sequential":
+            yield
+            return
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="primary") as executor:
+            if self.primary_concurrency == "thread":
+                self._executor = executor
+                try:
+                    yield
+                finally:
+                    self._executor = None
+                return
+            # One loop for the whole run so that async clients can keep their connections
+            loop = asyncio.new_event_loop()
+            # used by asyncio.to_thread for services without native async support
+            loop.set_default_executor(executor)
+            self._loop = loop
+            try:
+                yield
+            finally:
+                self._loop = None
+                # Let cancelled hedged requests finish their cancellation
+                tasks = asyncio.all_tasks(loop)
+                if tasks:
+                    loop.run_until_complete(asyncio.wait(tasks))
+                loop.run_until_complete(loop.shutdown_asyncgens())
+                loop.close()
+
     # When output_file is set to "default", the string "_updated" is appended to the input_filename
-    def process_file(self, input_file, target_lang, user_context, output_file="default"):
+    # target_lang can be a single language code or a list of codes; all languages are written to the same output file
+    # With resume=True, the journal of an aborted run with the same output file is replayed and finished concepts are skipped
+    def process_file(self, input_file, target_lang, user_context, output_file="default", resume=False):
+        target_langs = [target_lang] if isinstance(target_lang, str) else list(target_lang)
+        with self._primary_executor():
+            self._process_file(input_file, target_langs, user_context, output_file, resume)
+
+    def _process_file(self, input_file, target_langs, user_context, output_file, resume):
+        if output_file == "default":
+            stem, suffix = input_file.rsplit(".", 1)
+            output_file = f"{stem}_updated.{suffix}"
+        journal = RunJournal(f"{output_file}.journal.jsonl", logger=self.logger)
+
         # Load the SKOS graph and extract vocabulary-level context.
-        graph, fileformat = load_graph(input_file)
-        vocab_context = extract_vocabulary_context(graph)
-        
-        # Extract all term properties at once
-        term_properties = extract_term_properties(graph)
-        total_concepts = len(term_properties)
+        started = time.monotonic()
+        if self.streaming:
+            # Only the needed triples go into the index, the graph only gets the translations
+            with self._stage("streaming ingestion"):
+                concept_index, fileformat, vocab_context = stream_concept_index(input_file, logger=self.logger)
+            graph = concept_index.graph = rdflib.Graph()
+            if self.metrics is not None:
+                self.metrics.stage_latency.observe(time.monotonic() - started, stage="parse")
+        else:
+            with self._stage("graph load"):
+                graph, fileformat = load_graph(input_file)
+            if self.metrics is not None:
+                self.metrics.stage_latency.observe(time.monotonic() - started, stage="parse")
+            vocab_context = extract_vocabulary_context(graph)
+
+            # Extract all term properties and the hierarchy at once, the strategies read from the index instead of the graph
+            # They are extracted only once for all target languages, so the translations into one
+            # target language are not used as source labels for the next one.
+            with self._stage("extract_term_properties"):
+                concept_index = ConceptIndex(graph, logger=self.logger)
+        # Checked before the run, so a file that cannot be merged is not noticed only after all translations
+        merge_output = can_merge(input_file, fileformat)
+        if self.streaming and not merge_output:
+            raise ValueError(f"Streaming ingestion cannot add the translations to {input_file}, RDF/XML files need an rdf:RDF root element")
+        total_concepts = len(concept_index)
         if self.logger:
             self.logger.info(f"Total concepts: {total_concepts}")
 
+        self._delta = DeltaWriter(f"{output_file}.delta.nt", logger=self.logger)
+        self._delta.open()
+        finished = set()
+        if resume:
+            finished = self._replay_journal(graph, journal)
+        journal.open(resume=resume)
+        self._deduplicated_calls = 0
+        self._batch_requests = 0
+        self._batched_labels = 0
+        self._early_stops = Counter()
+        self._request_latency.clear()
+        self._hedged_latency.clear()
+
+        for target_lang in target_langs:
+            self._translate_target_language(concept_index, vocab_context, user_context, target_lang, journal, finished)
+        if concept_index.cycles:
+            print(f"\nIgnored {len(concept_index.cycles)} cycle(s) of broader terms in the hierarchy, see the log")
+
+        # Update and safe graph
+        started = time.monotonic()
+        with self._stage("serialize"):
+            self._delta.close()
+            if self.streaming or merge_output and not self._delta.has_blank_nodes:
+                merge_delta(input_file, fileformat, self._delta.path, output_file)
+            else:
+                graph.serialize(destination=output_file, format=fileformat) # type: ignore
+        if self.metrics is not None:
+            self.metrics.stage_latency.observe(time.monotonic() - started, stage="serialize")
+        if self.logger:
+            self.logger.info(f"Updated SKOS file saved: {output_file}")
+        print(f"\nUpdated SKOS file saved: {output_file}")
+        # The output contains everything from the journal and the delta now
+        journal.remove()
+        self._delta.remove()
+        self._delta = None
+        self._report_run_statistics()
+        self._export_metrics(final=True)
 
-        # Iterate over each term (concept) in the vocabulary
+    def _translate_target_language(self, concept_index, vocab_context, user_context, target_lang, journal, finished):
+        """
+        Adds the missing term properties in one target language to the graph of concept_index.
+        Properties in finished (concept, property, target language) were restored from the journal and are skipped.
+        """
+        graph = concept_index.graph
+        term_properties = concept_index.properties
+        total_concepts = len(term_properties)
+        # The memo only holds results for the current target language
+        self._label_memo = {}
+        self._candidate_sources = {}
+        self._consensus_decisions = {}
+        self._plan_label_requests(term_properties, target_lang)
+
+        # Collect the properties that need a translation
+        work = []
         for i, (concept, term_props) in enumerate(term_properties.items(), start=1):
-            timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-            # Use ANSI codes (\033[K) to erase until end of line for proper flushing
-            # Does not properly work when piping console output to file
-            print(f"\r\033[KProcessing term {i}/{total_concepts} with primary services and {self.secondary_translation_service.service_name}: {concept} [{timestamp}]", end='', flush=True)
-            if self.logger:
-                self.logger.info(f"Processing concept: {concept}")
             for prop_name in self.properties_to_translate:
                 if prop_name not in term_props:
                     continue
                 lang_dict = term_props[prop_name]
                 # Skip if target language value already exists.
-                if target_lang in lang_dict:
+                if target_lang in lang_dict or (str(concept), prop_name, target_lang) in finished:
                     continue
+                work.append((i, concept, term_props, prop_name))
 
-                primary_translations = {}
-                total_candidates = 0
-
-                for service in self.primary_translation_services:
-                    # Translate all available source-language labels using this service
-                    for src_lang, prop_values in lang_dict.items():
-                        for prop_value in prop_values:
-                            if str(prop_value) == "":
-                                continue 
-                            translation = service.translate(prop_value, src_lang, target_lang)
-                            if src_lang not in primary_translations and translation is not None:
-                                primary_translations[src_lang] = []
-                            if translation is not None:
-                                primary_translations[src_lang].append(translation)
-                                total_candidates += 1
-                                if self.logger:
-                                    self.logger.info(f"    Primary translation from {service.__class__.__name__} for {prop_name}: '{prop_value}' ({src_lang}) -> '{translation}' ({target_lang})")
-                    # Break if enough translations are there.
-                    if total_candidates >= self.min_primary_translations:
-                        break                
-
-                
-                # Call the confidence calculator for primary translations.
-                if total_candidates >= self.min_primary_translations:
-                    best_translation, primary_confidence = self.primary_confidence_calculator.calculate(primary_translations)
-                else:
-                    best_translation = None
-                    primary_confidence = None
+        multi_concept = hasattr(self.secondary_strategy, "translate_many")
+        # With provider batch jobs, all low-confidence properties of the target language are collected
+        batch_job = hasattr(self.secondary_translation_service, "run_batch")
+        deferred = []
 
-                # If primary confidence is low, use secondary translation strategy.
-                if primary_confidence is None or primary_confidence < self.low_confidence_threshold or best_translation is None:
-                    if self.logger:
-                        self.logger.info(f"    Low confidence ({primary_confidence}) for term {concept}, property {prop_name}, using secondary translation service")
-                    # Aggregate all source values for this property
-                    labels: list[str] = []
-                    for values in lang_dict.values():
-                        labels.extend(values)
-                    # Pass the extracted properties for this concept as term_props.
-                    # translate with secondary translation strategy
-                    # depending on strategy, dict or string is returned
-                    secondary_translations = self.secondary_strategy.translate(
-                        labels, graph, concept, term_props, vocab_context, user_context,
-                        self.secondary_translation_service, target_lang, logger=self.logger
-                    )
-                    # Check if the most common translation of the possible secondary translations (each translated from a different language) is in primrary translations
-                    if isinstance(secondary_translations, dict):
-                        most_common_secondary_translation, _ = self.primary_confidence_calculator.calculate(secondary_translations)
-                    else:
-                        most_common_secondary_translation = secondary_translations
-
-                    lower_most_common_secondary_translation = None
-                    if most_common_secondary_translation: # guard against None
-                        lower_most_common_secondary_translation = most_common_secondary_translation.lower()
-                    # If most common secondary translation is in primary translations, use it as best_translation and set secondary_confidence to 1. Steps explained in the following
-
-                    # Check every value in primary_translations (could be a str or list of str)
-                    if lower_most_common_secondary_translation and any(
-                        # Case 1: primary_translation is a string and matches our secondary (case-insensitive)
-                        (isinstance(primary_translation, str) and primary_translation.lower() == lower_most_common_secondary_translation)
-                        # Case 2: primary_translation is a list of strings, check each element
-                        or (isinstance(primary_translation, list) and any(
-                            isinstance(candidate, str) and candidate.lower() == lower_most_common_secondary_translation
-                            for candidate in primary_translation
-                        ))
-                        for primary_translation in primary_translations.values()
-                    ):
-                        # most common secondary translation is in primary translations, so choose it as best_translation
-                        best_translation = most_common_secondary_translation
-
-                        # Choose confidence of 1
-                        secondary_confidence = 1
-
-
-                    # If most common secondary translation is not in primary translations, use the secondary_confidence_calculator, but include the primary translations
-                    else:
-                        # use secondary confidence calculator (LLM based) to rate the translation
-                        # Temporarily set max_retries to 0 because I only want to try this once (so no retries)
-                        # with temporary_setattr(self.secondary_confidence_calculator, "max_retries", 0):
-                        best_translation, secondary_confidence = self.secondary_confidence_calculator.calculate(labels, primary_translations, secondary_translations, term_props, vocab_context, user_context, target_lang, logger=self.logger)
-                    # use primary_conficence_calculator with primary translations if it fails
-                    if not best_translation or not secondary_confidence:
-                        best_translation, secondary_confidence = self.primary_confidence_calculator.calculate(compile_translations_dict(primary_translations, secondary_translations))
-                    if self.logger:
-                        self.logger.info(f"        Secondary translation chosen for {prop_name}: '{best_translation}' with confidence {secondary_confidence}")
-                # Add the best translation as a new literal for the property in the target language.
-                graph.add((concept, SKOS_TERM_PROPERTIES[prop_name], Literal(best_translation, lang=target_lang)))
+        # Without batching, every chunk holds one property and the primary services are called per concept
+        for chunk in chunked(work, self.primary_batch_size or 1):
+            if self.primary_batch_size:
+                with self._stage("primary calls"):
+                    prefetched = self._collect_primary_translations_batch([(term_props[prop_name], prop_name) for _, _, term_props, prop_name in chunk], target_lang)
+            else:
+                prefetched = [None] * len(chunk)
 
-        # Update and safe graph
-        if output_file == "default":
-            stem, suffix = input_file.rsplit(".", 1)
-            output_file = f"{stem}_updated.{suffix}"
+            # Iterate over each term (concept) in the vocabulary
+            for (i, concept, term_props, prop_name), primary in zip(chunk, prefetched):
+                timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+                # Use ANSI codes (\033[K) to erase until end of line for proper flushing
+                # Does not properly work when piping console output to file
+                usage = f" [{self.usage_tracker.summary()}]" if self.usage_tracker is not None else ""
+                print(f"\r\033[KProcessing term {i}/{total_concepts} ({target_lang}) with primary services and {self.secondary_translation_service.service_name}: {concept} [{timestamp}]{usage}", end='', flush=True)
+                if self.logger:
+                    self.logger.info(f"Processing concept: {concept} ({target_lang})")
+
+                if not multi_concept and not batch_job:
+                    record = self._translate_property(concept_index, concept, term_props, prop_name, vocab_context, user_context, target_lang, primary)
+                    self._add_translation(graph, journal, concept, prop_name, record)
+                    continue
+
+                # Strategies with translate_many() and batch jobs get the low-confidence properties of several concepts at once
+                record = self._primary_stage(concept, term_props, prop_name, target_lang, primary)
+                if not self._needs_secondary(record):
+                    self._add_translation(graph, journal, concept, prop_name, record)
+                    continue
+                deferred.append((concept, term_props, prop_name, record))
+                if not batch_job and len(deferred) >= self.secondary_strategy.max_concepts:
+                    self._resolve_deferred(deferred, concept_index, vocab_context, user_context, target_lang, journal)
+
+        self._resolve_deferred(deferred, concept_index, vocab_context, user_context, target_lang, journal)
+
+    def _replay_journal(self, graph, journal):
+        """
+        Adds the translations recorded in the journal of a previous run to the graph and the delta.
+        Returns the set of (concept, property, target language) that are finished.
+        """
+        records = journal.load()
+        finished = set()
+        for record in records:
+            self._add_triple(graph, (URIRef(record["concept"]), SKOS_TERM_PROPERTIES[record["property"]], Literal(record["translation"], lang=record["target_lang"])))
+            finished.add((record["concept"], record["property"], record["target_lang"]))
+        if self.logger:
+            self.logger.info(f"Resumed {len(records)} translations from journal {journal.path}")
+        print(f"Resumed {len(records)} translations from journal {journal.path}")
+        return finished
+
+    def _translate_property(self, concept_index, concept, term_props, prop_name, vocab_context, user_context, target_lang, primary=None):
+        """
+        Translates a single property of a concept with the primary services and, if the confidence is low,
+        the secondary service. primary can hold the already collected (primary_translations, total_candidates).
+        Returns a journal record with the chosen translation, its confidence and the raw candidates.
+        """
+        record = self._primary_stage(concept, term_props, prop_name, target_lang, primary)
+        if self._needs_secondary(record):
+            labels = self._source_labels(term_props[prop_name])
+            # Pass the extracted properties for this concept as term_props.
+            # translate with secondary translation strategy
+            # depending on strategy, dict or string is returned
+            with self._stage("strategy prompt building"):
+                secondary_translations = self.secondary_strategy.translate(
+                    labels, concept_index, concept, term_props, vocab_context, user_context,
+                    self.secondary_translation_service, target_lang, logger=self.logger
+                )
+            self._secondary_stage(record, labels, secondary_translations, term_props, vocab_context, user_context, target_lang)
+        return record
+
+    def _primary_stage(self, concept, term_props, prop_name, target_lang, primary=None):
+        """
+        Chooses the best primary translation of a property and returns the journal record for it.
+        """
+        lang_dict = term_props[prop_name]
+        if primary is None:
+            with self._stage("primary calls"):
+                primary = self._collect_primary_translations(lang_dict, prop_name, target_lang)
+        primary_translations, total_candidates = primary
+        decision = self._consensus_decisions.pop(id(lang_dict), None)
+        # From here on, the candidates of each service are kept per property until the translation is chosen
+        sources = self._candidate_sources.pop(id(lang_dict), None)
+        if sources is not None:
+            self._candidate_sources[(str(concept), prop_name, target_lang)] = sources
+
+        # Call the confidence calculator for primary translations.
+        # With early stopping, ACCEPT stands for enough candidates and REJECT sends the property to the secondary stage
+        if decision == ConsensusTracker.ACCEPT or (decision is None and total_candidates >= self.min_primary_translations):
+            with self._stage("confidence calculation"):
+                best_translation, primary_confidence = self.primary_confidence_calculator.calculate(primary_translations)
         else:
-            output_file = output_file
-        graph.serialize(destination=output_file, format=fileformat) # type: ignore
+            best_translation = None
+            primary_confidence = None
+
+        return {
+            "concept": str(concept),
+            "property": prop_name,
+            "target_lang": target_lang,
+            "translation": best_translation,
+            "stage": "primary",
+            # primary_accepted, budget_exhausted (see _needs_secondary and _secondary_stage), or how the secondary stage chose the translation (see _choose_secondary_translation)
+            "decision": "primary_accepted",
+            "primary_confidence": primary_confidence,
+            "secondary_confidence": None,
+            "primary_translations": primary_translations,
+            "secondary_translations": None,
+        }
+
+    def _needs_secondary(self, record):
+        """
+        If primary confidence is low, the secondary translation strategy is used.
+        Once the LLM budget is exhausted, the record gets the best primary translation regardless of its
+        confidence and the number of candidates instead, and False is returned.
+        """
+        primary_confidence = record["primary_confidence"]
+        needs_secondary = primary_confidence is None or primary_confidence < self.low_confidence_threshold or record["translation"] is None
+        if needs_secondary and self.usage_tracker is not None and self.usage_tracker.exhausted:
+            best_translation, primary_confidence = self.primary_confidence_calculator.calculate(record["primary_translations"])
+            record.update(translation=best_translation, decision="budget_exhausted", primary_confidence=primary_confidence)
+            if self.logger:
+                self.logger.info(f"    Low confidence ({primary_confidence}) for term {record['concept']}, property {record['property']}, LLM budget exhausted, using primary translation '{best_translation}'")
+            return False
+        if needs_secondary and self.logger:
+            self.logger.info(f"    Low confidence ({primary_confidence}) for term {record['concept']}, property {record['property']}, using secondary translation service")
+        return needs_secondary
+
+    def _source_labels(self, lang_dict):
+        # Aggregate all source values for this property
+        labels: list[str] = []
+        for values in lang_dict.values():
+            labels.extend(values)
+        return labels
+
+    def _secondary_stage(self, record, labels, secondary_translations, term_props, vocab_context, user_context, target_lang):
+        """
+        Updates the record with the translation chosen from the secondary translations.
+        If the secondary stage fell back because the LLM budget ran out, the best primary translation is used.
+        """
+        with self._stage("confidence calculation"):
+            best_translation, secondary_confidence, decision = self._choose_secondary_translation(labels, record["primary_translations"], secondary_translations, term_props, vocab_context, user_context, target_lang)
+        if decision == "fallback" and self.usage_tracker is not None and self.usage_tracker.exhausted:
+            # The budget ran out during the secondary stage (refused calls return None), like in _needs_secondary
+            best_translation, primary_confidence = self.primary_confidence_calculator.calculate(record["primary_translations"])
+            record.update(translation=best_translation, decision="budget_exhausted", primary_confidence=primary_confidence, secondary_translations=secondary_translations)
+            if self.logger:
+                self.logger.info(f"        LLM budget exhausted for {record['property']}, using primary translation '{best_translation}'")
+            return
         if self.logger:
-            self.logger.info(f"Updated SKOS file saved: {output_file}")
-        print(f"\nUpdated SKOS file saved: {output_file}")
+            self.logger.info(f"        Secondary translation chosen for {record['property']}: '{best_translation}' with confidence {secondary_confidence}")
+        record.update(translation=best_translation, stage="secondary", decision=decision, secondary_confidence=secondary_confidence, secondary_translations=secondary_translations)
+
+    def _resolve_deferred(self, deferred, concept_index, vocab_context, user_context, target_lang, journal):
+        """
+        Translates the collected low-confidence properties with the secondary strategy and adds the chosen
+        translations to the graph of concept_index. Strategies with translate_many() get all properties in one call.
+        If the secondary service answers with provider batch jobs (run_batch()), the translation prompts and
+        then the rating prompts are collected in a pass over all properties, answered by a batch job, and the
+        pass is repeated with the answers until no new prompts are needed.
+        deferred is a list of tuples (concept, term_props, prop_name, record) and is emptied.
+        """
+        if not deferred:
+            return
+        items = [(self._source_labels(term_props[prop_name]), term_props) for _, term_props, prop_name, _ in deferred]
+        while True:
+            with self._stage("strategy prompt building"):
+                if hasattr(self.secondary_strategy, "translate_many"):
+                    translations = self.secondary_strategy.translate_many(
+                        items, vocab_context, user_context, self.secondary_translation_service, target_lang, logger=self.logger
+                    )
+                else:
+                    translations = [
+                        self.secondary_strategy.translate(
+                            labels, concept_index, concept, term_props, vocab_context, user_context,
+                            self.secondary_translation_service, target_lang, logger=self.logger
+                        )
+                        for (concept, term_props, _, _), (labels, _) in zip(deferred, items)
+                    ]
+            if not self._run_pending_batch():
+                break
+        while True:
+            records = [dict(record) for *_, record in deferred]
+            for record, (labels, term_props), secondary_translations in zip(records, items, translations):
+                self._secondary_stage(record, labels, secondary_translations, term_props, vocab_context, user_context, target_lang)
+            if not self._run_pending_batch():
+                break
+
+        for (concept, _, prop_name, _), record in zip(deferred, records):
+            self._add_translation(concept_index.graph, journal, concept, prop_name, record)
+        deferred.clear()
+
+    def _run_pending_batch(self):
+        """
+        Sends the prompts recorded by a batch job service as one batch job.
+        Returns False if there was nothing to send.
+        """
+        has_pending = getattr(self.secondary_translation_service, "has_pending", None)
+        if has_pending is None or not has_pending():
+            return False
+        self.secondary_translation_service.run_batch()
+        return True
+
+    def _add_translation(self, graph, journal, concept, prop_name, record):
+        # Add the best translation as a new literal for the property in the target language.
+        self._add_triple(graph, (concept, SKOS_TERM_PROPERTIES[prop_name], Literal(record["translation"], lang=record["target_lang"])))
+        journal.append(record)
+        self._delta.flush(min_interval=self.DELTA_FLUSH_INTERVAL)
+        self._record_agreement(concept, prop_name, record)
+        if self.metrics is not None:
+            self.metrics.decisions.inc(target_lang=record["target_lang"], decision=record["decision"])
+            self._export_metrics()
+
+    def _add_triple(self, graph, triple):
+        graph.add(triple)
+        self._delta.add(triple)
+
+    def _export_metrics(self, final=False):
+        """
+        Writes the metrics file, during the run at most every METRICS_WRITE_INTERVAL seconds.
+        """
+        if self.metrics is not None and self.metrics_file:
+            self.metrics.write(self.metrics_file, min_interval=0 if final else self.METRICS_WRITE_INTERVAL)
+
+    def _record_agreement(self, concept, prop_name, record):
+        """
+        Tells the service scheduler which services had the chosen translation among their candidates.
+        """
+        sources = self._candidate_sources.pop((str(concept), prop_name, record["target_lang"]), None)
+        if not sources or not record["translation"]:
+            return
+        chosen = str(record["translation"]).lower()
+        for service, translations in sources.items():
+            self.service_scheduler.record_agreement(service, any(str(translation).lower() == chosen for translation in translations))
+
+    def _choose_secondary_translation(self, labels, primary_translations, secondary_translations, term_props, vocab_context, user_context, target_lang):
+        """
+        Chooses the best translation after the secondary translation strategy was applied.
+        Returns a tuple (best_translation, secondary_confidence, decision) where decision is
+        "secondary_matched_primary", "llm_rated" or "fallback" (primary confidence calculator over all candidates).
+        """
+        # Check if the most common translation of the possible secondary translations (each translated from a different language) is in primrary translations
+        if isinstance(secondary_translations, dict):
+            most_common_secondary_translation, _ = self.primary_confidence_calculator.calculate(secondary_translations)
+        else:
+            most_common_secondary_translation = secondary_translations
+
+        lower_most_common_secondary_translation = None
+        if most_common_secondary_translation: # guard against None
+            lower_most_common_secondary_translation = most_common_secondary_translation.lower()
+        # If most common secondary translation is in primary translations, use it as best_translation and set secondary_confidence to 1. Steps explained in the following
+
+        # Check every value in primary_translations (could be a str or list of str)
+        if lower_most_common_secondary_translation and any(
+            # Case 1: primary_translation is a string and matches our secondary (case-insensitive)
+            (isinstance(primary_translation, str) and primary_translation.lower() == lower_most_common_secondary_translation)
+            # Case 2: primary_translation is a list of strings, check each element
+            or (isinstance(primary_translation, list) and any(
+                isinstance(candidate, str) and candidate.lower() == lower_most_common_secondary_translation
+                for candidate in primary_translation
+            ))
+            for primary_translation in primary_translations.values()
+        ):
+            # most common secondary translation is in primary translations, so choose it as best_translation
+            best_translation = most_common_secondary_translation
+
+            # Choose confidence of 1
+            secondary_confidence = 1
+            decision = "secondary_matched_primary"
+
+
+        # If most common secondary translation is not in primary translations, use the secondary_confidence_calculator, but include the primary translations
+        else:
+            # use secondary confidence calculator (LLM based) to rate the translation
+            # Temporarily set max_retries to 0 because I only want to try this once (so no retries)
+            # with temporary_setattr(self.secondary_confidence_calculator, "max_retries", 0):
+            best_translation, secondary_confidence = self.secondary_confidence_calculator.calculate(labels, primary_translations, secondary_translations, term_props, vocab_context, user_context, target_lang, logger=self.logger)
+            decision = "llm_rated"
+        # use primary_conficence_calculator with primary translations if it fails
+        # (secondary_translations is None if the secondary translation failed as well)
+        if not best_translation or not secondary_confidence:
+            best_translation, secondary_confidence = self.primary_confidence_calculator.calculate(compile_translations_dict(primary_translations, secondary_translations or {}))
+            decision = "fallback"
+        return best_translation, secondary_confidence, decision
+
+    def _report_run_statistics(self):
+        """
+        Logs and prints the statistics of all services and calculators that provide a report() method
+        (e.g. cache wrappers). Wrapped services (service attribute of a wrapper) are reported as well.
+        """
+        lines = [f"Deduplication of labels saved {self._deduplicated_calls} primary translation calls"]
+        if self.primary_batch_size:
+            lines.append(f"Batching sent {self._batched_labels} labels to the primary services in {self._batch_requests} batch requests")
+        for service in self._request_latency.keys():
+            name = getattr(service, "service_name", service.__class__.__name__)
+            lines.append(f"Latency {name}: {self._request_latency.summary(service)}")
+            if self.hedge:
+                lines.append(f"Latency {name} waited for with hedging ({self.hedge} extra services): {self._hedged_latency.summary(service)}")
+        if self.early_stopping:
+            lines.append(f"Early stopping decided {self._early_stops[ConsensusTracker.ACCEPT]} properties as accepted and sent {self._early_stops[ConsensusTracker.REJECT]} straight to the secondary stage")
+        components = [*self.primary_translation_services, self.secondary_translation_service,
+                      self.primary_confidence_calculator, self.secondary_confidence_calculator, self.service_scheduler, self.usage_tracker]
+        for component in components:
+            while component is not None:
+                # Looked up on the class, getattr() would find the report() of the wrapped service twice
+                report = next((vars(cls)["report"] for cls in type(component).__mro__ if "report" in vars(cls)), None)
+                if report is not None:
+                    lines.extend(report(component))
+                component = getattr(component, "__dict__", {}).get("service")
+        for line in lines:
+            if self.logger:
+                self.logger.info(line)
+            print(line)
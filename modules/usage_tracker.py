@@ -0,0 +1,168 @@
+# usage_tracker.py
+import logging
+import threading
+from typing import Optional, Any
+from modules.secondary_translators.abstract_secondary_translator import SecondaryTranslationService
+from modules.utils import ServiceWrapper
+
+
+def _field(data, *names):
+    # SDK responses are objects, raw API responses (e.g. batch job results) are dicts
+    for name in names:
+        value = data.get(name) if isinstance(data, dict) else getattr(data, name, None)
+        if value is not None:
+            return value
+    return None
+
+
+def extract_usage(response) -> tuple[int, int] | None:
+    """
+    Returns (input tokens, output tokens) from the usage data of an LLM response, None if it has none.
+    Understands the OpenAI Responses API (usage.input_tokens/output_tokens), chat completions of OpenAI
+    compatible APIs like Mistral and DeepSeek (usage.prompt_tokens/completion_tokens), Anthropic
+    (usage.input_tokens/output_tokens plus prompt cache tokens), Gemini (usage_metadata) and Ollama
+    (prompt_eval_count/eval_count).
+    """
+    usage = _field(response, "usage", "usage_metadata", "usageMetadata")
+    if usage is None:
+        # Ollama reports the counts on the response itself
+        if _field(response, "prompt_eval_count", "eval_count") is None:
+            return None
+        usage = response
+    input_tokens = _field(usage, "input_tokens", "prompt_tokens", "prompt_token_count", "promptTokenCount", "prompt_eval_count") or 0
+    input_tokens += (_field(usage, "cache_creation_input_tokens") or 0) + (_field(usage, "cache_read_input_tokens") or 0)
+    output_tokens = _field(usage, "output_tokens", "completion_tokens", "candidates_token_count", "candidatesTokenCount", "eval_count") or 0
+    # Thinking tokens of Gemini are billed as output but not part of candidates_token_count
+    output_tokens += _field(usage, "thoughts_token_count", "thoughtsTokenCount") or 0
+    return int(input_tokens), int(output_tokens)
+
+
+class UsageTracker:
+    """
+    Counts the LLM calls of a run and the tokens and cost of their responses per service and model, and
+    enforces an optional budget of max_cost (in the currency of the price table) and max_calls.
+
+    prices maps a model name to (price per million input tokens, price per million output tokens).
+    Calls are started through acquire(): a call is refused once max_calls calls were started, or if the
+    cost so far plus the average cost of a call for each running call and the new one would exceed
+    max_cost. The first refusal marks the budget as exhausted for the rest of the run.
+    """
+    def __init__(self, prices: dict | None = None, max_cost: float | None = None, max_calls: int | None = None, metrics=None, logger=None):
+        self.prices = prices or {}
+        self.max_cost = max_cost
+        self.max_calls = max_calls
+        self.metrics = metrics
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+        # (service, model) -> [responses, input tokens, output tokens, cost]
+        self.usage: dict[tuple[str, str], list] = {}
+        self.cost = 0.0
+        self.calls = 0
+        self.refused = 0
+        self.exhausted = False
+        self._responses = 0
+        self._running = 0
+        self._unpriced = set()
+        self._lock = threading.Lock()
+
+    def price(self, model: str) -> tuple[float, float] | None:
+        return self.prices.get(model)
+
+    def record(self, service: str, model: str, input_tokens: int, output_tokens: int) -> float:
+        """
+        Adds the token usage of one response and returns its cost (0 if the model has no price).
+        """
+        price = self.price(model)
+        cost = (input_tokens * price[0] + output_tokens * price[1]) / 1_000_000 if price else 0.0
+        with self._lock:
+            if price is None and model not in self._unpriced:
+                self._unpriced.add(model)
+                self.logger.warning(f"No price configured for model {model}, its cost is counted as 0")
+            entry = self.usage.setdefault((service, model), [0, 0, 0, 0.0])
+            entry[0] += 1
+            entry[1] += input_tokens
+            entry[2] += output_tokens
+            entry[3] += cost
+            self.cost += cost
+            self._responses += 1
+        if self.metrics is not None:
+            self.metrics.llm_tokens.inc(input_tokens, service=service, model=model, direction="input")
+            self.metrics.llm_tokens.inc(output_tokens, service=service, model=model, direction="output")
+            self.metrics.llm_cost.inc(cost, service=service, model=model)
+        return cost
+
+    def record_response(self, service: str, model: str, response) -> None:
+        usage = extract_usage(response)
+        if usage is not None:
+            self.record(service, model, *usage)
+
+    def acquire(self) -> bool:
+        """
+        Returns True if another LLM call fits into the budget, every acquired call must be followed by release().
+        """
+        with self._lock:
+            if not self.exhausted:
+                average = self.cost / self._responses if self._responses else 0.0
+                if self.max_calls is not None and self.calls >= self.max_calls:
+                    self._exhaust(f"{self.calls} of max. {self.max_calls} LLM calls made")
+                elif self.max_cost is not None and (self.max_cost <= 0 or self.cost + (self._running + 1) * average > self.max_cost):
+                    self._exhaust(f"LLM cost {self.cost:.4f} of max. {self.max_cost:.4f} reached")
+            if self.exhausted:
+                self.refused += 1
+                return False
+            self.calls += 1
+            self._running += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self._running -= 1
+
+    def _exhaust(self, reason: str) -> None:
+        # Must be called with the lock held
+        self.exhausted = True
+        self.logger.warning(f"LLM budget exhausted ({reason}), the remaining concepts are decided by the primary services only")
+
+    def summary(self) -> str:
+        """
+        Returns the running total, e.g. "LLM cost 0.0123 (57 calls)".
+        """
+        return f"LLM cost {self.cost:.4f} ({self.calls} calls)"
+
+    def report(self) -> list[str]:
+        """
+        Returns the usage per service and model and the state of the budget as log lines.
+        """
+        lines = []
+        for (service, model), (responses, input_tokens, output_tokens, cost) in sorted(self.usage.items()):
+            lines.append(f"LLM usage {service} {model}: {responses} responses, {input_tokens} input tokens, {output_tokens} output tokens, cost {cost:.4f}")
+        budget = [f"max. {self.max_calls} calls" if self.max_calls is not None else None,
+                  f"max. cost {self.max_cost:.4f}" if self.max_cost is not None else None]
+        budget = ", ".join(limit for limit in budget if limit) or "no limit"
+        lines.append(f"{self.summary()}, budget {budget}"
+                     + (f", exhausted, {self.refused} calls refused" if self.exhausted else ""))
+        return lines
+
+
+class BudgetedSecondaryTranslationService(ServiceWrapper, SecondaryTranslationService):
+    """
+    Wraps a secondary translation service and only sends a call if it fits into the budget of a
+    UsageTracker, otherwise None is returned at once (like a failed call). The token usage itself is
+    recorded by the wrapped service (see SecondaryTranslationService._record_usage()).
+    """
+    def __init__(self, service, usage_tracker: UsageTracker, logger=None):
+        super().__init__(service, logger)
+        self.usage_tracker = usage_tracker
+
+    def _call(self, method, prompt: Any) -> Optional[str]:
+        if not self.usage_tracker.acquire():
+            return None
+        try:
+            return method(prompt)
+        finally:
+            self.usage_tracker.release()
+
+    def translate_with_context(self, prompt: Any) -> Optional[str]:
+        return self._call(self.service.translate_with_context, prompt)
+
+    def rate_translation(self, prompt: Any) -> Optional[str]:
+        return self._call(self.service.rate_translation, prompt)
@@ -1,4 +1,8 @@
 # utils.py
+import asyncio
+import contextvars
+import logging
+import weakref
 from contextlib import contextmanager
 
 # Function to temporarily change an attribute of a class instance
@@ -11,3 +15,72 @@ def temporary_setattr(obj, attr, new_value):
         yield
     finally:
         setattr(obj, attr, original_value)
+
+
+# State of the primary request that is tracked in the current context, see track_request()
+_request_state = contextvars.ContextVar("request_state", default=None)
+
+@contextmanager
+def track_request():
+    """
+    Yields a dict whose "sent" is False after the block if a service wrapper answered the request
+    without calling the service (open circuit breaker, cache hit), see mark_not_sent().
+    Threads started with asyncio.to_thread() in the block share the state.
+    """
+    state = {"sent": True}
+    token = _request_state.set(state)
+    try:
+        yield state
+    finally:
+        _request_state.reset(token)
+
+# Called by service wrappers that answer a request without calling the service
+def mark_not_sent():
+    state = _request_state.get()
+    if state is not None:
+        state["sent"] = False
+
+
+class ServiceWrapper:
+    """
+    Base class of the service wrappers (rate limiter, cache, circuit breaker, metrics, ...).
+    Attributes that the wrapper does not have are looked up on the wrapped service.
+    """
+    def __init__(self, service, logger=None):
+        self.service = service
+        # The logger of the module of the wrapper class
+        self.logger: logging.Logger = logger or logging.getLogger(type(self).__module__)
+        self.service_name = getattr(service, "service_name", service.__class__.__name__)
+
+    def __getattr__(self, name):
+        # Only called for attributes that are not found on the wrapper itself
+        service = self.__dict__.get("service")
+        if service is None:
+            raise AttributeError(name)
+        return getattr(service, name)
+
+
+class LoopLocal:
+    """
+    Holds one object per running asyncio event loop.
+    Async clients (httpx, openai, ...) keep connections that are bound to the loop they were
+    created in, so they must not be shared between loops.
+    e.g. self._async_client = LoopLocal(lambda: httpx.AsyncClient()); client = self._async_client.get()
+    """
+    def __init__(self, factory):
+        self._factory = factory
+        self._objects = weakref.WeakKeyDictionary()
+
+    def get(self):
+        loop = asyncio.get_running_loop()
+        if loop not in self._objects:
+            self._objects[loop] = self._factory()
+        return self._objects[loop]
+
+
+# Splits a list into consecutive chunks of at most size elements
+# e.g. list(chunked([1, 2, 3], 2)) == [[1, 2], [3]]
+def chunked(items, size):
+    size = max(1, size)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
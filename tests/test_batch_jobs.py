@@ -0,0 +1,202 @@
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import rdflib
+from rdflib import Graph
+
+from modules.translation_pipeline import TranslationPipeline
+from modules.secondary_translation_strategies import IndividualLabelStrategy, BatchLabelStrategy
+from modules.frequency_confidence_calculator import FrequencyConfidenceCalculator
+from modules.llm_confidence_calculator import LLMConfidenceCalculator
+from modules.llm_batch_jobs import BatchJobSecondaryTranslationService, OpenAIBatchClient, AnthropicBatchClient
+
+BASE_DIR = os.path.dirname(__file__)
+TEST_INPUT = os.path.join(BASE_DIR, 'test_data/test_tadirah_converted_small_noen.rdf')
+
+
+def answer(input_text):
+    """Answers translation prompts with '<first label>_batch' and rating prompts with a '_batch' candidate."""
+    if "coming from translation systems are" not in input_text:
+        match = re.search(r"^(?:Term to translate: |- )(.*)$", input_text, flags=re.MULTILINE)
+        return f"{match.group(1)}_batch"
+    candidates = input_text.split("coming from translation systems are: \n", 1)[1].split("\n\n", 1)[0].splitlines()
+    return f"{sorted(c for c in candidates if c.endswith('_batch'))[0]}; 0.9"
+
+
+class StandInBatchServer(BaseHTTPRequestHandler):
+    """
+    Mimics the upload/create/poll/download flow of the OpenAI Batch API and the Anthropic Message Batches API.
+    A batch is reported as in progress on the first poll and as finished on the second one.
+    Requests whose input contains one of the texts in errored get an error result.
+    """
+    files = {}
+    batches = {}
+    errored = ()
+
+    def _errored(self, input_text):
+        return any(text in input_text for text in self.errored)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, data):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_text(self, text):
+        body = text.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"])).decode("utf-8")
+        if self.path == "/v1/files":
+            # The multipart body contains the JSONL lines of the batch file
+            lines = [json.loads(line) for line in body.splitlines() if line.startswith('{"custom_id"')]
+            file_id = f"file-{len(self.files)}"
+            self.files[file_id] = lines
+            self._send_json({"id": file_id})
+        elif self.path == "/v1/batches":
+            requests = self.files[json.loads(body)["input_file_id"]]
+            results = [
+                {"custom_id": r["custom_id"], "response": None, "error": {"code": "server_error", "message": "Stand-in error"}}
+                if self._errored(r["body"]["messages"][1]["content"]) else
+                {"custom_id": r["custom_id"], "response": {"status_code": 200, "body": {"choices": [{"message": {"content": answer(r["body"]["messages"][1]["content"])}}]}}}
+                for r in requests
+            ]
+            batch_id = f"batch-{len(self.batches)}"
+            self.files[f"output-{batch_id}"] = results
+            self.batches[batch_id] = {"polls": 0, "size": len(requests)}
+            self._send_json({"id": batch_id})
+        elif self.path == "/v1/messages/batches":
+            requests = json.loads(body)["requests"]
+            results = [
+                {"custom_id": r["custom_id"], "result": {"type": "errored", "error": {"type": "api_error", "message": "Stand-in error"}}}
+                if self._errored(r["params"]["messages"][0]["content"]) else
+                {"custom_id": r["custom_id"], "result": {"type": "succeeded", "message": {"content": [{"type": "text", "text": answer(r["params"]["messages"][0]["content"])}]}}}
+                for r in requests
+            ]
+            batch_id = f"msgbatch-{len(self.batches)}"
+            self.files[f"output-{batch_id}"] = results
+            self.batches[batch_id] = {"polls": 0, "size": len(requests)}
+            self._send_json({"id": batch_id})
+        else:
+            self.send_error(404)
+
+    def do_GET(self):
+        host = f"http://{self.headers['Host']}"
+        if self.path.startswith("/v1/batches/"):
+            batch_id = self.path.rsplit("/", 1)[1]
+            self.batches[batch_id]["polls"] += 1
+            done = self.batches[batch_id]["polls"] > 1
+            self._send_json({"id": batch_id, "status": "completed" if done else "in_progress", "output_file_id": f"output-{batch_id}" if done else None})
+        elif self.path.startswith("/v1/messages/batches/") and self.path.endswith("/results"):
+            batch_id = self.path.split("/")[-2]
+            self._send_text("\n".join(json.dumps(line) for line in self.files[f"output-{batch_id}"]))
+        elif self.path.startswith("/v1/messages/batches/"):
+            batch_id = self.path.rsplit("/", 1)[1]
+            self.batches[batch_id]["polls"] += 1
+            done = self.batches[batch_id]["polls"] > 1
+            self._send_json({"id": batch_id, "processing_status": "ended" if done else "in_progress", "results_url": f"{host}{self.path}/results" if done else None})
+        elif self.path.startswith("/v1/files/") and self.path.endswith("/content"):
+            file_id = self.path.split("/")[-2]
+            self._send_text("\n".join(json.dumps(line) for line in self.files[file_id]))
+        else:
+            self.send_error(404)
+
+
+@pytest.fixture
+def stand_in_server():
+    StandInBatchServer.files = {}
+    StandInBatchServer.batches = {}
+    StandInBatchServer.errored = ()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInBatchServer)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+class DummyPrimaryTranslationService:
+    def translate(self, term: str, source_lang: str, target_lang: str) -> str:
+        return f"{term}_{target_lang}_dummy"
+
+
+class UnreachableSecondaryTranslationService:
+    """
+    Secondary service that must not be called directly in batch job mode.
+    """
+    def __init__(self, service_name):
+        self.service_name = service_name
+        self.model_name = "test-model"
+        self.temperature = 0
+
+    def translate_with_context(self, prompt):
+        raise AssertionError("The secondary service was called directly instead of through a batch job.")
+
+    rate_translation = translate_with_context
+
+
+@pytest.mark.parametrize("provider", ["openai", "anthropic"])
+def test_pipeline_with_batch_jobs(stand_in_server, provider, tmp_path):
+    """Low-confidence concepts are translated and rated by batch jobs before the graph is written."""
+    if provider == "openai":
+        client = OpenAIBatchClient("test-key", "test-model", 0, base_url=stand_in_server)
+    else:
+        client = AnthropicBatchClient("test-key", "test-model", 0, base_url=stand_in_server)
+    service = BatchJobSecondaryTranslationService(UnreachableSecondaryTranslationService(provider), client, poll_interval=0.01)
+    pipeline = TranslationPipeline(
+        [DummyPrimaryTranslationService()], service, IndividualLabelStrategy(),
+        primary_confidence_calculator=FrequencyConfidenceCalculator(),
+        secondary_confidence_calculator=LLMConfidenceCalculator(service, max_retries=1),
+        low_confidence_threshold=1.1,
+    )
+    output_file = tmp_path / "output.rdf"
+    pipeline.process_file(TEST_INPUT, "nl", "Digital Humanities", str(output_file))
+
+    graph = Graph()
+    graph.parse(str(output_file), format='xml')
+    dutch_labels = [str(label) for label in graph.objects(None, rdflib.SKOS.prefLabel) if label.language == "nl"]
+    assert len(dutch_labels) == 4
+    assert all(label.endswith("_batch") for label in dutch_labels)
+    # One batch job for the translation prompts and one for the rating prompts
+    assert len(StandInBatchServer.batches) == 2
+    assert service.failed == 0
+
+
+@pytest.mark.parametrize("provider", ["openai", "anthropic"])
+def test_pipeline_with_errored_batch_items(stand_in_server, provider, tmp_path):
+    """A concept whose translation and rating requests fail in the batch job gets the primary translation."""
+    StandInBatchServer.errored = ("Acquisizione",)
+    if provider == "openai":
+        client = OpenAIBatchClient("test-key", "test-model", 0, base_url=stand_in_server)
+    else:
+        client = AnthropicBatchClient("test-key", "test-model", 0, base_url=stand_in_server)
+    service = BatchJobSecondaryTranslationService(UnreachableSecondaryTranslationService(provider), client, poll_interval=0.01)
+    # BatchLabelStrategy answers with a single translation, None for the failed request
+    pipeline = TranslationPipeline(
+        [DummyPrimaryTranslationService()], service, BatchLabelStrategy(),
+        primary_confidence_calculator=FrequencyConfidenceCalculator(),
+        secondary_confidence_calculator=LLMConfidenceCalculator(service, max_retries=1),
+        low_confidence_threshold=1.1,
+    )
+    output_file = tmp_path / "output.rdf"
+    pipeline.process_file(TEST_INPUT, "nl", "Digital Humanities", str(output_file))
+
+    graph = Graph()
+    graph.parse(str(output_file), format='xml')
+    dutch_labels = sorted(str(label) for label in graph.objects(None, rdflib.SKOS.prefLabel) if label.language == "nl")
+    assert len(dutch_labels) == 4
+    assert [label for label in dutch_labels if not label.endswith("_batch")] == ["Captura_nl_dummy"]
+    assert service.failed == 2
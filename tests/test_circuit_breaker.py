@@ -0,0 +1,94 @@
+import time
+
+import pytest
+
+from modules.circuit_breaker import CircuitBreaker, CircuitBreakerPrimaryTranslationService
+from modules.rate_limiter import RateLimiter, RateLimitExceeded, RateLimitedPrimaryTranslationService
+
+
+class OutagePrimaryTranslationService:
+    """
+    Raises ConnectionError while down is True, and has no translation for the term "unknown".
+    """
+    def __init__(self):
+        self.service_name = "outage"
+        self.down = True
+        self.calls = 0
+
+    def translate(self, term, source_lang, target_lang):
+        self.calls += 1
+        if self.down:
+            raise ConnectionError("service unavailable")
+        return None if term == "unknown" else f"{term}_{target_lang}"
+
+
+def test_circuit_opens_and_recovers():
+    service = OutagePrimaryTranslationService()
+    breaker = CircuitBreaker("outage", failure_rate_threshold=0.5, window_size=4, min_calls=4, cooldown=0.05, half_open_probes=2)
+    wrapped = CircuitBreakerPrimaryTranslationService(service, breaker)
+
+    for _ in range(4):
+        with pytest.raises(ConnectionError):
+            wrapped.translate("term", "en", "de")
+    for _ in range(6):
+        assert wrapped.translate("term", "en", "de") is None
+    # The circuit opened after 4 failed calls, the other calls were skipped
+    assert breaker.state == CircuitBreaker.OPEN
+    assert service.calls == 4
+    assert breaker.skipped == 6
+
+    # A failed probe opens the circuit again
+    time.sleep(0.06)
+    with pytest.raises(ConnectionError):
+        wrapped.translate("term", "en", "de")
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.times_opened == 2
+
+    service.down = False
+    time.sleep(0.06)
+    assert wrapped.translate("term", "en", "de") == "term_de"
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert wrapped.translate("term", "en", "de") == "term_de"
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert "opened 2 times" in wrapped.report()[0]
+
+
+def test_slow_calls_count_as_failures():
+    breaker = CircuitBreaker("slow", failure_rate_threshold=0.5, window_size=4, min_calls=2, slow_call_seconds=0.5)
+    breaker.record(True, 0.1)
+    breaker.record(True, 1.0)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.slow_calls == 1
+    assert not breaker.allow()
+
+
+def test_no_translation_is_not_a_failure():
+    service = OutagePrimaryTranslationService()
+    service.down = False
+    breaker = CircuitBreaker("outage", window_size=4, min_calls=4)
+    wrapped = CircuitBreakerPrimaryTranslationService(service, breaker)
+    for _ in range(10):
+        assert wrapped.translate("unknown", "en", "de") is None
+    assert wrapped.translate_batch(["unknown", "unknown"], "en", "de") == [None, None]
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert service.calls == 12
+    assert breaker.failures == 0
+
+
+class RateLimitedService:
+    def __init__(self):
+        self.service_name = "limited"
+
+    def translate(self, term, source_lang, target_lang):
+        raise RateLimitExceeded(self.service_name)
+
+
+def test_rate_limit_give_ups_are_failures():
+    limited = RateLimitedPrimaryTranslationService(RateLimitedService(), RateLimiter(), max_retries=0, raise_on_give_up=True)
+    breaker = CircuitBreaker("limited", window_size=2, min_calls=2)
+    wrapped = CircuitBreakerPrimaryTranslationService(limited, breaker)
+    assert wrapped.translate("term", "en", "de") is None
+    assert wrapped.translate("term", "en", "de") is None
+    assert limited.given_up == 2
+    assert breaker.failures == 2
+    assert breaker.state == CircuitBreaker.OPEN
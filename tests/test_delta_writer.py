@@ -0,0 +1,67 @@
+import os
+
+import rdflib
+
+from modules.delta_writer import DeltaWriter, can_merge, merge_delta
+from modules.skos_handler import load_graph
+
+BASE_DIR = os.path.dirname(__file__)
+TEST_INPUT = os.path.join(BASE_DIR, 'test_data/test_tadirah_converted_small_noen.rdf')
+ANALYZING = rdflib.URIRef("https://vocabs.dariah.eu/tadirah/analyzing")
+# Valid RDF/XML without an rdf:RDF element
+TYPED_NODE_ROOT = """<?xml version="1.0" encoding="utf-8"?>
+<skos:Concept xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns:skos="http://www.w3.org/2004/02/skos/core#" rdf:about="https://example.org/house">
+  <skos:prefLabel xml:lang="de">Haus</skos:prefLabel>
+</skos:Concept>
+"""
+
+
+def test_flushed_delta_is_readable(tmp_path):
+    delta = DeltaWriter(str(tmp_path / "output.rdf.delta.nt"))
+    delta.open()
+    first = (ANALYZING, rdflib.SKOS.prefLabel, rdflib.Literal('Analyse <"&">\nzwei Zeilen', lang="nl"))
+    second = (ANALYZING, rdflib.SKOS.note, rdflib.Literal("1", datatype=rdflib.XSD.integer))
+    delta.add(first)
+    delta.flush()
+    delta.add(second)
+    # Not flushed yet, the file holds the complete lines up to the last flush
+    delta.flush(min_interval=3600)
+    assert set(rdflib.Graph().parse(delta.path, format="nt")) == {first}
+    delta.close()
+    assert set(rdflib.Graph().parse(delta.path, format="nt")) == {first, second}
+    assert not delta.has_blank_nodes
+    delta.remove()
+    assert not os.path.exists(delta.path)
+
+
+def test_merge_delta(tmp_path):
+    added = [
+        (ANALYZING, rdflib.SKOS.prefLabel, rdflib.Literal('Analyse <"&">', lang="nl")),
+        (ANALYZING, rdflib.SKOS.prefLabel, rdflib.Literal("Analyse", lang="fr")),
+        (rdflib.URIRef("https://vocabs.dariah.eu/tadirah/capturing"), rdflib.SKOS.prefLabel, rdflib.Literal("Erfassen", lang="de")),
+    ]
+    delta = DeltaWriter(str(tmp_path / "delta.nt"))
+    delta.open()
+    for triple in added:
+        delta.add(triple)
+    delta.close()
+    graph, _ = load_graph(TEST_INPUT)
+    expected = set(graph) | set(added)
+
+    merge_delta(TEST_INPUT, "xml", delta.path, str(tmp_path / "output.rdf"))
+    assert set(rdflib.Graph().parse(str(tmp_path / "output.rdf"), format="xml")) == expected
+    for fileformat, suffix in (("nt", "nt"), ("turtle", "ttl")):
+        input_file = tmp_path / f"input.{suffix}"
+        graph.serialize(str(input_file), format=fileformat, encoding="utf-8")
+        # The output file can be the input file
+        merge_delta(str(input_file), fileformat, delta.path, str(input_file))
+        assert set(rdflib.Graph().parse(str(input_file), format=fileformat)) == expected
+
+
+def test_can_merge(tmp_path):
+    typed_root = tmp_path / "concept.rdf"
+    typed_root.write_text(TYPED_NODE_ROOT, encoding="utf-8")
+    assert can_merge(TEST_INPUT, "xml")
+    assert not can_merge(str(typed_root), "xml")
+    assert can_merge(str(typed_root), "turtle")
+    assert not can_merge(str(typed_root), "json-ld")
@@ -0,0 +1,52 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from modules.http_transport import shared_session, close_shared_clients
+from modules.primary_translators.argos_translator import ArgosTranslationService
+
+
+class KeepAliveTranslateServer(BaseHTTPRequestHandler):
+    """
+    LibreTranslate stand-in that records the client port of every request.
+    """
+    protocol_version = "HTTP/1.1"
+    client_ports = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.client_ports.append(self.client_address[1])
+        body = b'{"translatedText": "Hallo"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def translate_server():
+    KeepAliveTranslateServer.client_ports = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveTranslateServer)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    close_shared_clients()
+    server.shutdown()
+    server.server_close()
+
+
+def test_connections_are_reused(translate_server, monkeypatch):
+    monkeypatch.setenv("ARGOS_BASE_URL", translate_server)
+    first, second = ArgosTranslationService(), ArgosTranslationService()
+    for _ in range(3):
+        assert first.translate("hello", "en", "de") == "Hallo"
+        assert second.translate("hello", "en", "de") == "Hallo"
+    # All requests of both service instances share one kept-alive connection
+    assert len(KeepAliveTranslateServer.client_ports) == 6
+    assert len(set(KeepAliveTranslateServer.client_ports)) == 1
+    assert shared_session() is shared_session()
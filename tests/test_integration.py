@@ -9,6 +9,8 @@ from modules.translation_pipeline import TranslationPipeline
 from modules.secondary_translation_strategies import IndividualLabelStrategy
 from modules.frequency_confidence_calculator import FrequencyConfidenceCalculator
 from modules.llm_confidence_calculator import LLMConfidenceCalculator
+from modules.primary_translators.abstract_primary_translator import PrimaryTranslationService
+from modules.service_scheduler import AdaptiveServiceScheduler
 
 # Use dummy translation services for testing
 
@@ -126,3 +128,515 @@ def test_translation_pipeline(test_input, test_output_expected):
         # Clean up the generated output file.
         if os.path.exists(actual_test_output):
             os.remove(actual_test_output)
+
+
+@pytest.mark.parametrize("primary_batch_size", [0, 4])
+@pytest.mark.parametrize("primary_concurrency", ["sequential", "thread", "async"])
+def test_translation_pipeline_concurrency_and_batches(tmp_path, primary_concurrency, primary_batch_size):
+    """Concurrent and batched primary requests give the same output as the baseline integration test."""
+    test_input, test_output_expected = test_data[0]
+    output_file = str(tmp_path / "output.rdf")
+    secondary_translation_service = DummySecondaryTranslationService()
+    pipeline = TranslationPipeline(
+        [DummyPrimaryTranslationService()], secondary_translation_service, IndividualLabelStrategy(),
+        primary_confidence_calculator=FrequencyConfidenceCalculator(),
+        secondary_confidence_calculator=LLMConfidenceCalculator(secondary_translation_service, max_retries=0),
+        low_confidence_threshold=0.5,
+        min_primary_translations=3,
+        primary_concurrency=primary_concurrency,
+        primary_batch_size=primary_batch_size,
+    )
+    pipeline.process_file(test_input, "en", "Digital Humanities", output_file)
+
+    expected_graph = Graph()
+    actual_graph = Graph()
+    expected_graph.parse(test_output_expected, format='xml')
+    actual_graph.parse(output_file, format='xml')
+    assert graphs_are_equal(expected_graph, actual_graph)
+
+
+class SlowPrimaryTranslationService:
+    """
+    Dummy primary service that answers with a delay and counts its calls.
+    """
+    def __init__(self, name, delay, result=True):
+        self.service_name = name
+        self.delay = delay
+        self.result = result
+        self.calls = 0
+
+    def translate(self, term: str, source_lang: str, target_lang: str):
+        import time
+        self.calls += 1
+        time.sleep(self.delay)
+        return f"{term}_{self.service_name}" if self.result else None
+
+
+@pytest.mark.parametrize("primary_concurrency", ["sequential", "thread", "async"])
+def test_primary_fanout_keeps_order_and_early_exit(primary_concurrency):
+    """Concurrent fan-out must return the same candidates as the sequential loop and call no extra services."""
+    services = [
+        SlowPrimaryTranslationService("slow", 0.05),
+        SlowPrimaryTranslationService("failing", 0.0, result=False),
+        SlowPrimaryTranslationService("fast", 0.0),
+        SlowPrimaryTranslationService("unused", 0.0),
+    ]
+    pipeline = TranslationPipeline(
+        services, DummySecondaryTranslationService(), IndividualLabelStrategy(),
+        primary_confidence_calculator=FrequencyConfidenceCalculator(),
+        secondary_confidence_calculator=None,
+        min_primary_translations=4,
+        primary_concurrency=primary_concurrency,
+    )
+    lang_dict = {"de": ["Haus"], "fr": ["maison"]}
+    with pipeline._primary_executor():
+        primary_translations, total_candidates = pipeline._collect_primary_translations(lang_dict, "prefLabel", "en")
+
+    assert total_candidates == 4
+    assert primary_translations == {"de": ["Haus_slow", "Haus_fast"], "fr": ["maison_slow", "maison_fast"]}
+    assert [service.calls for service in services] == [2, 2, 2, 0]
+
+
+@pytest.mark.parametrize("primary_concurrency", ["thread", "async"])
+def test_hedged_primary_requests(primary_concurrency):
+    """With hedging, the first answers are used and a slow service does not hold up the concept."""
+    import time
+    services = [
+        SlowPrimaryTranslationService("slow", 0.5),
+        SlowPrimaryTranslationService("first", 0.0),
+        SlowPrimaryTranslationService("second", 0.01),
+        SlowPrimaryTranslationService("unused", 0.0),
+    ]
+    pipeline = TranslationPipeline(
+        services, DummySecondaryTranslationService(), IndividualLabelStrategy(),
+        primary_confidence_calculator=FrequencyConfidenceCalculator(),
+        secondary_confidence_calculator=None,
+        min_primary_translations=2,
+        primary_concurrency=primary_concurrency,
+        hedge=1,
+    )
+    with pipeline._primary_executor():
+        started = time.monotonic()
+        primary_translations, total_candidates = pipeline._collect_primary_translations({"de": ["Haus"]}, "prefLabel", "en")
+        elapsed = time.monotonic() - started
+
+    assert elapsed < 0.4
+    assert total_candidates == 2
+    assert sorted(primary_translations["de"]) == ["Haus_first", "Haus_second"]
+    # min_primary_translations + hedge services were asked
+    assert [service.calls for service in services] == [1, 1, 1, 0]
+    assert pipeline._hedged_latency.count(services[0]) == 0
+    assert pipeline._hedged_latency.count(services[1]) == 1
+
+
+def test_label_deduplication_across_concepts():
+    """Labels shared by several concepts are sent to each primary service only once."""
+    services = [SlowPrimaryTranslationService("first", 0.0), SlowPrimaryTranslationService("second", 0.0)]
+    pipeline = TranslationPipeline(
+        services, DummySecondaryTranslationService(), IndividualLabelStrategy(),
+        primary_confidence_calculator=FrequencyConfidenceCalculator(),
+        secondary_confidence_calculator=None,
+        min_primary_translations=2,
+    )
+    term_properties = {
+        "concept1": {"prefLabel": {"de": ["Haus"], "fr": ["maison"]}},
+        "concept2": {"prefLabel": {"de": ["Haus"]}},
+        "concept3": {"prefLabel": {"de": ["Haus"], "en": ["house"]}},
+    }
+    pipeline._plan_label_requests(term_properties, "en")
+    results = [pipeline._collect_primary_translations(props["prefLabel"], "prefLabel", "en") for props in term_properties.values()]
+
+    assert results[1] == ({"de": ["Haus_first", "Haus_second"]}, 2)
+    # concept3 already has an English label and is not part of the plan
+    assert pipeline._shared_labels == {("Haus", "de")}
+    assert [service.calls for service in services] == [3, 1]
+    assert pipeline._deduplicated_calls == 2
+
+
+class AbortingPrimaryTranslationService(DummyPrimaryTranslationService):
+    """
+    Dummy primary service that simulates an aborted run after a number of calls.
+    """
+    def __init__(self, abort_after=None):
+        self.calls = 0
+        self.abort_after = abort_after
+
+    def translate(self, term: str, source_lang: str, target_lang: str) -> str:
+        if self.abort_after is not None and self.calls >= self.abort_after:
+            raise KeyboardInterrupt
+        self.calls += 1
+        return super().translate(term, source_lang, target_lang)
+
+
+def test_resume_from_journal(tmp_path):
+    """An aborted run can be resumed from its journal and produces the same output as an uninterrupted run."""
+    test_input, test_output_expected = test_data[0]
+    output_file = str(tmp_path / "output.rdf")
+    journal_file = f"{output_file}.journal.jsonl"
+
+    def make_pipeline(service):
+        secondary_translation_service = DummySecondaryTranslationService()
+        return TranslationPipeline(
+            [service], secondary_translation_service, IndividualLabelStrategy(),
+            primary_confidence_calculator=FrequencyConfidenceCalculator(),
+            secondary_confidence_calculator=LLMConfidenceCalculator(secondary_translation_service, max_retries=0),
+        )
+
+    with pytest.raises(KeyboardInterrupt):
+        make_pipeline(AbortingPrimaryTranslationService(abort_after=10)).process_file(test_input, "en", "Digital Humanities", output_file)
+    assert not os.path.exists(output_file)
+    with open(journal_file, encoding="utf-8") as f:
+        journaled = len(f.readlines())
+    assert journaled > 0
+
+    service = AbortingPrimaryTranslationService()
+    make_pipeline(service).process_file(test_input, "en", "Digital Humanities", output_file, resume=True)
+
+    expected_graph = Graph()
+    actual_graph = Graph()
+    expected_graph.parse(test_output_expected, format='xml')
+    actual_graph.parse(output_file, format='xml')
+    assert graphs_are_equal(expected_graph, actual_graph)
+    # The journal is removed after the output was written
+    assert not os.path.exists(journal_file)
+
+    # An uninterrupted run needs more calls than the resumed part
+    full_run_service = AbortingPrimaryTranslationService()
+    make_pipeline(full_run_service).process_file(test_input, "en", "Digital Humanities", str(tmp_path / "full.rdf"))
+    assert service.calls < full_run_service.calls
+
+
+def test_adaptive_service_order(tmp_path):
+    """After measuring every service once, the fast service is asked first and the slow one is not needed anymore."""
+    test_input, _ = test_data[0]
+
+    def run(scheduler):
+        services = [SlowPrimaryTranslationService("slow", 0.02), SlowPrimaryTranslationService("fast", 0.0)]
+        pipeline = TranslationPipeline(
+            services, DummySecondaryTranslationService(), IndividualLabelStrategy(),
+            primary_confidence_calculator=FrequencyConfidenceCalculator(),
+            secondary_confidence_calculator=None,
+            low_confidence_threshold=0,
+            min_primary_translations=1,
+            service_scheduler=scheduler,
+        )
+        pipeline.process_file(test_input, "nl", "Digital Humanities", str(tmp_path / "output.rdf"))
+        return services
+
+    slow, fast = run(None)
+    assert fast.calls == 0
+    labels = slow.calls
+
+    scheduler = AdaptiveServiceScheduler(warmup=1)
+    slow, fast = run(scheduler)
+    # Only the first concept is translated by the slow service (given order), the second one measures the fast service
+    assert slow.calls + fast.calls == labels
+    assert 0 < slow.calls < fast.calls
+    assert scheduler.order([slow, fast]) == [fast, slow]
+    # The fast service provided the chosen translation of the other three concepts
+    assert scheduler.agreement_rate(fast) == (3 + 1) / (3 + 2)
+
+
+class BrokenPrimaryTranslationService(SlowPrimaryTranslationService):
+    """
+    Dummy primary service that fails after a delay.
+    """
+    def translate(self, term: str, source_lang: str, target_lang: str):
+        super().translate(term, source_lang, target_lang)
+        raise ConnectionError("service unavailable")
+
+
+def test_open_circuit_breaker_is_not_promoted():
+    """Calls skipped by an open circuit breaker do not make the service look fast to the scheduler."""
+    from modules.circuit_breaker import CircuitBreaker, CircuitBreakerPrimaryTranslationService
+
+    breaker = CircuitBreaker("broken", window_size=2, min_calls=2, cooldown=60)
+    broken = CircuitBreakerPrimaryTranslationService(BrokenPrimaryTranslationService("broken", 0.02), breaker)
+    working = SlowPrimaryTranslationService("working", 0.005)
+    scheduler = AdaptiveServiceScheduler(warmup=2)
+    pipeline = TranslationPipeline(
+        [broken, working], DummySecondaryTranslationService(), IndividualLabelStrategy(),
+        primary_confidence_calculator=FrequencyConfidenceCalculator(),
+        secondary_confidence_calculator=None,
+        service_scheduler=scheduler,
+    )
+
+    for _ in range(2):
+        pipeline._timed(working, working.translate, "Haus", "de", "en")
+        with pytest.raises(ConnectionError):
+            pipeline._timed(broken, broken.translate, "Haus", "de", "en")
+    assert breaker.state == CircuitBreaker.OPEN
+    # The skipped calls return at once
+    for _ in range(20):
+        assert pipeline._timed(broken, broken.translate, "Haus", "de", "en") is None
+    assert breaker.skipped == 20
+    assert scheduler.order([broken, working]) == [working, broken]
+
+
+class ConstantPrimaryTranslationService(SlowPrimaryTranslationService):
+    """
+    Dummy primary service that answers every term with the same text.
+    """
+    def __init__(self, text):
+        super().__init__(text, 0.0)
+
+    def translate(self, term: str, source_lang: str, target_lang: str):
+        self.calls += 1
+        return self.service_name
+
+
+@pytest.mark.parametrize("primary_batch_size", [0, 2])
+@pytest.mark.parametrize("texts, threshold, expected_calls, expected_translation", [
+    # Three identical of five candidates: at least 3/5 >= 0.5 whatever the last two services answer
+    (["Haus", "haus", "Haus", "Gebäude", "Heim"], 0.5, [1, 1, 1, 0, 0], "Haus"),
+    # After two different candidates at most 4/5 < 0.9 is possible
+    (["Haus", "Gebäude", "Haus", "Haus", "Haus"], 0.9, [1, 1, 0, 0, 0], None),
+    # Undecided until the end
+    (["Haus", "Gebäude", "Haus", "Heim", "Haus"], 0.6, [1, 1, 1, 1, 1], "Haus"),
+])
+def test_early_stopping(texts, threshold, expected_calls, expected_translation, primary_batch_size):
+    """The primary services are only asked until the consensus decides the outcome."""
+    services = [ConstantPrimaryTranslationService(text) for text in texts]
+    pipeline = TranslationPipeline(
+        services, DummySecondaryTranslationService(), IndividualLabelStrategy(),
+        primary_confidence_calculator=FrequencyConfidenceCalculator(),
+        secondary_confidence_calculator=None,
+        low_confidence_threshold=threshold,
+        min_primary_translations=5,
+        primary_batch_size=primary_batch_size,
+        early_stopping=True,
+    )
+    term_props = {"prefLabel": {"en": ["house"]}}
+    primary = None
+    if primary_batch_size:
+        [primary] = pipeline._collect_primary_translations_batch([(term_props["prefLabel"], "prefLabel")], "de")
+    record = pipeline._primary_stage("concept", term_props, "prefLabel", "de", primary)
+
+    assert [service.calls for service in services] == expected_calls
+    assert record["translation"] == expected_translation
+    assert pipeline._needs_secondary(record) == (expected_translation is None)
+
+
+def test_multiple_target_languages(tmp_path):
+    """Translating into several languages in one run adds the same labels as one run per language."""
+    test_input, _ = test_data[0]
+
+    def run(target_lang, output_file):
+        secondary_translation_service = DummySecondaryTranslationService()
+        pipeline = TranslationPipeline(
+            [DummyPrimaryTranslationService()], secondary_translation_service, IndividualLabelStrategy(),
+            primary_confidence_calculator=FrequencyConfidenceCalculator(),
+            secondary_confidence_calculator=LLMConfidenceCalculator(secondary_translation_service, max_retries=0),
+        )
+        pipeline.process_file(test_input, target_lang, "Digital Humanities", str(output_file))
+        graph = Graph()
+        graph.parse(str(output_file), format='xml')
+        return graph
+
+    input_graph = Graph()
+    input_graph.parse(test_input, format='xml')
+    combined = run(["en", "nl"], tmp_path / "combined.rdf")
+    added_en = run("en", tmp_path / "en.rdf") - input_graph
+    added_nl = run("nl", tmp_path / "nl.rdf") - input_graph
+
+    assert len(added_en) > 0 and len(added_nl) > 0
+    assert graphs_are_equal(combined - input_graph, added_en + added_nl)
+
+
+class BatchingPrimaryTranslationService(PrimaryTranslationService):
+    """
+    Dummy primary service with native batching that counts its requests.
+    """
+    max_batch_size = 3
+
+    def __init__(self, name, failing_langs=()):
+        self.service_name = name
+        self.failing_langs = failing_langs
+        self.requests = 0
+
+    def translate(self, term: str, source_lang: str, target_lang: str):
+        return self.translate_batch([term], source_lang, target_lang)[0]
+
+    def translate_batch(self, terms, source_lang, target_lang):
+        def translate_chunk(chunk, source_lang, target_lang):
+            self.requests += 1
+            return [None if source_lang in self.failing_langs else f"{term}_{self.service_name}" for term in chunk]
+        return self._translate_chunks(translate_chunk, terms, source_lang, target_lang)
+
+
+def test_primary_batches_match_concept_by_concept():
+    """Batched primary translation gives the same candidates as the concept-by-concept mode with fewer requests."""
+    lang_dicts = [
+        {"de": ["Haus"], "fr": ["maison"]},
+        {"de": ["Baum"]},
+        {"de": ["Haus"], "es": ["casa"]},
+        {"de": ["Auto"], "fr": ["voiture"]},
+    ]
+
+    def make_pipeline(primary_batch_size):
+        services = [BatchingPrimaryTranslationService("first", failing_langs=("fr",)), BatchingPrimaryTranslationService("second"), BatchingPrimaryTranslationService("third")]
+        return services, TranslationPipeline(
+            services, DummySecondaryTranslationService(), IndividualLabelStrategy(),
+            primary_confidence_calculator=FrequencyConfidenceCalculator(),
+            secondary_confidence_calculator=None,
+            min_primary_translations=2,
+            primary_batch_size=primary_batch_size,
+        )
+
+    single_services, single = make_pipeline(0)
+    expected = [single._collect_primary_translations(lang_dict, "prefLabel", "en") for lang_dict in lang_dicts]
+    batch_services, batched = make_pipeline(len(lang_dicts))
+    results = batched._collect_primary_translations_batch([(lang_dict, "prefLabel") for lang_dict in lang_dicts], "en")
+
+    assert results == expected
+    # first: one request each for de (3 unique labels), fr and es; second: de and fr of the concepts with fewer than 2 candidates
+    assert [service.requests for service in batch_services] == [3, 2, 0]
+    assert sum(service.requests for service in batch_services) < sum(service.requests for service in single_services)
+
+
+class JSONSecondaryTranslationService(DummySecondaryTranslationService):
+    """
+    Dummy LLM that answers multi concept prompts with a JSON array and leaves out the items of skipped labels.
+    """
+    def __init__(self, skip=()):
+        super().__init__()
+        self.skip = skip
+        self.prompt_sizes = []
+
+    def translate_with_context(self, prompt: dict) -> str:
+        import json
+        import re
+        items = re.split(r"^Item \d+:\n", prompt["input"], flags=re.MULTILINE)[1:]
+        self.prompt_sizes.append(len(items))
+        answer = []
+        for number, item in enumerate(items, start=1):
+            label = item.splitlines()[0][2:].rsplit(" (", 1)[0]
+            if label not in self.skip:
+                answer.append({"id": number, "translation": f"{label}_json"})
+        return "```json\n" + json.dumps(answer) + "\n```"
+
+
+def test_multi_concept_strategy_resplits_failed_items():
+    """Items without valid answer are sent again in smaller prompts until they are on their own."""
+    from rdflib import Literal
+    from modules.secondary_translation_strategies import MultiConceptStrategy
+
+    service = JSONSecondaryTranslationService(skip=("Baum",))
+    strategy = MultiConceptStrategy(token_budget=10000, max_concepts=10)
+    items = [([Literal(label, lang="de")], {}) for label in ["Haus", "Baum", "Auto", "Tisch"]]
+    translations = strategy.translate_many(items, "Everyday things", "", service, "en")
+
+    assert translations == ["Haus_json", None, "Auto_json", "Tisch_json"]
+    # one prompt for all items, then the failed item alone
+    assert service.prompt_sizes == [4, 1]
+
+    # A small token budget splits the items into several prompts
+    service = JSONSecondaryTranslationService()
+    strategy = MultiConceptStrategy(token_budget=strategy._estimate_tokens(str(strategy._build_prompt([], [], "", "English"))) + 40)
+    assert strategy.translate_many(items, "Everyday things", "", service, "en") == ["Haus_json", "Baum_json", "Auto_json", "Tisch_json"]
+    assert len(service.prompt_sizes) > 1 and sum(service.prompt_sizes) == 4
+
+
+def test_multi_concept_strategy_in_pipeline(tmp_path):
+    """The pipeline collects low-confidence concepts for strategies with translate_many()."""
+    from modules.secondary_translation_strategies import MultiConceptStrategy
+
+    test_input, _ = test_data[0]
+    output_file = tmp_path / "output.rdf"
+    service = JSONSecondaryTranslationService()
+    pipeline = TranslationPipeline(
+        [DummyPrimaryTranslationService()], service, MultiConceptStrategy(max_concepts=3),
+        primary_confidence_calculator=FrequencyConfidenceCalculator(),
+        secondary_confidence_calculator=LLMConfidenceCalculator(DummySecondaryTranslationService(), max_retries=0),
+        low_confidence_threshold=1.1,
+    )
+    pipeline.process_file(test_input, "nl", "Digital Humanities", str(output_file))
+
+    graph = Graph()
+    graph.parse(str(output_file), format='xml')
+    dutch_labels = [label for label in graph.objects(None, rdflib.SKOS.prefLabel) if label.language == "nl"]
+    assert len(dutch_labels) == 4
+    # 4 concepts in prompts of at most 3 items
+    assert service.prompt_sizes == [3, 1]
+
+
+def test_multi_concept_strategy_and_rating_fail(tmp_path):
+    """Without secondary translation and rating, the primary translations are used."""
+    from modules.secondary_translation_strategies import MultiConceptStrategy
+
+    test_input, _ = test_data[0]
+    output_file = tmp_path / "output.rdf"
+    class EmptyJSONSecondaryTranslationService(JSONSecondaryTranslationService):
+        # Leaves out every item, the rating prompts are not answered in the rating format either
+        def translate_with_context(self, prompt: dict) -> str:
+            super().translate_with_context(prompt)
+            return "```json\n[]\n```"
+
+    service = EmptyJSONSecondaryTranslationService()
+    pipeline = TranslationPipeline(
+        [DummyPrimaryTranslationService()], service, MultiConceptStrategy(max_concepts=3),
+        primary_confidence_calculator=FrequencyConfidenceCalculator(),
+        secondary_confidence_calculator=LLMConfidenceCalculator(service, max_retries=0),
+        low_confidence_threshold=1.1,
+    )
+    pipeline.process_file(test_input, "nl", "Digital Humanities", str(output_file))
+
+    graph = Graph()
+    graph.parse(str(output_file), format='xml')
+    dutch_labels = [label for label in graph.objects(None, rdflib.SKOS.prefLabel) if label.language == "nl"]
+    assert len(dutch_labels) == 4
+    assert all(str(label).endswith("_nl_dummy") for label in dutch_labels)
+
+
+def test_streaming_ingestion(tmp_path):
+    """Streaming ingestion reads the concepts without a graph and writes the same output."""
+    test_input, test_output_expected = test_data[0]
+    output_file = str(tmp_path / "streamed.rdf")
+    secondary_translation_service = DummySecondaryTranslationService()
+    pipeline = TranslationPipeline(
+        [DummyPrimaryTranslationService()], secondary_translation_service, IndividualLabelStrategy(),
+        primary_confidence_calculator=FrequencyConfidenceCalculator(),
+        secondary_confidence_calculator=LLMConfidenceCalculator(secondary_translation_service, max_retries=0),
+        low_confidence_threshold=0.5,
+        min_primary_translations=3,
+        streaming=True,
+    )
+    pipeline.process_file(test_input, "en", "Digital Humanities", output_file)
+
+    expected_graph = Graph()
+    actual_graph = Graph()
+    expected_graph.parse(test_output_expected, format='xml')
+    actual_graph.parse(output_file, format='xml')
+    assert graphs_are_equal(expected_graph, actual_graph)
+
+
+def test_rdfxml_without_rdf_root(tmp_path):
+    """RDF/XML with a typed node as root element is serialized from the graph, streaming rejects it before the run."""
+    test_input = tmp_path / "concept.rdf"
+    test_input.write_text("""<?xml version="1.0" encoding="utf-8"?>
+<skos:Concept xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns:skos="http://www.w3.org/2004/02/skos/core#" rdf:about="https://example.org/house">
+  <skos:prefLabel xml:lang="de">Haus</skos:prefLabel>
+</skos:Concept>
+""", encoding="utf-8")
+
+    def make_pipeline(service, streaming):
+        secondary_translation_service = DummySecondaryTranslationService()
+        return TranslationPipeline(
+            [service], secondary_translation_service, IndividualLabelStrategy(),
+            primary_confidence_calculator=FrequencyConfidenceCalculator(),
+            secondary_confidence_calculator=LLMConfidenceCalculator(secondary_translation_service, max_retries=0),
+            streaming=streaming,
+        )
+
+    output_file = tmp_path / "output.rdf"
+    make_pipeline(DummyPrimaryTranslationService(), False).process_file(str(test_input), "en", "Digital Humanities", str(output_file))
+    graph = Graph()
+    graph.parse(str(output_file), format='xml')
+    labels = set(graph.objects(rdflib.URIRef("https://example.org/house"), rdflib.SKOS.prefLabel))
+    assert rdflib.Literal("Haus", lang="de") in labels
+    assert any(label.language == "en" for label in labels)
+
+    service = SlowPrimaryTranslationService("unused", 0.0)
+    with pytest.raises(ValueError, match="rdf:RDF root element"):
+        make_pipeline(service, True).process_file(str(test_input), "en", "Digital Humanities", str(tmp_path / "streamed.rdf"))
+    assert service.calls == 0
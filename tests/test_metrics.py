@@ -0,0 +1,72 @@
+import os
+import urllib.request
+
+from modules.translation_pipeline import TranslationPipeline
+from modules.secondary_translation_strategies import IndividualLabelStrategy
+from modules.frequency_confidence_calculator import FrequencyConfidenceCalculator
+from modules.llm_confidence_calculator import LLMConfidenceCalculator
+from modules.metrics import MetricsRegistry, MetricsSecondaryTranslationService
+
+BASE_DIR = os.path.dirname(__file__)
+TEST_INPUT = os.path.join(BASE_DIR, 'test_data/test_tadirah_converted_small_noen.rdf')
+
+
+class DummyPrimaryTranslationService:
+    def translate(self, term: str, source_lang: str, target_lang: str) -> str:
+        return f"{term}_{target_lang}_dummy"
+
+
+class DummySecondaryTranslationService:
+    """
+    Translates every term with the same text and gives no ratings.
+    """
+    def __init__(self):
+        self.service_name = "dummy"
+        self.model_name = "dummy_model"
+
+    def translate_with_context(self, prompt):
+        return "vertaling"
+
+    def rate_translation(self, prompt):
+        return None
+
+
+def test_pipeline_metrics(tmp_path):
+    metrics = MetricsRegistry()
+    secondary_translation_service = MetricsSecondaryTranslationService(DummySecondaryTranslationService(), metrics)
+    metrics_file = tmp_path / "wokie.prom"
+    pipeline = TranslationPipeline(
+        [DummyPrimaryTranslationService()], secondary_translation_service, IndividualLabelStrategy(),
+        primary_confidence_calculator=FrequencyConfidenceCalculator(),
+        secondary_confidence_calculator=LLMConfidenceCalculator(secondary_translation_service, max_retries=0),
+        low_confidence_threshold=1.1,
+        min_primary_translations=1,
+        metrics=metrics,
+        metrics_file=str(metrics_file),
+    )
+    pipeline.process_file(TEST_INPUT, "nl", "Digital Humanities", str(tmp_path / "output.rdf"))
+
+    decisions = sum(metrics.decisions.value(target_lang="nl", decision=decision) for decision in ("primary_accepted", "secondary_matched_primary", "llm_rated", "fallback"))
+    assert decisions == 4
+    assert metrics.decisions.value(target_lang="nl", decision="primary_accepted") == 0
+    assert metrics.primary_requests.value(service="DummyPrimaryTranslationService", outcome="translated") > 0
+    assert metrics.llm_requests.value(service="dummy", model="dummy_model", call_type="translate", outcome="answered") > 0
+    assert metrics.stage_latency.count(stage="parse") == 1
+    assert metrics.stage_latency.count(stage="serialize") == 1
+
+    text = metrics_file.read_text(encoding="utf-8")
+    assert "# TYPE wokie_primary_request_duration_seconds histogram" in text
+    assert 'wokie_primary_request_duration_seconds_bucket{service="DummyPrimaryTranslationService",le="+Inf"}' in text
+    assert 'wokie_decisions_total{target_lang="nl",decision="' in text
+
+
+def test_metrics_are_served():
+    metrics = MetricsRegistry()
+    metrics.primary_requests.inc(service="reverso", outcome="error")
+    port = metrics.serve(0)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+            body = response.read().decode("utf-8")
+    finally:
+        metrics.close()
+    assert 'wokie_primary_requests_total{service="reverso",outcome="error"} 1' in body
@@ -0,0 +1,59 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from modules.mock_network import SimulatedEndpoint, mock_translation
+from modules.rate_limiter import RateLimitExceeded
+from modules.primary_translators.mock_translator import MockPrimaryTranslationService
+from modules.secondary_translators.mock_secondary_translator import MockSecondaryTranslationService
+from benchmarks.benchmark_pipeline import run_benchmark
+
+BASE_DIR = os.path.dirname(__file__)
+TEST_INPUT = os.path.join(BASE_DIR, 'test_data/test_tadirah_converted_small_noen.rdf')
+
+
+def test_simulated_endpoint_is_seeded():
+    first = SimulatedEndpoint("mock", median_latency=0.1, sigma=0.5, error_rate=0.3, seed=7)
+    second = SimulatedEndpoint("mock", median_latency=0.1, sigma=0.5, error_rate=0.3, seed=7)
+    # The same calls in a different order get the same latencies and errors
+    keys = [f"term {number}" for number in range(50)]
+    draws = {key: first.draw(key)[:2] for key in keys}
+    assert {key: second.draw(key)[:2] for key in reversed(keys)} == draws
+    assert 0 < first.errors < 50
+    assert len({latency for latency, _ in draws.values()}) > 1
+
+
+def test_simulated_rate_limit():
+    endpoint = SimulatedEndpoint("mock", median_latency=0, rate_limit_rps=3)
+    for number in range(3):
+        endpoint.draw(str(number))
+    with pytest.raises(RateLimitExceeded) as excinfo:
+        endpoint.draw("3")
+    assert 0 < excinfo.value.retry_after <= 1
+    assert endpoint.rate_limited == 1
+
+
+def test_mock_services():
+    primary = MockPrimaryTranslationService("mock_a", median_latency=0, agreement=1.0, max_batch_size=2)
+    assert primary.translate("Mapping", "en", "de") == mock_translation("Mapping")
+    assert asyncio.run(primary.atranslate("Mapping", "en", "de")) == mock_translation("Mapping")
+    assert primary.translate_batch(["a", "b", "c"], "en", "de") == [mock_translation(term) for term in "abc"]
+    # Two batch requests for three terms
+    assert primary.endpoint.calls == 4
+
+    llm = MockSecondaryTranslationService(median_latency=0)
+    assert llm.translate_with_context({"instructions": "", "input": "Term to translate: Mapping\nGeneral context: DH"}) == mock_translation("Mapping")
+    rating = llm.rate_translation({"instructions": "", "input": "The possible translations to German coming from translation systems are: \nKarte\nMapping (translated)\n\nAdditional context"})
+    assert rating.startswith("Mapping (translated); ")
+    answer = llm.translate_with_context({"instructions": "Return only a JSON array", "input": "Item 1:\n- Mapping (English)\n\nItem 2:\n- Annotating (English)"})
+    assert json.loads(answer) == [{"id": 1, "translation": mock_translation("Mapping")}, {"id": 2, "translation": mock_translation("Annotating")}]
+
+
+@pytest.mark.parametrize("strategy", ["individual", "batch", "hierarchy"])
+def test_benchmark_runs(strategy):
+    result = run_benchmark(TEST_INPUT, strategy, primary_concurrency="thread", latency_scale=0)
+    assert result["concepts"] == 4
+    assert result["primary_calls"] > 0
+    assert result["llm_calls"] > 0
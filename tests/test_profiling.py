@@ -0,0 +1,48 @@
+import os
+
+from modules.translation_pipeline import TranslationPipeline
+from modules.secondary_translation_strategies import IndividualLabelStrategy
+from modules.frequency_confidence_calculator import FrequencyConfidenceCalculator
+from modules.llm_confidence_calculator import LLMConfidenceCalculator
+from modules.primary_translators.mock_translator import MockPrimaryTranslationService
+from modules.secondary_translators.mock_secondary_translator import MockSecondaryTranslationService
+from modules.profiling import StageTimer, StageTimedSecondaryTranslationService, profile_call
+
+BASE_DIR = os.path.dirname(__file__)
+TEST_INPUT = os.path.join(BASE_DIR, 'test_data/test_tadirah_converted_small_noen.rdf')
+
+
+def test_stage_timer_excludes_nested_stages():
+    stage_timer = StageTimer()
+    with stage_timer.stage("outer"):
+        with stage_timer.stage("inner"):
+            pass
+    assert stage_timer.stages["outer"][1] == 1
+    assert stage_timer.stages["inner"][1] == 1
+    lines = stage_timer.summary(1.0)
+    assert lines[-1].startswith("total")
+
+
+def test_profiled_run(tmp_path):
+    stage_timer = StageTimer()
+    secondary_translation_service = StageTimedSecondaryTranslationService(MockSecondaryTranslationService(median_latency=0.01, sigma=0), stage_timer)
+    primary_translation_services = [MockPrimaryTranslationService(f"mock_{number}", median_latency=0.001, agreement=0.5, seed=number) for number in range(3)]
+    pipeline = TranslationPipeline(
+        primary_translation_services, secondary_translation_service, IndividualLabelStrategy(),
+        primary_confidence_calculator=FrequencyConfidenceCalculator(),
+        secondary_confidence_calculator=LLMConfidenceCalculator(secondary_translation_service, max_retries=0),
+        low_confidence_threshold=1.1,
+        stage_timer=stage_timer,
+    )
+    output_file = str(tmp_path / "output.rdf")
+    profile_call(lambda: pipeline.process_file(TEST_INPUT, "nl", "Digital Humanities", output_file),
+                 str(tmp_path / "output.prof"), str(tmp_path / "output.profile.txt"), stage_timer)
+
+    for stage in ("graph load", "extract_term_properties", "primary calls", "strategy prompt building", "LLM calls", "confidence calculation", "serialize"):
+        assert stage in stage_timer.stages
+    # 10 ms per LLM call, all of them within the strategy or the confidence calculation
+    assert stage_timer.stages["LLM calls"][0] >= 0.01 * stage_timer.stages["LLM calls"][1]
+    assert os.path.getsize(tmp_path / "output.prof") > 0
+    summary = (tmp_path / "output.profile.txt").read_text(encoding="utf-8")
+    assert "LLM calls" in summary
+    assert "cumulative" in summary
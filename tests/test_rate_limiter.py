@@ -0,0 +1,84 @@
+import pytest
+
+from modules.rate_limiter import (
+    RateLimitExceeded, RateLimiter, TokenBucket, RateLimitedPrimaryTranslationService,
+    RateLimitedSecondaryTranslationService, backoff_delay, raise_if_rate_limited,
+)
+
+
+class FlakyPrimaryTranslationService:
+    """
+    Answers with HTTP 429 for the first `failures` calls.
+    """
+    def __init__(self, failures):
+        self.service_name = "flaky"
+        self.failures = failures
+        self.calls = 0
+
+    def translate(self, term, source_lang, target_lang):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RateLimitExceeded(self.service_name, retry_after=0)
+        return f"{term}_{target_lang}"
+
+
+class FakeResponse:
+    status_code = 429
+    headers = {"Retry-After": "7"}
+
+
+class FakeClientError(Exception):
+    response = FakeResponse()
+
+
+def test_retries_after_rate_limit():
+    service = FlakyPrimaryTranslationService(failures=2)
+    limited = RateLimitedPrimaryTranslationService(service, RateLimiter(), max_retries=3, backoff_base=0.001)
+    assert limited.translate("term", "en", "de") == "term_de"
+    assert service.calls == 3
+    assert limited.rate_limited == 2
+    assert limited.given_up == 0
+    # Attributes of the wrapped service are still reachable
+    assert limited.failures == 2
+
+
+def test_gives_up_after_max_retries():
+    service = FlakyPrimaryTranslationService(failures=10)
+    limited = RateLimitedPrimaryTranslationService(service, RateLimiter(), max_retries=2, backoff_base=0.001)
+    assert limited.translate("term", "en", "de") is None
+    assert limited.translate_batch(["a", "b"], "en", "de") == [None, None]
+    assert limited.given_up == 3
+
+
+def test_token_bucket_and_backoff():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    # Retry-After wins over the exponential delay
+    assert 7 <= backoff_delay(5, retry_after=7, base=1) <= 8
+    assert 2 <= backoff_delay(2, base=1) <= 4
+    assert backoff_delay(20, base=1, cap=60) <= 60
+
+
+def test_tokens_per_minute_budget():
+    class LongPromptService:
+        service_name = "llm"
+
+        def translate_with_context(self, prompt):
+            return "answer"
+
+    limiter = RateLimiter(tokens_per_minute=600)
+    limited = RateLimitedSecondaryTranslationService(LongPromptService(), limiter)
+    # 2400 characters are about 600 tokens, the whole budget of one minute
+    reserved = limiter.reserve(limited._estimate_tokens({"instructions": "x" * 1200, "input": "y" * 1200}))
+    assert reserved == 0
+    assert limiter.reserve(60) == pytest.approx(6, abs=0.1)
+
+
+def test_client_errors_are_converted():
+    with pytest.raises(RateLimitExceeded) as info:
+        raise_if_rate_limited(FakeClientError(), "flaky")
+    assert info.value.retry_after == 7
+    # Other errors are left to the caller
+    raise_if_rate_limited(ValueError("no rate limit"), "flaky")
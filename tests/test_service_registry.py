@@ -0,0 +1,24 @@
+import subprocess
+import sys
+
+import pytest
+
+from modules.service_registry import create_primary_service, create_secondary_service
+
+
+def test_main_does_not_import_services():
+    code = ("import sys, main\n"
+            "loaded = [name for name in sys.modules if name.startswith(('modules.primary_translators.', 'modules.secondary_translators.'))]\n"
+            "print(sorted(loaded))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    # Only the base classes, which the wrappers need
+    assert result.stdout.strip() == "['modules.primary_translators.abstract_primary_translator', 'modules.secondary_translators.abstract_secondary_translator']"
+
+
+def test_create_services():
+    assert create_primary_service("dummynone").translate("Mapping", "en", "de") is None
+    assert create_secondary_service("dummy", temperature=0.5).__class__.__name__ == "DummySecondaryTranslationService"
+    with pytest.raises(ValueError):
+        create_primary_service("unknown")
+    with pytest.raises(ValueError):
+        create_secondary_service("unknown")
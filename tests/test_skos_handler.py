@@ -0,0 +1,80 @@
+import os
+
+import rdflib
+
+from modules.skos_handler import SKOS, ConceptIndex, load_graph
+from benchmarks.benchmark_concept_index import synthetic_graph, per_concept_queries, concept_index
+
+BASE_DIR = os.path.dirname(__file__)
+TEST_INPUT = os.path.join(BASE_DIR, 'test_data/test_tadirah_converted_small_noen.rdf')
+EX = rdflib.Namespace("https://example.org/")
+
+
+def test_index_keeps_label_order():
+    graph, _ = load_graph(TEST_INPUT)
+    index = ConceptIndex(graph)
+    assert list(index.properties) == list(graph.subjects(rdflib.RDF.type, SKOS.Concept))
+    for concept, term_props in index.properties.items():
+        # The languages in the order of the graph, the first one can become the source label
+        assert list(term_props["prefLabel"]) == list(dict.fromkeys(label.language for label in graph.objects(concept, SKOS.prefLabel)))
+
+
+def test_hierarchy():
+    graph = rdflib.Graph()
+    graph.add((EX.child, rdflib.RDF.type, SKOS.Concept))
+    graph.add((EX.child, SKOS.prefLabel, rdflib.Literal("Kind", lang="de")))
+    graph.add((EX.child, SKOS.broader, EX.parent))
+    # The broader terms are not typed as skos:Concept, the top term is only linked with skos:narrower
+    graph.add((EX.parent, SKOS.prefLabel, rdflib.Literal("Parent", lang="en")))
+    graph.add((EX.parent, SKOS.broader, EX.grandparent))
+    graph.add((EX.grandparent, SKOS.prefLabel, rdflib.Literal("Grandparent", lang="en")))
+    graph.add((EX.top, rdflib.RDF.type, SKOS.Concept))
+    graph.add((EX.top, SKOS.narrower, EX.child))
+    index = ConceptIndex(graph)
+    assert list(index.properties) == [EX.child, EX.top]
+    # skos:narrower is not followed, like the broader chains of HierarchyStrategy before the index
+    assert index.broader[EX.child] == [EX.parent]
+    assert index.broader[EX.parent] == [EX.grandparent]
+    assert index.narrower[EX.parent] == [EX.child]
+    assert EX.top not in index.narrower
+    assert index.ancestors(EX.child) == (EX.grandparent, EX.parent)
+    assert index.pref_label(EX.parent, "de") == "Parent"
+    assert index.pref_label(EX.grandparent, "de") == "Grandparent"
+    assert index.pref_label(EX.child, "fr") == "Kind"
+    assert index.pref_label(EX.top, "de") is None
+
+    # The same index from the triples of a file
+    triples_index = ConceptIndex.from_triples(sorted(graph))
+    assert triples_index.properties == index.properties
+    assert triples_index.broader == index.broader
+    assert triples_index.narrower == index.narrower
+    assert triples_index.term_properties(EX.grandparent) == index.term_properties(EX.grandparent)
+
+
+def test_benchmark_variants_agree():
+    graph = synthetic_graph(200, children=3)
+    assert per_concept_queries(graph) == concept_index(graph) > 0
+
+
+def test_ancestors_with_cycles_and_poly_hierarchy():
+    graph = rdflib.Graph()
+    for concept in (EX.a, EX.b, EX.c, EX.d, EX.top):
+        graph.add((concept, rdflib.RDF.type, SKOS.Concept))
+    # a -> b -> c -> a is a cycle, c also has the broader term top; d has two broader terms
+    graph.add((EX.a, SKOS.broader, EX.b))
+    graph.add((EX.b, SKOS.broader, EX.c))
+    graph.add((EX.c, SKOS.broader, EX.a))
+    graph.add((EX.c, SKOS.broader, EX.top))
+    graph.add((EX.d, SKOS.broader, EX.b))
+    graph.add((EX.d, SKOS.broader, EX.top))
+    graph.add((EX.top, SKOS.broader, EX.top))
+    index = ConceptIndex(graph)
+    assert index.ancestors(EX.a) == (EX.top, EX.c, EX.b)
+    assert index.ancestors(EX.c) == (EX.top,)
+    assert index.ancestors(EX.d) == (EX.top, EX.c, EX.b)
+    assert index.ancestors(EX.top) == ()
+    assert sorted(index.cycles) == sorted([(EX.a, EX.b, EX.c), (EX.top,)])
+    # The same chains if another concept is asked for first
+    index = ConceptIndex(graph)
+    assert index.ancestors(EX.c) == (EX.top,)
+    assert index.ancestors(EX.a) == (EX.top, EX.c, EX.b)
@@ -0,0 +1,77 @@
+import os
+
+import rdflib
+
+from modules.skos_handler import ConceptIndex, load_graph, extract_vocabulary_context
+from modules.skos_stream import PIPELINE_PREDICATES, iter_ntriples, iter_rdfxml_triples, stream_concept_index
+
+BASE_DIR = os.path.dirname(__file__)
+TEST_INPUT = os.path.join(BASE_DIR, 'test_data/test_tadirah_converted_small_noen.rdf')
+
+RDFXML = """<?xml version="1.0" encoding="utf-8"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns:skos="http://www.w3.org/2004/02/skos/core#"
+         xmlns:dc="http://purl.org/dc/elements/1.1/" xml:base="https://example.org/" xml:lang="en">
+  <skos:ConceptScheme rdf:about="scheme"><dc:description> A vocabulary </dc:description></skos:ConceptScheme>
+  <skos:Concept rdf:about="a" skos:altLabel="Alpha">
+    <skos:prefLabel>A</skos:prefLabel>
+    <skos:prefLabel xml:lang="de">A (de)</skos:prefLabel>
+    <skos:broader>
+      <skos:Concept rdf:ID="b"><skos:prefLabel>B &amp; C</skos:prefLabel><skos:broader rdf:nodeID="top"/></skos:Concept>
+    </skos:broader>
+    <skos:note rdf:parseType="Resource"><skos:prefLabel>nested</skos:prefLabel></skos:note>
+    <skos:definition rdf:parseType="Literal">An <b>XML</b> literal</skos:definition>
+    <skos:example rdf:datatype="http://www.w3.org/2001/XMLSchema#string">typed</skos:example>
+    <!-- comment -->
+  </skos:Concept>
+  <rdf:Description rdf:nodeID="top"><rdf:type rdf:resource="http://www.w3.org/2004/02/skos/core#Concept"/></rdf:Description>
+</rdf:RDF>
+"""
+
+NTRIPLES = r"""# comment
+<https://example.org/a> <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://www.w3.org/2004/02/skos/core#Concept> .
+<https://example.org/a> <http://www.w3.org/2004/02/skos/core#prefLabel> "Café \"quoted\"\n"@fr .
+<https://example.org/a> <http://www.w3.org/2004/02/skos/core#prefLabel> "Kaffee"@de-AT .
+<https://example.org/a> <http://www.w3.org/2004/02/skos/core#example> "1"^^<http://www.w3.org/2001/XMLSchema#integer> .
+<https://example.org/a> <http://www.w3.org/2004/02/skos/core#broader> _:b1 .
+_:b1 <http://www.w3.org/2004/02/skos/core#prefLabel> "Drinks" .
+<https://example.org/a> <http://purl.org/dc/terms/modified> "2024" .
+
+"""
+
+
+def blank_node_free(triples):
+    return {triple for triple in triples if not any(isinstance(term, rdflib.BNode) for term in triple)}
+
+
+def test_rdfxml_reader_matches_rdflib(tmp_path):
+    path = tmp_path / "vocabulary.rdf"
+    path.write_text(RDFXML, encoding="utf-8")
+    graph = rdflib.Graph().parse(str(path), format="xml")
+    expected = [triple for triple in graph if triple[1] in PIPELINE_PREDICATES]
+    streamed = list(iter_rdfxml_triples(str(path)))
+    assert len(streamed) == len(expected)
+    assert blank_node_free(streamed) == blank_node_free(expected)
+
+
+def test_ntriples_reader_matches_rdflib(tmp_path):
+    path = tmp_path / "vocabulary.nt"
+    path.write_text(NTRIPLES, encoding="utf-8")
+    graph = rdflib.Graph().parse(str(path), format="nt")
+    expected = [triple for triple in graph if triple[1] in PIPELINE_PREDICATES]
+    streamed = list(iter_ntriples(str(path)))
+    assert len(streamed) == len(expected) == 6
+    assert blank_node_free(streamed) == blank_node_free(expected)
+
+
+def test_streamed_index_equals_graph_index(tmp_path):
+    graph, _ = load_graph(TEST_INPUT)
+    concept_index, fileformat, vocab_context = stream_concept_index(TEST_INPUT)
+    assert fileformat == "xml"
+    assert vocab_context == extract_vocabulary_context(graph)
+    graph_index = ConceptIndex(graph)
+    assert list(concept_index.properties) == list(graph_index.properties)
+    for concept, term_props in graph_index.properties.items():
+        assert {name: list(langs.items()) for name, langs in concept_index.properties[concept].items()} == {name: list(langs.items()) for name, langs in term_props.items()}
+    assert concept_index.broader == graph_index.broader
+    assert concept_index.narrower == graph_index.narrower
+
@@ -0,0 +1,105 @@
+import os
+import time
+import pytest
+
+from modules.translation_cache import SQLiteCacheStore, CachedPrimaryTranslationService, CachedSecondaryTranslationService
+
+
+class CountingPrimaryTranslationService:
+    """
+    Dummy primary service that counts its calls. Returns None for the term "fail".
+    """
+    def __init__(self):
+        self.service_name = "counting"
+        self.calls = 0
+
+    def translate(self, term: str, source_lang: str, target_lang: str):
+        self.calls += 1
+        if term == "fail":
+            return None
+        return f"{term}_{target_lang}"
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    return os.path.join(tmp_path, "cache.sqlite")
+
+
+def test_primary_cache_hits_and_persistence(cache_file):
+    service = CountingPrimaryTranslationService()
+    cached = CachedPrimaryTranslationService(service, SQLiteCacheStore(cache_file, "primary_translations"))
+    assert cached.translate("Haus", "de", "en") == "Haus_en"
+    assert cached.translate("Haus", "de", "en") == "Haus_en"
+    assert cached.translate("fail", "de", "en") is None
+    assert cached.translate("fail", "de", "en") is None
+    assert service.calls == 2
+    assert (cached.hits, cached.negative_hits, cached.misses) == (1, 1, 2)
+    cached.store.close()
+
+    # A new run (new store instance) reads the results of the previous one
+    reopened = CachedPrimaryTranslationService(service, SQLiteCacheStore(cache_file, "primary_translations"))
+    assert reopened.translate("Haus", "de", "en") == "Haus_en"
+    assert service.calls == 2
+
+    # Refresh calls the service again
+    refreshed = CachedPrimaryTranslationService(service, reopened.store, mode="refresh")
+    assert refreshed.translate("Haus", "de", "en") == "Haus_en"
+    assert service.calls == 3
+
+
+def test_primary_cache_expiry_and_eviction(cache_file):
+    service = CountingPrimaryTranslationService()
+    store = SQLiteCacheStore(cache_file, "primary_translations", ttl=60, negative_ttl=0.01, max_entries=2)
+    cached = CachedPrimaryTranslationService(service, store)
+    cached.translate("fail", "de", "en")
+    time.sleep(0.05)
+    # failed calls expire after negative_ttl, successful ones are still cached
+    cached.translate("Haus", "de", "en")
+    cached.translate("fail", "de", "en")
+    cached.translate("Haus", "de", "en")
+    assert service.calls == 3
+
+    for term in ["a", "b", "c", "d"]:
+        store.set(term, term)
+    store.close()
+    reopened = SQLiteCacheStore(cache_file, "primary_translations")
+    (count,) = reopened._connection.execute("SELECT COUNT(*) FROM primary_translations").fetchone()
+    assert count == 2
+    assert reopened.get("d") == (True, "d")
+
+
+class CountingSecondaryTranslationService:
+    """
+    Dummy secondary service that counts its calls.
+    """
+    def __init__(self):
+        self.service_name = "dummy"
+        self.model_name = "dummy_model"
+        self.temperature = 0
+        self.calls = 0
+
+    def translate_with_context(self, prompt: dict) -> str:
+        self.calls += 1
+        return f"{prompt['input']}_translated"
+
+    def rate_translation(self, prompt: dict) -> str:
+        self.calls += 1
+        return f"{prompt['input']}; 0.9"
+
+
+def test_secondary_cache_and_discard(cache_file):
+    service = CountingSecondaryTranslationService()
+    cached = CachedSecondaryTranslationService(service, SQLiteCacheStore(cache_file, "llm_responses"))
+    prompt_a = {"instructions": "Translate", "input": "a"}
+
+    assert cached.translate_with_context(prompt_a) == "a_translated"
+    assert cached.translate_with_context(dict(prompt_a)) == "a_translated"
+    # same prompt, but rating is cached separately
+    assert cached.rate_translation(prompt_a) == "a; 0.9"
+    assert service.calls == 2
+    assert cached.hits["translate"] == 1
+    assert cached.saved_tokens > 0
+
+    cached.discard(prompt_a, "translate")
+    cached.translate_with_context(prompt_a)
+    assert service.calls == 3
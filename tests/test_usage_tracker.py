@@ -0,0 +1,129 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+import rdflib
+
+from modules.translation_pipeline import TranslationPipeline
+from modules.secondary_translation_strategies import IndividualLabelStrategy, BatchLabelStrategy
+from modules.frequency_confidence_calculator import FrequencyConfidenceCalculator
+from modules.llm_confidence_calculator import LLMConfidenceCalculator
+from modules.secondary_translators.abstract_secondary_translator import SecondaryTranslationService
+from modules.metrics import MetricsRegistry
+from modules.usage_tracker import UsageTracker, BudgetedSecondaryTranslationService, extract_usage
+
+BASE_DIR = os.path.dirname(__file__)
+TEST_INPUT = os.path.join(BASE_DIR, 'test_data/test_tadirah_converted_small_noen.rdf')
+
+
+class DummyPrimaryTranslationService:
+    def __init__(self, name="dummy"):
+        self.service_name = name
+
+    def translate(self, term: str, source_lang: str, target_lang: str) -> str:
+        return f"{term}_{target_lang}_{self.service_name}"
+
+
+class UsageReportingSecondaryTranslationService(SecondaryTranslationService):
+    """
+    Translates every term with the same text, gives no ratings and reports 1000 input and 100 output tokens per call.
+    """
+    def __init__(self):
+        self.service_name = "dummy"
+        self.model_name = "dummy_model"
+
+    def translate_with_context(self, prompt):
+        response = SimpleNamespace(output_text="vertaling", usage=SimpleNamespace(input_tokens=1000, output_tokens=100))
+        self._record_usage(response)
+        return response.output_text
+
+    def rate_translation(self, prompt):
+        return None
+
+
+@pytest.mark.parametrize("response, expected", [
+    # OpenAI Responses API
+    (SimpleNamespace(usage=SimpleNamespace(input_tokens=12, output_tokens=3)), (12, 3)),
+    # Chat completions (Mistral, DeepSeek, OpenAI batch results)
+    ({"usage": {"prompt_tokens": 12, "completion_tokens": 3}}, (12, 3)),
+    # Anthropic with prompt caching
+    (SimpleNamespace(usage=SimpleNamespace(input_tokens=2, output_tokens=3, cache_creation_input_tokens=4, cache_read_input_tokens=6)), (12, 3)),
+    # Gemini with thinking tokens
+    (SimpleNamespace(usage_metadata=SimpleNamespace(prompt_token_count=12, candidates_token_count=2, thoughts_token_count=1)), (12, 3)),
+    # Ollama
+    ({"message": {"content": "x"}, "prompt_eval_count": 12, "eval_count": 3}, (12, 3)),
+    (SimpleNamespace(output_text="x"), None),
+])
+def test_extract_usage(response, expected):
+    assert extract_usage(response) == expected
+
+
+def test_max_cost():
+    tracker = UsageTracker({"gpt": (1.0, 10.0)}, max_cost=0.005)
+    assert tracker.acquire()
+    tracker.record("openai", "gpt", 1000, 100)
+    tracker.release()
+    assert tracker.cost == pytest.approx(0.002)
+    # 0.002 so far, another call costs 0.002 on average
+    assert tracker.acquire()
+    tracker.record("openai", "gpt", 1000, 100)
+    tracker.release()
+    assert not tracker.acquire()
+    assert tracker.exhausted
+    assert tracker.calls == 2
+
+
+def test_pipeline_budget(tmp_path):
+    metrics = MetricsRegistry()
+    tracker = UsageTracker({"dummy_model": (1.0, 2.0)}, max_calls=2, metrics=metrics)
+    service = UsageReportingSecondaryTranslationService()
+    service.usage_tracker = tracker
+    secondary_translation_service = BudgetedSecondaryTranslationService(service, tracker)
+    pipeline = TranslationPipeline(
+        [DummyPrimaryTranslationService()], secondary_translation_service, IndividualLabelStrategy(),
+        primary_confidence_calculator=FrequencyConfidenceCalculator(),
+        secondary_confidence_calculator=LLMConfidenceCalculator(secondary_translation_service, max_retries=0),
+        low_confidence_threshold=1.1,
+        min_primary_translations=1,
+        metrics=metrics,
+        usage_tracker=tracker,
+    )
+    pipeline.process_file(TEST_INPUT, "nl", "Digital Humanities", str(tmp_path / "output.rdf"))
+
+    assert tracker.calls == 2
+    assert tracker.exhausted
+    assert tracker.usage[("dummy", "dummy_model")] == [2, 2000, 200, pytest.approx(0.0024)]
+    assert metrics.llm_tokens.value(service="dummy", model="dummy_model", direction="input") == 2000
+    # The properties after the second call are decided by the primary services alone
+    assert metrics.decisions.value(target_lang="nl", decision="budget_exhausted") > 0
+    decisions = sum(metrics.decisions.value(target_lang="nl", decision=decision) for decision in ("budget_exhausted", "secondary_matched_primary", "llm_rated", "fallback"))
+    assert decisions == 4
+
+
+def test_budget_exhausted_between_translation_and_rating(tmp_path):
+    """A rating call refused by the budget leaves the property to the primary services."""
+    metrics = MetricsRegistry()
+    # The first property takes two calls, the rating of the second one is refused
+    tracker = UsageTracker(max_calls=3)
+    secondary_translation_service = BudgetedSecondaryTranslationService(UsageReportingSecondaryTranslationService(), tracker)
+    pipeline = TranslationPipeline(
+        [DummyPrimaryTranslationService(name) for name in ("a", "b", "c")], secondary_translation_service, BatchLabelStrategy(),
+        primary_confidence_calculator=FrequencyConfidenceCalculator(),
+        secondary_confidence_calculator=LLMConfidenceCalculator(secondary_translation_service, max_retries=0),
+        low_confidence_threshold=1.1,
+        min_primary_translations=1,
+        metrics=metrics,
+        usage_tracker=tracker,
+    )
+    output_file = tmp_path / "output.rdf"
+    pipeline.process_file(TEST_INPUT, "nl", "Digital Humanities", str(output_file))
+
+    assert tracker.calls == 3
+    assert tracker.refused == 1
+    assert metrics.decisions.value(target_lang="nl", decision="fallback") == 1
+    assert metrics.decisions.value(target_lang="nl", decision="budget_exhausted") == 3
+
+    graph = rdflib.Graph()
+    graph.parse(str(output_file), format="xml")
+    dutch_labels = [str(label) for label in graph.objects(None, rdflib.SKOS.prefLabel) if label.language == "nl"]
+    assert len(dutch_labels) == 4 and "vertaling" not in dutch_labels